@@ -0,0 +1,54 @@
+import pygame
+
+
+class CameraBackground:
+    """
+    Blit the camera RGB frame as the screen background without extra copies.
+
+    pygame.image.frombuffer() wraps the existing (contiguous) RGB array as a
+    Surface without copying pixels, so the only full-frame copy left is the
+    blit onto the display. If the frame size differs from the display, the
+    frame is scaled into one persistent display-sized surface instead of
+    allocating a new one every frame.
+
+    refresh_every > 1 (set by the quality governor) keeps the background in
+    a display-format surface and converts only every Nth new camera frame;
+    blitting a surface that already matches the display is several times
+    cheaper than the RGB -> display conversion blit.
+    """
+
+    def __init__(self, display_size):
+        self.display_size = tuple(display_size)
+        self.refresh_every = 1
+        self._scaled = None
+        self._cached = None
+        self._last_src = None
+        self._since_refresh = 0
+
+    def draw(self, screen, frame_rgb):
+        if self.refresh_every <= 1:
+            self._cached = None
+            self._blit(screen, frame_rgb)
+            return
+
+        if frame_rgb is not self._last_src:
+            self._last_src = frame_rgb
+            self._since_refresh += 1
+            if self._cached is None or self._since_refresh >= self.refresh_every:
+                self._since_refresh = 0
+                if self._cached is None:
+                    self._cached = pygame.Surface(self.display_size, 0, screen)
+                self._blit(self._cached, frame_rgb)
+        screen.blit(self._cached, (0, 0))
+
+    def _blit(self, dest, frame_rgb):
+        h, w = frame_rgb.shape[:2]
+        src = pygame.image.frombuffer(frame_rgb, (w, h), "RGB")
+        if (w, h) == self.display_size:
+            dest.blit(src, (0, 0))
+            return
+
+        if self._scaled is None:
+            self._scaled = pygame.Surface(self.display_size, 0, src)
+        pygame.transform.scale(src, self.display_size, self._scaled)
+        dest.blit(self._scaled, (0, 0))
@@ -0,0 +1,10 @@
+"""
+Headless benchmarks. Jalankan dari folder bubble_pop, contoh:
+  python -m benchmarks.bubble_draw
+  python -m benchmarks.suite --out hasil.json   (semua case, output JSON)
+"""
+import os
+
+# Tidak butuh layar / kamera
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
@@ -0,0 +1,54 @@
+"""
+Background kamera: frame_to_surface lama vs CameraBackground (frombuffer).
+
+  python -m benchmarks.background_blit [--frames 100]
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+import pygame
+
+from background import CameraBackground
+
+RESOLUTIONS = [(640, 480), (1280, 720), (1920, 1080)]
+
+
+def frame_to_surface(frame_bgr):
+    # Implementasi lama dari main.py (cvtColor kedua + transpose + make_surface)
+    frame_rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
+    return pygame.surfarray.make_surface(np.transpose(frame_rgb, (1, 0, 2)))
+
+
+def bench(fn, frames):
+    fn()
+    t0 = time.perf_counter()
+    for _ in range(frames):
+        fn()
+    return (time.perf_counter() - t0) / frames * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", type=int, default=100)
+    args = parser.parse_args()
+
+    pygame.init()
+    rng = np.random.default_rng(0)
+    print(f"{'resolution':>11} {'old ms':>8} {'new ms':>8} {'speedup':>8}")
+    for w, h in RESOLUTIONS:
+        screen = pygame.display.set_mode((w, h))
+        frame_bgr = rng.integers(0, 256, (h, w, 3), dtype=np.uint8)
+        frame_rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
+        background = CameraBackground((w, h))
+
+        old = bench(lambda: screen.blit(frame_to_surface(frame_bgr), (0, 0)), args.frames)
+        new = bench(lambda: background.draw(screen, frame_rgb), args.frames)
+        print(f"{w:>5}x{h:<5} {old:>8.3f} {new:>8.3f} {old / new:>7.1f}x")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
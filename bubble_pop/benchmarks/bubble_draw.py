@@ -0,0 +1,61 @@
+"""
+Bubble draw time per frame vs jumlah bubble: sprite cache vs render ulang.
+
+  python -m benchmarks.bubble_draw [--frames 200] [--counts 40,200,1000,5000]
+"""
+import argparse
+import time
+
+import numpy as np
+import pygame
+
+from bubble_field import BubbleField
+from sprites import _render_bubble
+
+W, H = 1280, 720
+
+
+def draw_uncached(surface, bubbles):
+    # Cara lama: alokasi Surface + 3x draw.circle per bubble per frame
+    for i in range(bubbles.n):
+        r = int(bubbles.radius[i])
+        sprite = _render_bubble(r, int(bubbles.alpha[i]))
+        surface.blit(sprite, (int(bubbles.x[i]) - r - 2, int(bubbles.y[i]) - r - 2))
+
+
+def draw_cached(surface, bubbles):
+    bubbles.draw(surface)
+
+
+def bench(draw_fn, surface, bubbles, frames):
+    draw_fn(surface, bubbles)   # warm-up (isi cache)
+    t0 = time.perf_counter()
+    for _ in range(frames):
+        draw_fn(surface, bubbles)
+    return (time.perf_counter() - t0) / frames * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--counts", default="40,200,1000,5000")
+    args = parser.parse_args()
+
+    pygame.init()
+    surface = pygame.Surface((W, H))
+
+    print(f"{'bubbles':>8} {'uncached ms':>12} {'cached ms':>10} {'speedup':>8}")
+    for n in [int(c) for c in args.counts.split(",")]:
+        rng = np.random.default_rng(0)
+        bubbles = BubbleField(W, H, capacity=n, rng=rng)
+        bubbles.spawn(n, start_y=rng.integers(0, H, n))
+        frames = max(5, args.frames * 40 // n)
+        old = bench(draw_uncached, surface, bubbles, frames)
+        new = bench(draw_cached, surface, bubbles, frames)
+        print(f"{n:>8} {old:>12.3f} {new:>10.3f} {old / new:>7.1f}x")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Hit test fingertip vs bubble: dense (semua pasangan) vs spatial grid.
+
+  python -m benchmarks.hit_test [--repeat 50] [--bubbles 40,500,2000,10000] [--tips 2,10,30]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from bubble_field import BubbleField
+
+W, H = 1280, 720
+
+
+def make_field(n, seed):
+    rng = np.random.default_rng(seed)
+    field = BubbleField(W, H, capacity=n, rng=rng)
+    field.spawn(n, start_y=rng.integers(0, H, n))
+    field.update()
+    return field
+
+
+def bench(field, tips, prev, use_grid, repeat):
+    alive = field.alive.copy()
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        field.alive[:] = alive
+        field.pop_hits(tips, prev, use_grid=use_grid)
+    return (time.perf_counter() - t0) / repeat * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--bubbles", default="40,500,2000,10000")
+    parser.add_argument("--tips", default="2,10,30")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    print(f"{'bubbles':>8} {'tips':>5} {'dense ms':>9} {'grid ms':>8} {'speedup':>8}")
+    for n in [int(b) for b in args.bubbles.split(",")]:
+        field = make_field(n, seed=n)
+        for m in [int(t) for t in args.tips.split(",")]:
+            tips = rng.uniform((0, 0), (W, H), (m, 2))
+            prev = tips + rng.normal(0, 20, (m, 2))
+            dense = bench(field, tips, prev, False, args.repeat)
+            grid = bench(field, tips, prev, True, args.repeat)
+            print(f"{n:>8} {m:>5} {dense:>9.3f} {grid:>8.3f} {dense / grid:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
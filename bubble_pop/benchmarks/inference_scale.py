@@ -0,0 +1,110 @@
+"""
+Akurasi vs latency HandTracker / FaceTracker di beberapa inference_scale.
+
+Hasil tiap skala dibandingkan dengan skala 1.0 sebagai referensi:
+  hand: match rate jumlah tangan, error rata-rata index_tip (pixel layar)
+  face: match rate set player yang terdeteksi
+
+  python -m benchmarks.inference_scale --images "samples/*.jpg" [--scales 1,0.75,0.5,0.35,0.25]
+  python -m benchmarks.inference_scale --video sesi.mp4 --max-frames 200
+"""
+import argparse
+import glob
+import os
+import time
+
+import cv2
+import numpy as np
+
+from face_tracker import FaceTracker
+from hand_tracker import MODEL_PATH, HandTracker
+
+
+def load_frames(args):
+    frames = []
+    if args.images:
+        for path in sorted(glob.glob(args.images)):
+            img = cv2.imread(path)
+            if img is not None:
+                frames.append(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+    if args.video:
+        cap = cv2.VideoCapture(args.video)
+        while len(frames) < args.max_frames:
+            ret, img = cap.read()
+            if not ret:
+                break
+            frames.append(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+        cap.release()
+    return frames
+
+
+def run(tracker_fn, frames):
+    outputs, times = [], []
+    for rgb in frames:
+        h, w = rgb.shape[:2]
+        t0 = time.perf_counter()
+        outputs.append(tracker_fn(rgb, w, h))
+        times.append((time.perf_counter() - t0) * 1000.0)
+    return outputs, np.array(times)
+
+
+def hand_error(ref, out):
+    """(match, error px) satu frame; error None kalau jumlah tangan beda / kosong."""
+    if len(ref) != len(out):
+        return False, None
+    if not len(ref):
+        return True, None
+    # Pasangkan tangan per posisi x index tip
+    a = ref.index_tips[np.argsort(ref.index_tips[:, 0])]
+    b = out.index_tips[np.argsort(out.index_tips[:, 0])]
+    return True, float(np.hypot(*(a - b).T).mean())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--images", help="glob gambar sampel")
+    parser.add_argument("--video", help="file video sampel")
+    parser.add_argument("--max-frames", type=int, default=300)
+    parser.add_argument("--scales", default="1,0.75,0.5,0.35,0.25")
+    args = parser.parse_args()
+
+    frames = load_frames(args)
+    if not frames:
+        parser.error("tidak ada frame, pakai --images atau --video")
+    scales = [float(s) for s in args.scales.split(",")]
+    if 1.0 not in scales:
+        scales.insert(0, 1.0)
+    print(f"[INFO] {len(frames)} frame, {frames[0].shape[1]}x{frames[0].shape[0]}")
+
+    print(f"\nFaceTracker\n{'scale':>6} {'p50 ms':>8} {'p95 ms':>8} {'match':>7}")
+    ref = None
+    for scale in scales:
+        tracker = FaceTracker(inference_scale=scale)
+        run(tracker.detect_players, frames[:1])   # warm-up
+        out, t = run(tracker.detect_players, frames)
+        tracker.close()
+        ref = out if ref is None else ref
+        match = np.mean([a == b for a, b in zip(ref, out)])
+        print(f"{scale:>6.2f} {np.percentile(t, 50):>8.2f} {np.percentile(t, 95):>8.2f} {match:>7.1%}")
+
+    if not os.path.exists(MODEL_PATH):
+        print(f"\n[WARN] {MODEL_PATH} tidak ada, HandTracker dilewati")
+        return
+
+    print(f"\nHandTracker\n{'scale':>6} {'p50 ms':>8} {'p95 ms':>8} {'match':>7} {'tip err px':>11}")
+    ref = None
+    for scale in scales:
+        tracker = HandTracker(max_hands=2, inference_scale=scale)
+        run(tracker.process, frames[:1])
+        out, t = run(tracker.process, frames)
+        tracker.close()
+        ref = out if ref is None else ref
+        results = [hand_error(a, b) for a, b in zip(ref, out)]
+        match = np.mean([m for m, _ in results])
+        errs = [e for _, e in results if e is not None]
+        err = f"{np.mean(errs):.1f}" if errs else "-"
+        print(f"{scale:>6.2f} {np.percentile(t, 50):>8.2f} {np.percentile(t, 95):>8.2f} {match:>7.1%} {err:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Spectator server: biaya broadcast dan bandwidth per penonton vs jumlah penonton.
+
+  python -m benchmarks.spectator [--clients 1,10,50,200] [--secs 5]
+
+Game jalan di 30 Hz dengan tangan sintetis, semua penonton stand-in ada di
+proses ini (loop asyncio terpisah dari thread server). Di akhir tiap run,
+state hasil rekonstruksi delta tiap penonton dicocokkan dengan snapshot
+server di tick yang sama.
+
+key B / delta B adalah ukuran pesan utuh, termasuk partikel dan cursor
+yang selalu dikirim penuh. Penghematan delta dilaporkan terpisah per
+bagian: bubble (key vs delta antar tick berurutan) dan partikel / cursor
+(ukuran penuh, tanpa penghematan).
+"""
+import argparse
+import asyncio
+import time
+
+import numpy as np
+import pygame
+
+from benchmarks.suite import GameFixture
+from spectator import U8, U16, SpectatorClient, SpectatorServer, _bubble_delta
+
+TICK_S = 1.0 / 30
+
+
+def section_bytes(history):
+    """Median byte per bagian pesan untuk pasangan snapshot berurutan di history."""
+    snaps = [history[t] for t in sorted(history)]
+    bubble_key, bubble_delta, particles, cursors = [], [], [], []
+    for old, cur in zip(snaps, snaps[1:]):
+        if cur.tick != old.tick + 1:
+            continue
+        bubble_key.append(U16.size + cur.bubbles.nbytes)
+        bubble_delta.append(sum(len(p) for p in _bubble_delta(cur.bubbles, old.bubbles)))
+        particles.append(U16.size + cur.particles.nbytes)
+        cursors.append(U8.size + cur.cursors.nbytes)
+    if not bubble_key:
+        return {"bubble_key_bytes": None, "bubble_delta_bytes": None, "bubble_saved": None,
+                "particle_bytes": None, "cursor_bytes": None}
+    key, delta = np.median(bubble_key), np.median(bubble_delta)
+    return {
+        "bubble_key_bytes": int(key),
+        "bubble_delta_bytes": int(delta),
+        "bubble_saved": round(1.0 - delta / key, 3) if key else None,
+        "particle_bytes": int(np.median(particles)),
+        "cursor_bytes": int(np.median(cursors)),
+    }
+
+
+async def run(n_clients, secs):
+    server = SpectatorServer(host="127.0.0.1", port=0).start()
+    clients = [await SpectatorClient("127.0.0.1", server.port).connect() for _ in range(n_clients)]
+    tasks = [asyncio.ensure_future(c.run()) for c in clients]
+    while server.clients < n_clients:
+        await asyncio.sleep(0.01)
+
+    fx = GameFixture(40, 0)
+    t_end = time.perf_counter() + secs
+    next_tick = time.perf_counter()
+    while time.perf_counter() < t_end:
+        fx.refill()
+        fx.game.step(fx.hands)
+        server.publish(fx.game, "PLAYING", fx.hands, ready=(1, 2))
+        next_tick += TICK_S
+        await asyncio.sleep(max(0.0, next_tick - time.perf_counter()))
+    await asyncio.sleep(0.2)   # sisa pesan di jalan
+
+    history = dict(server._history)
+    mismatch = 0
+    for c in clients:
+        ref = history.get(c.state.tick) if c.state else None
+        if ref is None or ref.bubbles.tobytes() != c.state.bubbles.tobytes() \
+                or ref.particles.tobytes() != c.state.particles.tobytes():
+            mismatch += 1
+    for c in clients:
+        await c.close()
+    await asyncio.gather(*tasks)
+    server.close()
+
+    stats = server.stats()
+    per_client = np.array([c.bytes_received / max(c.messages, 1) for c in clients])
+    return {
+        "clients": n_clients,
+        "snapshots": stats["snapshots"],
+        "encodes_per_snapshot": stats["encodes_per_snapshot"],
+        "broadcast_ms_p50": stats["broadcast_ms_p50"],
+        "encode_ms_p50": stats["encode_ms_p50"],
+        "key_bytes": stats["key_bytes_p50"],
+        "delta_bytes": stats["delta_bytes_p50"],
+        "bytes_per_client_msg": float(per_client.mean()),
+        "keyframes": sum(c.keyframes for c in clients),
+        "mismatch": mismatch,
+        **section_bytes(history),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", default="1,10,50,200")
+    parser.add_argument("--secs", type=float, default=5.0)
+    args = parser.parse_args()
+
+    pygame.init()
+    print(f"{'clients':>8}{'snaps':>7}{'enc/snap':>9}{'bcast ms':>9}{'enc ms':>8}"
+          f"{'key B':>7}{'delta B':>8}{'B/client/msg':>13}{'keys':>6}{'mismatch':>9}")
+    results = []
+    for n in [int(c) for c in args.clients.split(",")]:
+        r = asyncio.run(run(n, args.secs))
+        results.append(r)
+        print(f"{r['clients']:>8}{r['snapshots']:>7}{r['encodes_per_snapshot']:>9}"
+              f"{r['broadcast_ms_p50']:>9.3f}{r['encode_ms_p50']:>8.3f}{r['key_bytes']:>7}"
+              f"{r['delta_bytes']:>8}{r['bytes_per_client_msg']:>13.1f}{r['keyframes']:>6}"
+              f"{r['mismatch']:>9}")
+
+    # Delta cuma berlaku untuk bubble; partikel dan cursor selalu penuh
+    print(f"\n{'clients':>8}{'bubble key B':>13}{'bubble delta B':>15}{'saved':>7}"
+          f"{'particle B':>11}{'cursor B':>9}")
+    for r in results:
+        saved = f"{r['bubble_saved']:.1%}" if r["bubble_saved"] is not None else "-"
+        print(f"{r['clients']:>8}{r['bubble_key_bytes'] or '-':>13}{r['bubble_delta_bytes'] or '-':>15}"
+              f"{saved:>7}{r['particle_bytes'] or '-':>11}{r['cursor_bytes'] or '-':>9}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
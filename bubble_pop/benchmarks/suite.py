@@ -0,0 +1,288 @@
+"""
+Benchmark suite headless (SDL dummy, tanpa kamera) dengan output JSON.
+
+Case:
+  game.update / game.draw    per jumlah bubble x partikel
+  background.draw            CameraBackground per resolusi kamera
+  ui.lobby / ui.game_over    layer cache dingin (cold) dan hangat (warm)
+  tracker.face / tracker.hand  di gambar sampel / frame sesi rekaman
+
+  python -m benchmarks.suite --out hasil.json [--images "samples/*.jpg"] [--session sesi1]
+  python -m benchmarks.suite --compare baseline.json --tolerance 0.15
+
+--compare membandingkan p50 tiap case dengan file hasil sebelumnya; exit
+code 1 kalau ada yang lebih lambat dari toleransi (buat CI sebelum deploy
+ke kiosk).
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+
+import cv2
+import numpy as np
+import pygame
+
+import ui_cache
+from background import CameraBackground
+from game import Game, PLAYER_COLORS
+from hand_tracker import MODEL_PATH, HandResult
+
+W, H = 1280, 720
+BUBBLE_COUNTS = (40, 200, 1000)
+PARTICLE_COUNTS = (0, 400, 800)
+RESOLUTIONS = ((640, 480), (1280, 720), (1920, 1080))
+# Selisih p50 di bawah ini dianggap noise, bukan regresi
+MIN_REGRESSION_MS = 0.05
+
+
+def measure(fn, repeat, warmup=3, setup=None):
+    """Statistik waktu fn() dalam ms; setup() jalan sebelum tiap call, di luar timing."""
+    for _ in range(warmup):
+        if setup:
+            setup()
+        fn()
+    times = np.empty(repeat)
+    for i in range(repeat):
+        if setup:
+            setup()
+        t0 = time.perf_counter()
+        fn()
+        times[i] = (time.perf_counter() - t0) * 1000.0
+    p50, p95, p99 = np.percentile(times, (50, 95, 99))
+    return {"mean": float(times.mean()), "p50": float(p50), "p95": float(p95),
+            "p99": float(p99), "min": float(times.min()), "n": repeat}
+
+
+def moving_hands(i):
+    """Dua tangan sintetis yang bergerak, satu per sisi layar."""
+    lm = np.zeros((2, 21, 3), dtype=np.float32)
+    lm[0, :, 0] = 0.25 + 0.2 * np.sin(i * 0.1)
+    lm[0, :, 1] = 0.5 + 0.4 * np.cos(i * 0.07)
+    lm[1, :, 0] = 0.75 + 0.2 * np.cos(i * 0.13)
+    lm[1, :, 1] = 0.5 + 0.4 * np.sin(i * 0.05)
+    # Sebar landmark sedikit supaya skeleton tidak jadi satu titik
+    lm[:, :, :2] += np.linspace(-0.05, 0.05, 21, dtype=np.float32)[None, :, None]
+    return HandResult(lm, np.array([1, 2], dtype=np.int32),
+                      np.array([0, 1], dtype=np.int8), W, H)
+
+
+class GameFixture:
+    """Game dengan jumlah bubble / partikel dijaga konstan antar iterasi."""
+
+    def __init__(self, bubbles, particles):
+        self.bubbles = bubbles
+        self.particles = particles
+        self.game = Game(W, H, seed=0)
+        self.i = 0
+        self.hands = moving_hands(0)
+
+    def refill(self):
+        g = self.game
+        g.bubbles.compact()
+        missing = self.bubbles - len(g.bubbles)
+        if missing > 0:
+            g.bubbles.spawn(missing, start_y=g.rng.integers(0, H, missing))
+        missing = self.particles - len(g.particles)
+        if missing > 0:
+            g.particles.emit(W // 2, H // 2, PLAYER_COLORS[1], missing)
+        g.remaining = self.bubbles
+        self.i += 1
+        self.hands = moving_hands(self.i)
+
+
+def bench_game(results, repeat, screen):
+    for nb in BUBBLE_COUNTS:
+        for np_ in PARTICLE_COUNTS:
+            params = {"bubbles": nb, "particles": np_}
+            fx = GameFixture(nb, np_)
+            stats = measure(lambda: fx.game.step(fx.hands), repeat, setup=fx.refill)
+            results.append({"name": "game.update", "params": params, "ms": stats})
+
+            fx = GameFixture(nb, np_)
+            fx.refill()
+            stats = measure(lambda: fx.game.draw(screen, fx.hands), repeat, setup=fx.refill)
+            results.append({"name": "game.draw", "params": params, "ms": stats})
+
+
+def bench_background(results, repeat, screen):
+    rng = np.random.default_rng(0)
+    for w, h in RESOLUTIONS:
+        frame = rng.integers(0, 255, (h, w, 3), dtype=np.uint8)
+        background = CameraBackground((W, H))
+        stats = measure(lambda: background.draw(screen, frame), repeat)
+        results.append({"name": "background.draw", "params": {"camera": f"{w}x{h}"}, "ms": stats})
+
+
+def bench_ui(results, repeat, screen):
+    # Import di sini: main.py ikut import tracker (mediapipe)
+    from main import draw_lobby, draw_game_over
+
+    font_title = pygame.font.SysFont("Arial", 52, bold=True)
+    font_sub = pygame.font.SysFont("Arial", 34, bold=True)
+    font_hint = pygame.font.SysFont("Arial", 22)
+
+    cases = {
+        "ui.lobby": lambda: draw_lobby(screen, W, H, {1: True, 2: False}, {1: 40, 2: 12},
+                                       font_title, font_sub, font_hint),
+        "ui.game_over": lambda: draw_game_over(screen, W, H, {1: 120, 2: 90}, 1,
+                                               font_title, font_sub, font_hint),
+    }
+    for name, fn in cases.items():
+        results.append({"name": name, "params": {"cache": "cold"},
+                        "ms": measure(fn, repeat, setup=ui_cache.clear)})
+        ui_cache.clear()
+        results.append({"name": name, "params": {"cache": "warm"}, "ms": measure(fn, repeat)})
+
+
+def load_samples(args):
+    frames = []
+    if args.images:
+        for path in sorted(glob.glob(args.images)):
+            img = cv2.imread(path)
+            if img is not None:
+                frames.append(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+    if args.session:
+        from session import SessionReader
+        reader = SessionReader(args.session)
+        for seq in reader.frames["seq"][:args.max_samples].tolist():
+            frames.append(reader.frame_rgb(seq))
+    return frames[:args.max_samples]
+
+
+def bench_trackers(results, args, skipped):
+    frames = load_samples(args)
+    if not frames:
+        skipped.append({"name": "tracker.*", "reason": "tidak ada sampel (--images / --session)"})
+        return
+    from face_tracker import FaceTracker
+    from hand_tracker import HandTracker
+
+    def over_frames(fn):
+        it = iter(())
+
+        def call():
+            nonlocal it
+            rgb = next(it, None)
+            if rgb is None:
+                it = iter(frames)
+                rgb = next(it)
+            fn(rgb, rgb.shape[1], rgb.shape[0])
+        return call
+
+    repeat = max(args.repeat // 4, len(frames))
+    has_hand_model = os.path.exists(MODEL_PATH)
+    if not has_hand_model:
+        skipped.append({"name": "tracker.hand", "reason": f"{MODEL_PATH} tidak ada"})
+    for scale in (1.0, 0.5):
+        params = {"scale": scale, "samples": len(frames)}
+        face = FaceTracker(inference_scale=scale)
+        results.append({"name": "tracker.face", "params": params,
+                        "ms": measure(over_frames(face.detect_players), repeat)})
+        face.close()
+
+        if not has_hand_model:
+            continue
+        hand = HandTracker(max_hands=2, inference_scale=scale)
+        results.append({"name": "tracker.hand", "params": params,
+                        "ms": measure(over_frames(hand.process), repeat)})
+        hand.close()
+
+
+def environment():
+    try:
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                             text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        rev = None
+    return {
+        "ts": time.time(),
+        "host": socket.gethostname(),
+        "git": rev,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "opencv": cv2.__version__,
+        "pygame": pygame.version.ver,
+    }
+
+
+def case_key(result):
+    return result["name"], json.dumps(result["params"], sort_keys=True)
+
+
+def compare(results, baseline, tolerance):
+    """Return daftar case yang p50-nya naik lebih dari tolerance (relatif)."""
+    old = {case_key(r): r["ms"]["p50"] for r in baseline["results"]}
+    regressions = []
+    for r in results:
+        before = old.get(case_key(r))
+        if before is None:
+            continue
+        after = r["ms"]["p50"]
+        if after > before * (1 + tolerance) and after - before > MIN_REGRESSION_MS:
+            regressions.append({"name": r["name"], "params": r["params"],
+                                "p50_before": before, "p50_after": after,
+                                "ratio": after / before if before else None})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--only", help="prefix nama case dipisah koma, mis. game,ui")
+    parser.add_argument("--images", help="glob gambar sampel untuk tracker")
+    parser.add_argument("--session", help="folder sesi rekaman, frame-nya jadi sampel tracker")
+    parser.add_argument("--max-samples", type=int, default=50)
+    parser.add_argument("--out", help="tulis hasil JSON ke file (default stdout)")
+    parser.add_argument("--compare", metavar="BASELINE", help="hasil JSON sebelumnya")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    args = parser.parse_args()
+
+    only = tuple(args.only.split(",")) if args.only else None
+
+    def wanted(group):
+        return only is None or group.startswith(only)
+
+    pygame.init()
+    screen = pygame.display.set_mode((W, H))
+    results, skipped = [], []
+    if wanted("game"):
+        bench_game(results, args.repeat, screen)
+    if wanted("background"):
+        bench_background(results, args.repeat, screen)
+    if wanted("ui"):
+        bench_ui(results, args.repeat, screen)
+    if wanted("tracker"):
+        bench_trackers(results, args, skipped)
+    pygame.quit()
+
+    report = {"env": environment(), "screen": f"{W}x{H}", "results": results, "skipped": skipped}
+    exit_code = 0
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        report["baseline"] = {"path": args.compare, "git": baseline.get("env", {}).get("git"),
+                              "tolerance": args.tolerance}
+        report["regressions"] = compare(results, baseline, args.tolerance)
+        exit_code = 1 if report["regressions"] else 0
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    for r in report.get("regressions", []):
+        print(f"[REGRESI] {r['name']} {r['params']}: p50 {r['p50_before']:.3f} -> "
+              f"{r['p50_after']:.3f} ms", file=sys.stderr)
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
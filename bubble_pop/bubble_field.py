@@ -0,0 +1,224 @@
+import math
+
+import numpy as np
+
+from spatial_grid import SpatialGrid
+from sprites import bubble_sprite
+
+
+class BubbleField:
+    """
+    Struct-of-arrays bubble store.
+
+    Every bubble attribute lives in its own NumPy array (slot i across all
+    arrays is one bubble), so motion, wall bounce, off-screen culling and
+    fingertip hit testing run as batched array operations instead of a
+    Python loop over Bubble objects. Slots [0, n) are in use.
+
+    prev_x / prev_y hold each bubble's position before the last update(), so
+    hit testing can sweep both the fingertip and the bubble over the tick.
+    id is a per-field serial number that survives compact(); ids in [0, n)
+    are always ascending.
+    """
+
+    MIN_RADIUS = 22
+    MAX_RADIUS = 52
+    SPEED_MIN = 0.6
+    SPEED_MAX = 2.2
+    # Di bawah jumlah pasangan (bubble x fingertip) ini hit test dense masih
+    # lebih murah dari build + query grid (lihat benchmarks/hit_test.py)
+    GRID_MIN_PAIRS = 5000
+
+    def __init__(self, screen_w, screen_h, capacity=64, rng=None):
+        self.screen_w = screen_w
+        self.screen_h = screen_h
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.n = 0
+        self._next_id = 0
+        self._alloc(capacity)
+        # Cell = diameter bubble terbesar, query fingertip diam cukup 3x3 cell
+        self.grid = SpatialGrid(screen_w, screen_h, self.MAX_RADIUS * 2)
+
+    def _alloc(self, capacity):
+        old_n = self.n
+        fields = {
+            "x": np.float64, "y": np.float64,
+            "prev_x": np.float64, "prev_y": np.float64,
+            "vx": np.float64, "vy": np.float64,
+            "wobble": np.float64, "wobble_speed": np.float64,
+            "radius": np.int32, "alpha": np.int32,
+            "alive": np.bool_, "id": np.uint32,
+        }
+        for name, dtype in fields.items():
+            arr = np.zeros(capacity, dtype=dtype)
+            if old_n:
+                arr[:old_n] = getattr(self, name)[:old_n]
+            setattr(self, name, arr)
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.n
+
+    def spawn(self, count, start_y=None):
+        """
+        Tambah `count` bubble baru.
+        start_y: None = muncul dari bawah layar, selain itu scalar / array posisi y.
+        """
+        if count <= 0:
+            return
+        if self.n + count > self.capacity:
+            self._alloc(max(self.capacity * 2, self.n + count))
+
+        rng = self.rng
+        s = slice(self.n, self.n + count)
+        radius = rng.integers(self.MIN_RADIUS, self.MAX_RADIUS + 1, count)
+        self.radius[s] = radius
+        # randint(radius, screen_w - radius) per bubble, inklusif
+        self.x[s] = np.floor(radius + rng.random(count) * (self.screen_w - 2 * radius + 1))
+        self.y[s] = self.screen_h + radius if start_y is None else start_y
+        self.prev_x[s] = self.x[s]
+        self.prev_y[s] = self.y[s]
+        self.vy[s] = -rng.uniform(self.SPEED_MIN, self.SPEED_MAX, count)
+        self.vx[s] = rng.uniform(-0.6, 0.6, count)
+        self.alpha[s] = rng.integers(160, 221, count)
+        self.wobble[s] = rng.uniform(0, math.pi * 2, count)
+        self.wobble_speed[s] = rng.uniform(0.02, 0.06, count)
+        self.alive[s] = True
+        self.id[s] = np.arange(self._next_id, self._next_id + count)
+        self._next_id += count
+        self.n += count
+
+    def update(self):
+        n = self.n
+        if n == 0:
+            return
+        x, r = self.x[:n], self.radius[:n]
+        vx = self.vx[:n]
+        self.prev_x[:n] = x
+        self.prev_y[:n] = self.y[:n]
+
+        self.wobble[:n] += self.wobble_speed[:n]
+        x += vx + np.sin(self.wobble[:n]) * 0.4
+        self.y[:n] += self.vy[:n]
+
+        # Pantul di dinding kiri/kanan
+        hit_wall = (x - r < 0) | (x + r > self.screen_w)
+        vx[hit_wall] *= -1
+        np.clip(x, r, self.screen_w - r, out=x, where=hit_wall)
+
+        # Keluar layar atas
+        self.alive[:n] &= self.y[:n] + r >= 0
+
+    def pop_hits(self, points, prev_points=None, use_grid=None):
+        """
+        Swept hit test semua bubble hidup terhadap fingertip.
+
+        points: posisi fingertip sekarang (m, 2). prev_points: posisi tick
+        sebelumnya (m, 2), None = diam di tempat. Tiap fingertip bergerak
+        lurus prev -> sekarang sementara bubble bergerak prev_x/y -> x/y;
+        bubble kena kalau jarak terdekat keduanya selama tick < radius.
+        Jadi fingertip yang lompat jauh (tracking lambat / tangan cepat)
+        tetap memecah bubble yang dilewatinya.
+
+        use_grid: None = otomatis (grid kalau bubble x fingertip >= GRID_MIN_PAIRS).
+        Dengan grid, tiap fingertip cuma dites ke bubble di cell sekitarnya.
+
+        Bubble yang kena ditandai mati. Return (bubble_idx, point_idx): untuk
+        tiap bubble yang pecah, index titik pertama yang mengenainya (urutan
+        sama dengan loop `for hand in hands_data: ... break` yang lama).
+        """
+        n = self.n
+        empty = np.empty(0, dtype=np.intp)
+        if n == 0 or len(points) == 0:
+            return empty, empty
+
+        p1 = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        p0 = p1 if prev_points is None else np.asarray(prev_points, dtype=np.float64).reshape(-1, 2)
+
+        if use_grid is None:
+            use_grid = n * len(p1) >= self.GRID_MIN_PAIRS
+        if use_grid:
+            b, p = self._grid_candidates(p0, p1)
+        else:
+            b = np.repeat(np.arange(n), len(p1))
+            p = np.tile(np.arange(len(p1)), n)
+
+        hit = self._swept_hit(b, p, p0, p1)
+        b, p = b[hit], p[hit]
+        if len(b) == 0:
+            return empty, empty
+
+        # Per bubble ambil fingertip dengan index terkecil
+        order = np.lexsort((p, b))
+        b, p = b[order], p[order]
+        first = np.ones(len(b), dtype=bool)
+        first[1:] = b[1:] != b[:-1]
+        bubble_idx, point_idx = b[first], p[first]
+        self.alive[bubble_idx] = False
+        return bubble_idx, point_idx
+
+    def _grid_candidates(self, p0, p1):
+        n = self.n
+        x, y = self.x[:n], self.y[:n]
+        self.grid.build(x, y)
+        # Pad = radius terbesar + gerak bubble terjauh di tick ini
+        move = np.max(np.abs(x - self.prev_x[:n]) + np.abs(y - self.prev_y[:n]))
+        pad = float(self.radius[:n].max()) + float(move)
+
+        bs, ps = [], []
+        for i, ((x0, y0), (x1, y1)) in enumerate(zip(p0.tolist(), p1.tolist())):
+            cand = self.grid.query(min(x0, x1) - pad, min(y0, y1) - pad,
+                                   max(x0, x1) + pad, max(y0, y1) + pad)
+            bs.append(cand)
+            ps.append(np.full(len(cand), i, dtype=np.intp))
+        return np.concatenate(bs), np.concatenate(ps)
+
+    def _swept_hit(self, b, p, p0, p1):
+        """Swept test untuk pasangan (bubble b[k], fingertip p[k])."""
+        # Gerak relatif fingertip di frame bubble: a (awal) -> a + d (akhir)
+        ax = p0[p, 0] - self.prev_x[b]
+        ay = p0[p, 1] - self.prev_y[b]
+        dx = (p1[p, 0] - self.x[b]) - ax
+        dy = (p1[p, 1] - self.y[b]) - ay
+
+        # Titik terdekat ke pusat bubble di segmen, t dijepit ke [0, 1]
+        dd = dx * dx + dy * dy
+        with np.errstate(invalid="ignore", divide="ignore"):
+            t = np.where(dd > 0, -(ax * dx + ay * dy) / dd, 0.0)
+        np.clip(t, 0.0, 1.0, out=t)
+        cx = ax + t * dx
+        cy = ay + t * dy
+
+        r = self.radius[b].astype(np.float64)
+        return (cx * cx + cy * cy < r * r) & self.alive[b]
+
+    def compact(self):
+        """Buang bubble mati secara in-place. Return jumlah yang dibuang."""
+        n = self.n
+        keep = self.alive[:n]
+        k = int(np.count_nonzero(keep))
+        if k == n:
+            return 0
+        for arr in (self.x, self.y, self.prev_x, self.prev_y, self.vx, self.vy, self.wobble,
+                    self.wobble_speed, self.radius, self.alpha, self.id, self.alive):
+            arr[:k] = arr[:n][keep]
+        self.n = k
+        return n - k
+
+    def draw(self, surface, alpha=1.0):
+        """alpha: interpolasi antara posisi tick sebelumnya (0) dan sekarang (1)."""
+        n = self.n
+        if n == 0:
+            return
+        r = self.radius[:n]
+        x, y = self.x[:n], self.y[:n]
+        if alpha < 1.0:
+            x = self.prev_x[:n] + (x - self.prev_x[:n]) * alpha
+            y = self.prev_y[:n] + (y - self.prev_y[:n]) * alpha
+        xs = (x.astype(np.int32) - r - 2).tolist()
+        ys = (y.astype(np.int32) - r - 2).tolist()
+        surface.blits(
+            [(bubble_sprite(rad, a), (bx, by))
+             for rad, a, bx, by in zip(r.tolist(), self.alpha[:n].tolist(), xs, ys)],
+            doreturn=False,
+        )
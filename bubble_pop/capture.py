@@ -0,0 +1,133 @@
+import threading
+import time
+from collections import deque
+
+import cv2
+
+
+class Frame:
+    """Satu frame kamera yang sudah di-flip dan dikonversi ke RGB."""
+
+    __slots__ = ("rgb", "seq", "t_capture", "convert_ms", "buffer_age_ms")
+
+    def __init__(self, rgb, seq, t_capture, convert_ms=0.0, buffer_age_ms=None):
+        self.rgb = rgb
+        self.seq = seq                # nomor urut frame dari thread capture
+        self.t_capture = t_capture    # time.perf_counter() saat frame diterima
+        self.convert_ms = convert_ms  # durasi flip + BGR->RGB di thread capture
+        # Umur frame di buffer driver/OpenCV saat read() selesai (None = tidak diukur)
+        self.buffer_age_ms = buffer_age_ms
+
+    @property
+    def age_ms(self):
+        return (time.perf_counter() - self.t_capture) * 1000.0
+
+
+class CameraCapture:
+    """
+    Grab frames on a background thread into a small ring buffer.
+
+    The capture thread does cap.read(), flip and BGR->RGB conversion, so a
+    stalling webcam never blocks the render loop. cap is a cv2.VideoCapture
+    or any source from sources.py. latest() always hands out
+    the newest frame; anything older that was never consumed is dropped.
+    """
+
+    def __init__(self, cap, flip=True, buffer_size=2, measure_buffer_age=False):
+        self.cap = cap
+        self.flip = flip
+        self.measure_buffer_age = measure_buffer_age
+        self._buffer = deque(maxlen=buffer_size)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._running = False
+
+        self._seq = 0
+        self._last = None          # frame terakhir yang diserahkan ke game loop
+        self.frames_captured = 0
+        self.frames_dropped = 0    # frame yang tertimpa sebelum sempat dipakai
+        self.read_failures = 0
+        self._fps = 0.0
+        self._last_grab_t = None
+
+    def start(self):
+        if self._thread is not None:
+            return self
+        # Buffer internal OpenCV cuma nambah latency, kita punya buffer sendiri
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="camera-capture", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while self._running:
+            ret, frame = self.cap.read()
+            if not ret:
+                if getattr(self.cap, "finished", False):
+                    break   # file / image sequence habis
+                self.read_failures += 1
+                time.sleep(0.005)
+                continue
+
+            t = time.perf_counter()
+            buffer_age_ms = self._buffer_age_ms() if self.measure_buffer_age else None
+            if self.flip:
+                frame = cv2.flip(frame, 1)
+            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            convert_ms = (time.perf_counter() - t) * 1000.0
+
+            if self._last_grab_t is not None:
+                dt = t - self._last_grab_t
+                if dt > 0:
+                    # EMA supaya angka FPS tidak loncat-loncat
+                    self._fps = 0.9 * self._fps + 0.1 * (1.0 / dt) if self._fps else 1.0 / dt
+            self._last_grab_t = t
+
+            with self._lock:
+                self._seq += 1
+                if len(self._buffer) == self._buffer.maxlen:
+                    self.frames_dropped += 1
+                self._buffer.append(Frame(rgb, self._seq, t, convert_ms, buffer_age_ms))
+                self.frames_captured += 1
+
+    def _buffer_age_ms(self):
+        # Backend V4L2 mengisi POS_MSEC dengan timestamp buffer kernel
+        # (CLOCK_MONOTONIC, sama dengan time.monotonic() di Linux). Backend lain
+        # sering isi 0 / posisi relatif, nilai yang tidak masuk akal dibuang.
+        pos_ms = self.cap.get(cv2.CAP_PROP_POS_MSEC)
+        if pos_ms <= 0:
+            return None
+        age = time.monotonic() * 1000.0 - pos_ms
+        return age if 0 <= age < 5000 else None
+
+    def latest(self):
+        """
+        Return the newest Frame, or None if no frame has arrived yet.
+
+        Never blocks. If no new frame arrived since the last call the previous
+        frame is returned again; check Frame.seq to tell them apart.
+        """
+        with self._lock:
+            if self._buffer:
+                # Frame lama di buffer tidak pernah dipakai -> dihitung drop
+                self.frames_dropped += len(self._buffer) - 1
+                self._last = self._buffer.pop()
+                self._buffer.clear()
+            return self._last
+
+    def stats(self):
+        last = self._last
+        return {
+            "capture_fps": round(self._fps, 1),
+            "frames_captured": self.frames_captured,
+            "frames_dropped": self.frames_dropped,
+            "read_failures": self.read_failures,
+            "frame_age_ms": round(last.age_ms, 1) if last is not None else None,
+        }
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
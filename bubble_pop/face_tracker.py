@@ -1,37 +1,117 @@
 import os
-import mediapipe as mp
-from mediapipe.tasks import python as mp_python
-from mediapipe.tasks.python import vision
+import threading
+import time
+
+import numpy as np
+
+from hand_tracker import WARMUP_SIZE, downscale, load_mediapipe
+from lanes import Lanes
 
 FACE_MODEL_PATH = os.path.join(os.path.dirname(__file__), "face_detector.tflite")
 
 
 class FaceTracker:
     """
-    Detect faces and assign to players by horizontal position.
-    Left half  -> Player 1
-    Right half -> Player 2
+    Detect faces and assign each to the player lane its centre is in
+    (`players` equal-width lanes, player 1 = leftmost).
+
+    async_mode=True uses LIVE_STREAM / detect_async(); detect_players() then
+    returns the latest completed result without waiting on inference.
+
+    inference_scale < 1 runs the detector on a downsampled frame; bounding
+    boxes come back in that image's pixels and are normalized by its width.
+
+    `boxes` holds the latest normalized (x0, y0, x1, y1) face box per
+    player, the starting hint for HandTracker's ROI crops.
     """
 
-    def __init__(self):
+    def __init__(self, async_mode=False, inference_scale=1.0, players=2):
+        self.async_mode = async_mode
+        self.inference_scale = inference_scale
+        self.lanes = Lanes(players)
+        self._lock = threading.Lock()
+        self._latest = set()
+        self.boxes = {}
+        self._last_ts_ms = -1
+        self._frame_size = (0, 0)
+        self._result_event = threading.Event()
+        self.last_latency_ms = None
+
+        mp, mp_python, vision = load_mediapipe()
+        self._mp = mp
         base_options = mp_python.BaseOptions(model_asset_path=FACE_MODEL_PATH)
-        options = vision.FaceDetectorOptions(base_options=base_options)
+        if async_mode:
+            options = vision.FaceDetectorOptions(
+                base_options=base_options,
+                running_mode=vision.RunningMode.LIVE_STREAM,
+                result_callback=self._on_result,
+            )
+        else:
+            options = vision.FaceDetectorOptions(base_options=base_options)
         self.detector = vision.FaceDetector.create_from_options(options)
 
     def detect_players(self, frame_rgb, frame_w, frame_h):
-        """Returns a set {1} and/or {2} of detected player numbers."""
-        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=frame_rgb)
+        """Returns the set of player numbers with a face in their lane."""
+        mp = self._mp
+        image = downscale(frame_rgb, self.inference_scale)
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=image)
+        # Bbox MediaPipe dalam pixel gambar input, bukan pixel layar
+        img_h, img_w = image.shape[:2]
+
+        if self.async_mode:
+            self._frame_size = (img_w, img_h)
+            self.detector.detect_async(mp_image, self._next_timestamp_ms())
+            with self._lock:
+                return self._latest
+
         result = self.detector.detect(mp_image)
+        detected, self.boxes = self._to_players(result, img_w, img_h)
+        return detected
+
+    def warmup(self, timeout=5.0):
+        """Dummy inference, sama seperti HandTracker.warmup()."""
+        mp = self._mp
+        blank = np.zeros((WARMUP_SIZE[1], WARMUP_SIZE[0], 3), dtype=np.uint8)
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=blank)
+        if self.async_mode:
+            self._frame_size = WARMUP_SIZE
+            self._result_event.clear()
+            self.detector.detect_async(mp_image, self._next_timestamp_ms())
+            self._result_event.wait(timeout)
+        else:
+            self.detector.detect(mp_image)
 
-        detected = set()
+    def _next_timestamp_ms(self):
+        # LIVE_STREAM butuh timestamp monotonic yang selalu naik
+        ts = int(time.monotonic() * 1000)
+        if ts <= self._last_ts_ms:
+            ts = self._last_ts_ms + 1
+        self._last_ts_ms = ts
+        return ts
+
+    def _on_result(self, result, output_image, timestamp_ms):
+        img_w, img_h = self._frame_size
+        detected, boxes = self._to_players(result, img_w, img_h)
+        with self._lock:
+            self._latest = detected
+            self.boxes = boxes
+            self.last_latency_ms = int(time.monotonic() * 1000) - timestamp_ms
+        self._result_event.set()
+
+    def _to_players(self, result, img_w, img_h):
+        """(set player, {player: box normalized}); wajah terbesar per lane yang dipakai."""
+        detected, boxes = set(), {}
         for det in result.detections:
             bbox = det.bounding_box
-            center_x_norm = (bbox.origin_x + bbox.width / 2) / frame_w
-            if center_x_norm < 0.5:
-                detected.add(1)
-            else:
-                detected.add(2)
-        return detected
+            center_x_norm = (bbox.origin_x + bbox.width / 2) / img_w
+            player = int(self.lanes.lane_of(center_x_norm))
+            detected.add(player)
+            box = (bbox.origin_x / img_w, bbox.origin_y / img_h,
+                   (bbox.origin_x + bbox.width) / img_w, (bbox.origin_y + bbox.height) / img_h)
+            old = boxes.get(player)
+            if old is None or box[2] - box[0] > old[2] - old[0]:
+                boxes[player] = box
+        return detected, boxes
 
     def close(self):
         self.detector.close()
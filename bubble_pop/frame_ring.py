@@ -0,0 +1,70 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Header per slot: seq frame di slot itu, -1 = sedang ditulis / kosong
+_HEADER_ALIGN = 64
+
+
+class SharedFrameRing:
+    """
+    Fixed-shape ring of uint8 frames in multiprocessing.shared_memory.
+
+    One writer process write()s frames round-robin into `slots` slots and
+    passes (slot, seq) to readers, which attach by name and read() a copy.
+    Each slot header holds the seq of the frame in it and is set to -1 while
+    the slot is being overwritten (a seqlock), so a reader that loses the
+    race to a newer frame gets None instead of a torn frame.
+    """
+
+    def __init__(self, shape, slots=4, name=None, create=True):
+        self.shape = tuple(shape)
+        self.slots = slots
+        self._owner = create
+        header_bytes = -(-8 * slots // _HEADER_ALIGN) * _HEADER_ALIGN
+        frame_bytes = int(np.prod(self.shape))
+        size = header_bytes + frame_bytes * slots
+
+        if create:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        else:
+            # Reader yang di-spawn dari proses yang sama berbagi resource_tracker
+            # dengan writer, jadi segmen tetap di-unlink sekali oleh writer
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+
+        self._header = np.ndarray((slots,), dtype=np.int64, buffer=self.shm.buf)
+        self._frames = np.ndarray((slots,) + self.shape, dtype=np.uint8,
+                                  buffer=self.shm.buf, offset=header_bytes)
+        if create:
+            self._header[:] = -1
+        self._seq = 0
+
+    @classmethod
+    def attach(cls, name, shape, slots):
+        return cls(shape, slots, name=name, create=False)
+
+    def write(self, frame):
+        """Salin frame ke slot berikutnya. Return (slot, seq)."""
+        self._seq += 1
+        slot = self._seq % self.slots
+        self._header[slot] = -1
+        self._frames[slot] = frame
+        self._header[slot] = self._seq
+        return slot, self._seq
+
+    def read(self, slot, seq):
+        """Salinan frame seq dari slot, atau None kalau sudah tertimpa frame lain."""
+        if self._header[slot] != seq:
+            return None
+        frame = self._frames[slot].copy()
+        if self._header[slot] != seq:
+            return None
+        return frame
+
+    def close(self):
+        # Lepas view numpy dulu, SharedMemory.close() gagal kalau buffer masih dipakai
+        self._header = self._frames = None
+        self.shm.close()
+        if self._owner:
+            self.shm.unlink()
@@ -1,120 +1,76 @@
 import pygame
-import random
-import math
+import numpy as np
+
+from bubble_field import BubbleField
+from hand_tracker import HAND_CONNECTIONS
+from particles import ParticleSystem
+from ui_cache import render_text
 
 PLAYER_COLORS = {
-    1: (100, 200, 255),   # Blue  - Player 1
+    1: (100, 200, 255),   # Blue   - Player 1
     2: (255, 150, 100),   # Orange - Player 2
+    3: (140, 235, 120),   # Green  - Player 3
+    4: (230, 120, 230),   # Pink   - Player 4
+    5: (250, 225, 90),    # Yellow - Player 5
+    6: (170, 140, 255),   # Purple - Player 6
 }
 
 POP_PARTICLE_COUNT = 10
-
-
-class Bubble:
-    MIN_RADIUS = 22
-    MAX_RADIUS = 52
-    SPEED_MIN = 0.6
-    SPEED_MAX = 2.2
-
-    def __init__(self, screen_w, screen_h, start_y=None):
-        self.radius = random.randint(self.MIN_RADIUS, self.MAX_RADIUS)
-        self.x = float(random.randint(self.radius, screen_w - self.radius))
-        # start_y: kalau None muncul dari bawah, kalau diset langsung di posisi itu
-        self.y = float(start_y if start_y is not None else screen_h + self.radius)
-        self.vy = -random.uniform(self.SPEED_MIN, self.SPEED_MAX)
-        self.vx = random.uniform(-0.6, 0.6)
-        self.alpha = random.randint(160, 220)
-        self.alive = True
-        self.screen_w = screen_w
-        self.screen_h = screen_h
-        self.wobble = random.uniform(0, math.pi * 2)
-        self.wobble_speed = random.uniform(0.02, 0.06)
-
-    def update(self):
-        self.wobble += self.wobble_speed
-        self.x += self.vx + math.sin(self.wobble) * 0.4
-        self.y += self.vy
-
-        if self.x - self.radius < 0 or self.x + self.radius > self.screen_w:
-            self.vx *= -1
-            self.x = max(self.radius, min(self.screen_w - self.radius, self.x))
-
-        if self.y + self.radius < 0:
-            self.alive = False
-
-    def check_pop(self, index_tip):
-        """Hanya index finger tip yang bisa pop bubble."""
-        fx, fy = index_tip
-        return math.hypot(fx - self.x, fy - self.y) < self.radius
-
-    def draw(self, surface):
-        size = self.radius * 2 + 4
-        bubble_surf = pygame.Surface((size, size), pygame.SRCALPHA)
-        cx = cy = self.radius + 2
-
-        pygame.draw.circle(bubble_surf, (255, 255, 255, self.alpha // 4), (cx, cy), self.radius)
-        pygame.draw.circle(bubble_surf, (255, 255, 255, self.alpha), (cx, cy), self.radius, 2)
-        glint_x = cx - self.radius // 3
-        glint_y = cy - self.radius // 3
-        pygame.draw.circle(bubble_surf, (255, 255, 255, self.alpha), (glint_x, glint_y), self.radius // 5)
-
-        surface.blit(bubble_surf, (int(self.x) - self.radius - 2, int(self.y) - self.radius - 2))
-
-
-class PopParticle:
-    def __init__(self, x, y, color):
-        angle = random.uniform(0, math.pi * 2)
-        speed = random.uniform(2, 7)
-        self.x = float(x)
-        self.y = float(y)
-        self.vx = math.cos(angle) * speed
-        self.vy = math.sin(angle) * speed
-        self.life = 1.0
-        self.color = color
-        self.radius = random.randint(3, 7)
-
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.vy += 0.18
-        self.life -= 0.055
-
-    @property
-    def alive(self):
-        return self.life > 0
-
-    def draw(self, surface):
-        alpha = int(self.life * 255)
-        r, g, b = self.color
-        s = pygame.Surface((self.radius * 2, self.radius * 2), pygame.SRCALPHA)
-        pygame.draw.circle(s, (r, g, b, alpha), (self.radius, self.radius), self.radius)
-        surface.blit(s, (int(self.x) - self.radius, int(self.y) - self.radius))
+# Batas keras jumlah partikel hidup; burst besar dipotong, bukan bikin frame drop
+MAX_PARTICLES = 800
 
 
 class Game:
-    TOTAL_BUBBLES  = 40   # jumlah fixed bubble per ronde
+    BUBBLES_PER_PLAYER = 20   # jumlah fixed bubble per ronde = ini x jumlah player
     POINTS_PER_POP = 10
-
-    def __init__(self, screen_w, screen_h):
+    # Fingertip yang pindah lebih jauh dari ini dalam satu tick dianggap
+    # teleport (salah deteksi / tangan baru), tidak di-sweep
+    MAX_SWEEP_PX   = 300
+    # True = kelima fingertip bisa pop bubble, False = cuma index finger tip
+    ALL_FINGERTIPS_POP = True
+    # Gambar skeleton tangan (21 landmark) di bawah cursor
+    DRAW_SKELETON = True
+    # Simulasi jalan di rate tetap, lepas dari FPS render. Semua konstanta
+    # gerak (vy, wobble_speed, decay partikel) di-tuning per tick di 30 Hz.
+    SIM_HZ         = 30
+    SIM_DT         = 1.0 / SIM_HZ
+    # Batas tick per update; kalau mesin ketinggalan jauh sisa waktu dibuang
+    MAX_STEPS_PER_UPDATE = 5
+
+    def __init__(self, screen_w, screen_h, seed=None, players=2):
         self.screen_w = screen_w
         self.screen_h = screen_h
-        self.bubbles: list[Bubble] = []
-        self.particles: list[PopParticle] = []
-        self.scores = {1: 0, 2: 0}
-        self.remaining = self.TOTAL_BUBBLES
+        self.players = players
+        self.total_bubbles = self.BUBBLES_PER_PLAYER * players
+        # Semua random (spawn, partikel) dari satu generator; seed sama →
+        # ronde sama persis untuk input tangan yang sama (replay sesi)
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.bubbles = BubbleField(screen_w, screen_h, capacity=self.total_bubbles, rng=self.rng)
+        self.particles = ParticleSystem(capacity=MAX_PARTICLES, rng=self.rng)
+        self.scores = {p: 0 for p in range(1, players + 1)}
+        self.remaining = self.total_bubbles
+        self._prev_tips = {}   # player -> array fingertip (k, 2) tick sebelumnya
+        self._accum = 0.0      # waktu nyata yang belum disimulasikan
+        self._alpha = 1.0      # posisi render di antara tick sebelumnya dan sekarang
+        self.ticks = 0
+        # t_capture frame sumber untuk tiap pop, diambil main untuk ukur latency
+        self.pop_capture_times = []
+        # Bisa diturunkan QualityGovernor saat mesin keberatan
+        self.particles_per_pop = POP_PARTICLE_COUNT
+        self.draw_skeleton = self.DRAW_SKELETON
         self.font_large = pygame.font.SysFont("Arial", 52, bold=True)
         self.font_small = pygame.font.SysFont("Arial", 28)
 
     def initial_spawn(self):
         """Spawn semua bubble sekaligus, sebar di seluruh layar."""
-        for _ in range(self.TOTAL_BUBBLES):
-            b = Bubble(self.screen_w, self.screen_h)
-            b.y = float(random.randint(
-                int(self.screen_h * 0.05),
-                int(self.screen_h * 0.90),
-            ))
-            self.bubbles.append(b)
-        self.remaining = self.TOTAL_BUBBLES
+        start_y = self.rng.integers(
+            int(self.screen_h * 0.05),
+            int(self.screen_h * 0.90) + 1,
+            self.total_bubbles,
+        )
+        self.bubbles.spawn(self.total_bubbles, start_y=start_y)
+        self.remaining = self.total_bubbles
 
     @property
     def finished(self):
@@ -122,69 +78,130 @@ class Game:
         return self.remaining == 0 and len(self.bubbles) == 0
 
     def get_winner(self):
-        """Return 1, 2, atau None (seri)."""
-        if self.scores[1] > self.scores[2]:
+        """Return player dengan skor tertinggi, atau None kalau skor tertinggi seri."""
+        best = max(self.scores.values())
+        leaders = [p for p, score in self.scores.items() if score == best]
+        return leaders[0] if len(leaders) == 1 else None
+
+    def update(self, hands, dt=None):
+        """
+        Advance the simulation by dt seconds of real time in fixed SIM_DT steps.
+
+        Leftover time stays in the accumulator and sets the interpolation
+        factor draw() uses. dt=None runs exactly one tick, which is how
+        headless code drives the game faster than real time.
+        Returns the number of ticks run.
+        """
+        if dt is None:
+            self.step(hands)
+            self._alpha = 1.0
             return 1
-        if self.scores[2] > self.scores[1]:
-            return 2
-        return None
-
-    def update(self, hands_data):
-        for bubble in self.bubbles:
-            bubble.update()
-            for hand in hands_data:
-                if bubble.alive and bubble.check_pop(hand["index_tip"]):
-                    bubble.alive = False
-                    player = hand["player"]
-                    self.scores[player] += self.POINTS_PER_POP
-                    color = PLAYER_COLORS[player]
-                    for _ in range(POP_PARTICLE_COUNT):
-                        self.particles.append(PopParticle(bubble.x, bubble.y, color))
-                    break
+
+        self._accum += dt
+        steps = 0
+        while self._accum >= self.SIM_DT and steps < self.MAX_STEPS_PER_UPDATE:
+            self.step(hands)
+            self._accum -= self.SIM_DT
+            steps += 1
+        if steps == self.MAX_STEPS_PER_UPDATE:
+            self._accum = min(self._accum, self.SIM_DT)
+        self._alpha = self._accum / self.SIM_DT
+        return steps
+
+    def step(self, hands):
+        """Satu tick simulasi tetap (SIM_DT). hands: HandResult."""
+        self.ticks += 1
+        self.bubbles.update()
+
+        # (n_hands, k, 2) pixel fingertip yang boleh pop bubble
+        tips = hands.fingertips if self.ALL_FINGERTIPS_POP else hands.index_tips[:, None]
+        players = hands.players.tolist()
+        prev = self._sweep_start(players, tips)
+        self._prev_tips = {p: tips[i] for i, p in enumerate(players)}
+
+        k = tips.shape[1]
+        popped, tip_idx = self.bubbles.pop_hits(tips.reshape(-1, 2), prev.reshape(-1, 2))
+        for b, t in zip(popped.tolist(), tip_idx.tolist()):
+            player = players[t // k]
+            self.scores[player] += self.POINTS_PER_POP
+            color = PLAYER_COLORS[player]
+            self.particles.emit(self.bubbles.x[b], self.bubbles.y[b], color, self.particles_per_pop)
+            if hands.t_capture is not None:
+                self.pop_capture_times.append(hands.t_capture)
 
         # Hitung bubble yang hilang (dipop atau keluar layar atas)
-        dead = [b for b in self.bubbles if not b.alive]
-        self.remaining = max(0, self.remaining - len(dead))
-        self.bubbles = [b for b in self.bubbles if b.alive]
+        dead = self.bubbles.compact()
+        self.remaining = max(0, self.remaining - dead)
 
-        for p in self.particles:
-            p.update()
-        self.particles = [p for p in self.particles if p.alive]
+        self.particles.update()
 
-    def draw(self, surface, hands_data):
-        # Divider
-        pygame.draw.line(surface, (255, 255, 255),
-                         (self.screen_w // 2, 0), (self.screen_w // 2, self.screen_h), 2)
+    def _sweep_start(self, players, tips):
+        """Posisi awal sweep tiap fingertip; tanpa riwayat atau teleport = diam."""
+        prev = tips.copy()
+        for i, player in enumerate(players):
+            last = self._prev_tips.get(player)
+            if last is None or last.shape != tips[i].shape:
+                continue
+            jump = np.linalg.norm(tips[i] - last, axis=1)
+            prev[i] = np.where((jump <= self.MAX_SWEEP_PX)[:, None], last, tips[i])
+        return prev
 
-        for bubble in self.bubbles:
-            bubble.draw(surface)
+    def lane_x(self, player):
+        """(kiri, tengah, kanan) lane player dalam pixel layar."""
+        lane_w = self.screen_w / self.players
+        return (int((player - 1) * lane_w), int((player - 0.5) * lane_w), int(player * lane_w))
 
-        for p in self.particles:
-            p.draw(surface)
+    def draw(self, surface, hands=None):
+        # Divider antar lane
+        for p in range(1, self.players):
+            x = self.lane_x(p)[2]
+            pygame.draw.line(surface, (255, 255, 255), (x, 0), (x, self.screen_h), 2)
 
-        # Hanya tampilkan cursor index finger tip
-        for hand in hands_data:
-            color = PLAYER_COLORS[hand["player"]]
-            fx, fy = hand["index_tip"]
-            pygame.draw.circle(surface, color, (fx, fy), 12)
-            pygame.draw.circle(surface, (255, 255, 255), (fx, fy), 12, 2)
+        self.bubbles.draw(surface, self._alpha)
+
+        self.particles.draw(surface, self._alpha)
+
+        if hands is not None and len(hands):
+            self._draw_hands(surface, hands)
 
         self._draw_scores(surface)
 
+    def _draw_hands(self, surface, hands):
+        # Skeleton tipis, titik kecil di fingertip, cursor besar di index tip
+        skeleton = hands.pixels().astype(np.int32).tolist()
+        fingertips = hands.fingertips.astype(np.int32).tolist()
+        index_tips = hands.index_tips.astype(np.int32).tolist()
+        for i, player in enumerate(hands.players.tolist()):
+            color = PLAYER_COLORS[player]
+            if self.draw_skeleton:
+                pts = skeleton[i]
+                for a, b in HAND_CONNECTIONS:
+                    pygame.draw.line(surface, color, pts[a], pts[b], 2)
+            if self.ALL_FINGERTIPS_POP:
+                for tip in fingertips[i]:
+                    pygame.draw.circle(surface, color, tip, 6)
+            fx, fy = index_tips[i]
+            pygame.draw.circle(surface, color, (fx, fy), 12)
+            pygame.draw.circle(surface, (255, 255, 255), (fx, fy), 12, 2)
+
     def _draw_scores(self, surface):
-        c1 = PLAYER_COLORS[1]
-        lbl1 = self.font_small.render("Player 1", True, c1)
-        sc1  = self.font_large.render(str(self.scores[1]), True, c1)
-        surface.blit(lbl1, (20, 15))
-        surface.blit(sc1,  (20, 48))
-
-        c2 = PLAYER_COLORS[2]
-        lbl2 = self.font_small.render("Player 2", True, c2)
-        sc2  = self.font_large.render(str(self.scores[2]), True, c2)
-        surface.blit(lbl2, (self.screen_w - lbl2.get_width() - 20, 15))
-        surface.blit(sc2,  (self.screen_w - sc2.get_width()  - 20, 48))
-
-        # Sisa bubble di tengah atas
+        # Lane paling kiri rata kiri, paling kanan rata kanan, sisanya di tengah lane
+        for p in range(1, self.players + 1):
+            color = PLAYER_COLORS[p]
+            lbl = render_text(self.font_small, f"Player {p}", color)
+            sc  = render_text(self.font_large, str(self.scores[p]), color)
+            left, center, right = self.lane_x(p)
+            for surf, y in ((lbl, 15), (sc, 48)):
+                if p == 1:
+                    x = left + 20
+                elif p == self.players:
+                    x = right - surf.get_width() - 20
+                else:
+                    x = center - surf.get_width() // 2
+                surface.blit(surf, (x, y))
+
+        # Sisa bubble: tengah atas kalau kosong (2 player), selain itu tengah bawah
         font_rem = self.font_small
-        rem_surf = font_rem.render(f"Bubble: {self.remaining}", True, (255, 255, 255))
-        surface.blit(rem_surf, (self.screen_w // 2 - rem_surf.get_width() // 2, 15))
+        rem_surf = render_text(font_rem, f"Bubble: {self.remaining}", (255, 255, 255))
+        rem_y = 15 if self.players == 2 else self.screen_h - rem_surf.get_height() - 15
+        surface.blit(rem_surf, (self.screen_w // 2 - rem_surf.get_width() // 2, rem_y))
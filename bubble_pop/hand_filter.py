@@ -0,0 +1,169 @@
+import time
+
+import numpy as np
+
+from hand_tracker import HandResult
+
+
+class AlphaBetaFilter:
+    """
+    Alpha-beta (g-h) filter over a fixed set of points.
+
+    Tracks position and velocity for all points at once (arrays of any
+    shape, e.g. one hand's (21, 3) landmarks) in a single update.
+    """
+
+    def __init__(self, points, t, alpha=0.85, beta=0.3):
+        self.alpha = alpha
+        self.beta = beta
+        self.pos = np.asarray(points, dtype=np.float64).copy()
+        self.vel = np.zeros_like(self.pos)
+        self.t = t
+
+    def predict(self, t):
+        return self.pos + self.vel * max(t - self.t, 0.0)
+
+    def update(self, points, t):
+        dt = t - self.t
+        if dt <= 0:
+            self.pos[:] = points
+            return self.pos
+        pred = self.pos + self.vel * dt
+        residual = np.asarray(points, dtype=np.float64) - pred
+        self.pos = pred + self.alpha * residual
+        self.vel = self.vel + (self.beta / dt) * residual
+        self.t = t
+        return self.pos
+
+
+class PredictiveHandTracker:
+    """
+    Run the hand landmarker only every Nth frame and predict in between.
+
+    Wraps a HandTracker. Each player gets an AlphaBetaFilter over its full
+    set of normalized landmarks. On detection frames the filters
+    are corrected with the fresh landmarks and players missing from the
+    fresh result are dropped; on all other frames positions are
+    extrapolated from the filter velocity. With adaptive=True the
+    detection interval grows while inference eats too much of the frame
+    budget and shrinks again when it is cheap.
+    """
+
+    def __init__(self, tracker, detect_every=2, adaptive=True, frame_budget_ms=33.3,
+                 max_every=4, lost_after_s=0.25, max_predict_s=0.15):
+        self.tracker = tracker
+        self.detect_every = detect_every
+        self.adaptive = adaptive
+        self.frame_budget_ms = frame_budget_ms
+        self.min_every = 1
+        self.max_every = max_every
+        self.lost_after_s = lost_after_s
+        self.max_predict_s = max_predict_s
+
+        self._filters = {}       # player -> AlphaBetaFilter
+        self._last_seen = {}     # player -> waktu terakhir terdeteksi
+        self._handedness = {}    # player -> handedness terakhir
+        self._frames_since = detect_every
+        self._last_raw = None
+        self._size = (0, 0)
+        self._t_capture = None   # capture time frame deteksi terakhir
+        self.detections = 0
+        self.predictions = 0
+
+    def process(self, frame_rgb, frame_w, frame_h, t_capture=None):
+        """Same contract as HandTracker.process; detects or predicts depending on cadence."""
+        self._size = (frame_w, frame_h)
+        self._frames_since += 1
+        if self._frames_since < self.detect_every and self._filters:
+            return self.predict()
+
+        self._frames_since = 0
+        t0 = time.perf_counter()
+        raw = self.tracker.process(frame_rgb, frame_w, frame_h, t_capture)
+        call_ms = (time.perf_counter() - t0) * 1000.0
+        self.detections += 1
+
+        # Mode async bisa balikin hasil yang sama dengan sebelumnya
+        if raw is not self._last_raw:
+            self._last_raw = raw
+            self._t_capture = raw.t_capture
+            self._correct(raw, self._detection_time(raw, t0))
+
+        if self.adaptive:
+            cost_ms = call_ms
+            latency = getattr(self.tracker, "last_latency_ms", None)
+            if getattr(self.tracker, "async_mode", False) and latency is not None:
+                cost_ms = latency
+            self._adapt(cost_ms)
+
+        return self._output()
+
+    def _detection_time(self, hands, t_call):
+        """
+        Waktu frame hasil deteksi (t_capture), bukan waktu panggilan: hasil
+        async bisa beberapa frame lebih tua. t_call kalau t_capture tidak
+        ada, atau bukan dari jam perf_counter (replay --retrack pakai waktu
+        relatif rekaman) sehingga jatuh di luar jendela tracking.
+        """
+        t = hands.t_capture
+        if t is None or not 0.0 <= t_call - t <= self.lost_after_s:
+            return t_call
+        return t
+
+    def _correct(self, hands, t):
+        # Hasil deteksi baru adalah kebenaran: player yang tidak ada di sana
+        # tidak di-coast lagi, kalau tidak cursor hantu tetap memecah bubble
+        for player in set(self._filters) - set(hands.players.tolist()):
+            del self._filters[player]
+            del self._last_seen[player]
+            del self._handedness[player]
+        for i, player in enumerate(hands.players.tolist()):
+            f = self._filters.get(player)
+            if f is None or t - self._last_seen.get(player, t) > self.lost_after_s:
+                self._filters[player] = AlphaBetaFilter(hands.landmarks[i], t)
+            else:
+                f.update(hands.landmarks[i], t)
+            self._last_seen[player] = t
+            self._handedness[player] = hands.handedness[i]
+
+    def _adapt(self, cost_ms):
+        if cost_ms > self.frame_budget_ms * 0.5:
+            self.detect_every = min(self.detect_every + 1, self.max_every)
+        elif cost_ms < self.frame_budget_ms * 0.25:
+            self.detect_every = max(self.detect_every - 1, self.min_every)
+
+    def predict(self):
+        """Posisi fingertip semua player yang masih di-track, diekstrapolasi ke sekarang."""
+        self.predictions += 1
+        return self._output()
+
+    def _output(self):
+        t = time.perf_counter()
+        frame_w, frame_h = self._size
+        players, landmarks, handedness = [], [], []
+        for player in sorted(self._filters):
+            if t - self._last_seen[player] > self.lost_after_s:
+                del self._filters[player]
+                del self._last_seen[player]
+                del self._handedness[player]
+                continue
+            f = self._filters[player]
+            players.append(player)
+            landmarks.append(f.predict(min(t, f.t + self.max_predict_s)))
+            handedness.append(self._handedness[player])
+
+        # Prediksi tetap berasal dari frame deteksi terakhir
+        if not players:
+            return HandResult.empty(frame_w, frame_h, self._t_capture)
+        lm = np.array(landmarks, dtype=np.float32)
+        # Jaga koordinat tetap di dalam layar
+        np.clip(lm[:, :, :2], 0.0, 1.0, out=lm[:, :, :2])
+        return HandResult(lm, np.array(players, dtype=np.int32),
+                          np.array(handedness, dtype=np.int8), frame_w, frame_h,
+                          self._t_capture)
+
+    def warmup(self):
+        self.tracker.warmup()
+
+    def close(self):
+        self.tracker.close()
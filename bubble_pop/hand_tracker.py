@@ -1,7 +1,13 @@
 import os
-import mediapipe as mp
-from mediapipe.tasks import python as mp_python
-from mediapipe.tasks.python import vision
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+from lanes import LaneAssigner, LaneMosaic, Lanes
+from roi import CropMosaic, RoiScheduler, dedupe
 
 # MediaPipe landmark indices
 WRIST = 0
@@ -11,90 +17,424 @@ MIDDLE_TIP = 12
 RING_TIP = 16
 PINKY_TIP = 20
 FINGERTIP_INDICES = [THUMB_TIP, INDEX_TIP, MIDDLE_TIP, RING_TIP, PINKY_TIP]
+NUM_LANDMARKS = 21
+
+# Pasangan landmark yang membentuk skeleton tangan (untuk digambar)
+HAND_CONNECTIONS = [
+    (0, 1), (1, 2), (2, 3), (3, 4),          # thumb
+    (0, 5), (5, 6), (6, 7), (7, 8),          # index
+    (5, 9), (9, 10), (10, 11), (11, 12),     # middle
+    (9, 13), (13, 14), (14, 15), (15, 16),   # ring
+    (13, 17), (0, 17), (17, 18), (18, 19), (19, 20),  # pinky + palm
+]
+
+# handedness: -1 = tidak diketahui
+LEFT, RIGHT = 0, 1
 
 MODEL_PATH = os.path.join(os.path.dirname(__file__), "hand_landmarker.task")
+# Ukuran frame dummy untuk warmup()
+WARMUP_SIZE = (320, 240)
+# Pass crop per lane cuma untuk player yang tangannya terlihat selama ini
+CROP_WINDOW_S = 1.0
+# Tangan hasil crop sedekat ini (normalized) dengan tangan full frame = duplikat
+CROP_DUPLICATE_DIST = 0.05
+# Sisi terpanjang mosaic pass ROI (pixel); box tangan kecil, tidak perlu 640
+ROI_MAX_SIDE = 384
+
+_mediapipe = None
+
+
+def load_mediapipe():
+    """
+    Import mediapipe on first use and return (mp, mp_python, vision).
+
+    The import alone takes seconds, so modules that only need HandResult
+    (game, session, benchmarks) stay cheap to import and main() can do it
+    on a background thread.
+    """
+    global _mediapipe
+    if _mediapipe is None:
+        import mediapipe as mp
+        from mediapipe.tasks import python as mp_python
+        from mediapipe.tasks.python import vision
+        _mediapipe = (mp, mp_python, vision)
+    return _mediapipe
+
+
+class HandResult:
+    """
+    All hands detected in one frame, as arrays.
+
+    landmarks:  (n_hands, 21, 3) float32, normalized x, y (0..1) and z
+    players:    (n_hands,) int32 player slot per hand
+    handedness: (n_hands,) int8, LEFT / RIGHT / -1
+    frame_w, frame_h: screen size the normalized coords map to
+    t_capture:  perf_counter() capture time of the source frame, if known
+    """
+
+    __slots__ = ("landmarks", "players", "handedness", "frame_w", "frame_h", "t_capture")
+
+    def __init__(self, landmarks, players, handedness, frame_w, frame_h, t_capture=None):
+        self.landmarks = landmarks
+        self.players = players
+        self.handedness = handedness
+        self.frame_w = frame_w
+        self.frame_h = frame_h
+        self.t_capture = t_capture
+
+    @classmethod
+    def empty(cls, frame_w=0, frame_h=0, t_capture=None):
+        return cls(
+            np.zeros((0, NUM_LANDMARKS, 3), dtype=np.float32),
+            np.zeros(0, dtype=np.int32),
+            np.zeros(0, dtype=np.int8),
+            frame_w, frame_h, t_capture,
+        )
+
+    def __len__(self):
+        return len(self.players)
+
+    def pixels(self, indices=None):
+        """Landmark (n_hands, k, 2) dalam pixel layar; indices None = semua 21."""
+        xy = self.landmarks[:, :, :2] if indices is None else self.landmarks[:, indices, :2]
+        return xy * np.array([self.frame_w, self.frame_h], dtype=np.float32)
+
+    @property
+    def index_tips(self):
+        """(n_hands, 2) pixel index finger tip."""
+        return self.pixels([INDEX_TIP])[:, 0]
+
+    @property
+    def fingertips(self):
+        """(n_hands, 5, 2) pixel kelima fingertip (urutan FINGERTIP_INDICES)."""
+        return self.pixels(FINGERTIP_INDICES)
+
+
+def downscale(frame_rgb, scale):
+    """Resize frame untuk inference dalam satu langkah (INTER_AREA)."""
+    if scale >= 1.0:
+        return frame_rgb
+    h, w = frame_rgb.shape[:2]
+    size = (max(1, int(round(w * scale))), max(1, int(round(h * scale))))
+    return cv2.resize(frame_rgb, size, interpolation=cv2.INTER_AREA)
 
 
 class HandTracker:
     """
-    Detect up to 2 hands using MediaPipe Tasks API (>=0.10).
-    Assign player by horizontal position:
-      Left half of frame  -> Player 1
-      Right half of frame -> Player 2
+    Detect hands using MediaPipe Tasks API (>=0.10) and assign them to
+    `players` equal-width lanes (player 1 = leftmost) with a LaneAssigner,
+    so each hand keeps its owner across frames.
+
+    With lane_crops=True, players whose hand was seen recently but is
+    missing from the full-frame pass get a second look: their lane crops
+    are packed into one LaneMosaic and run through a separate IMAGE-mode
+    landmarker in a single call, at higher resolution than the downscaled
+    full frame. That is at most two inference calls per frame, whatever
+    the number of players. In async mode the crop pass runs on the crop
+    worker thread, never inside the LIVE_STREAM callback: the full-frame
+    result is published first and replaced once the crop hands are in.
+
+    With roi_full_every=N > 0, a RoiScheduler lets most detections look
+    only at crops around each player's last hand (or lobby face) instead
+    of the whole frame, with a full-frame pass every N detections and
+    whenever a tracked hand is lost. Crop passes use the same IMAGE-mode
+    landmarker as the lane crops; in async mode they run on the same
+    worker thread so process() still never waits.
+
+    With async_mode=True the landmarker runs in LIVE_STREAM mode: process()
+    submits the frame with detect_async() and immediately returns the latest
+    completed result, so inference latency never lands in frame time.
+
+    inference_scale < 1 feeds the landmarker a downsampled copy of the frame
+    (one cv2.resize). Landmarks are normalized, so they still map back to
+    frame_w x frame_h screen pixels unchanged.
     """
 
-    def __init__(self, max_hands=2):
+    def __init__(self, max_hands=2, async_mode=False, inference_scale=1.0, players=2,
+                 lane_crops=False, roi_full_every=0):
+        self.async_mode = async_mode
+        self.inference_scale = inference_scale
+        self.lanes = Lanes(players)
+        self.assigner = LaneAssigner(self.lanes)
+        self.lane_crops = lane_crops
+        self._mosaic = LaneMosaic(self.lanes)
+        self.roi = RoiScheduler(self.lanes, roi_full_every) if roi_full_every else None
+        self._roi_mosaic = CropMosaic(ROI_MAX_SIDE)
+        self._lock = threading.Lock()
+        # Assigner dan crop detector bisa dipakai callback + worker crop sekaligus
+        self._assign_lock = threading.Lock()
+        self._crop_lock = threading.Lock()
+        self._latest = HandResult.empty()
+        self._last_ts_ms = -1
+        self._frame_size = (0, 0)
+        # timestamp_ms -> (t_capture, frame untuk crop) frame yang belum selesai
+        self._pending_capture = {}
+        self._result_event = threading.Event()
+        self.last_latency_ms = None
+        self.crop_passes = 0
+        self.crop_hands = 0       # tangan yang cuma ketemu lewat pass crop
+        self._crop_ms = deque(maxlen=300)
+
+        mp, mp_python, vision = load_mediapipe()
+        self._mp = mp
         base_options = mp_python.BaseOptions(model_asset_path=MODEL_PATH)
-        options = vision.HandLandmarkerOptions(
-            base_options=base_options,
-            num_hands=max_hands,
-        )
+        if async_mode:
+            options = vision.HandLandmarkerOptions(
+                base_options=base_options,
+                running_mode=vision.RunningMode.LIVE_STREAM,
+                num_hands=max_hands,
+                result_callback=self._on_result,
+            )
+        else:
+            options = vision.HandLandmarkerOptions(
+                base_options=base_options,
+                num_hands=max_hands,
+            )
         self.detector = vision.HandLandmarker.create_from_options(options)
+        self._crop_detector = None
+        if lane_crops or self.roi:
+            # Instance terpisah mode IMAGE: mosaic crop bukan bagian stream video
+            self._crop_detector = vision.HandLandmarker.create_from_options(
+                vision.HandLandmarkerOptions(base_options=base_options, num_hands=players))
+
+        # Satu slot per jenis job ("lanes" / "roi"), job baru mengganti yang belum jalan
+        self._crop_jobs = {}
+        self._crop_cond = threading.Condition()
+        self._crop_running = True
+        self._crop_thread = None
+        if async_mode and self._crop_detector is not None:
+            self._crop_thread = threading.Thread(target=self._crop_loop, name="hand-crop",
+                                                 daemon=True)
+            self._crop_thread.start()
 
-    def process(self, frame_rgb, frame_w, frame_h):
+    def process(self, frame_rgb, frame_w, frame_h, t_capture=None):
         """
-        Process an RGB numpy frame and return a list of player hand data.
+        Process an RGB numpy frame and return the hands found, assigned to players.
+
+        t_capture (capture time of the frame) is carried through to the
+        returned HandResult for latency measurement.
+
+        In async mode this never waits on inference; the returned result is
+        the last one the landmarker finished (possibly from an older frame).
 
         Returns:
-            List of dicts:
-            {
-                'player': 1 or 2,
-                'index_tip': (x_px, y_px),
-                'fingertips': [(x, y), ...],  # 5 fingertip pixel positions
-            }
+            HandResult: landmarks (n, 21, 3), players (n,) and handedness
+            (n,) arrays, one row per hand; pixel positions via
+            .index_tips / .fingertips / .pixels().
         """
-        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=frame_rgb)
+        if self.roi:
+            with self._lock:
+                latest = self._latest
+            plan = self.roi.plan(latest, t_capture, frame_w, frame_h)
+            if plan is not None:
+                if not self.async_mode:
+                    return self._process_roi(frame_rgb, plan, frame_w, frame_h, t_capture)
+                self._submit_crop("roi", (frame_rgb, plan, frame_w, frame_h, t_capture))
+                return latest
+
+        mp = self._mp
+        t0 = time.perf_counter()
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB,
+                            data=downscale(frame_rgb, self.inference_scale))
+
+        if self.async_mode:
+            self._frame_size = (frame_w, frame_h)
+            ts = self._next_timestamp_ms()
+            with self._lock:
+                self._pending_capture[ts] = (t_capture, frame_rgb if self.lane_crops else None)
+            self.detector.detect_async(mp_image, ts)
+            with self._lock:
+                return self._latest
+
         result = self.detector.detect(mp_image)
+        if self.roi:
+            self.roi.record_full((time.perf_counter() - t0) * 1000.0)
+        hands = self._to_result(result, frame_w, frame_h, t_capture, frame_rgb)
+        with self._lock:
+            self._latest = hands
+        return hands
 
-        hands_data = []
-        if not result.hand_landmarks:
-            return hands_data
+    def _process_roi(self, frame_rgb, plan, frame_w, frame_h, t_capture):
+        """Pass landmark di mosaic box ROI saja, hasilnya di-assign seperti pass full."""
+        t0 = time.perf_counter()
+        h, w = frame_rgb.shape[:2]
+        sx, sy = w / frame_w, h / frame_h
+        # Box dari plan dalam pixel layar, frame kamera bisa beda ukuran
+        boxes = [(int(x0 * sx), int(y0 * sy), max(int(x1 * sx), int(x0 * sx) + 1),
+                  max(int(y1 * sy), int(y0 * sy) + 1)) for _, (x0, y0, x1, y1), _ in plan]
+        mosaic, layout = self._roi_mosaic.build(frame_rgb, boxes)
+        with self._crop_lock:
+            result = self._crop_detector.detect(
+                self._mp.Image(image_format=self._mp.ImageFormat.SRGB, data=mosaic))
+        landmarks, handedness = _to_arrays(result)
+        landmarks, keep = self._roi_mosaic.to_frame(landmarks, layout)
+        landmarks, handedness = landmarks[keep], handedness[keep]
+        # Box player bertetangga bisa tumpang tindih → tangan sama ketemu dua kali
+        keep = dedupe(landmarks, CROP_DUPLICATE_DIST)
+        hands = self._assign(landmarks[keep], handedness[keep], frame_w, frame_h, t_capture)
+        self.roi.record_roi(plan, set(hands.players.tolist()),
+                            (time.perf_counter() - t0) * 1000.0, frame_w, frame_h)
+        self._publish(hands)
+        return hands
 
-        for landmarks in result.hand_landmarks:
-            index_lm = landmarks[INDEX_TIP]
-            index_x_norm = index_lm.x
-            index_y_norm = index_lm.y
+    def _submit_crop(self, kind, job):
+        with self._crop_cond:
+            self._crop_jobs[kind] = job
+            self._crop_cond.notify()
 
-            index_tip_px = (
-                int(index_x_norm * frame_w),
-                int(index_y_norm * frame_h),
-            )
+    def _crop_loop(self):
+        while True:
+            with self._crop_cond:
+                while not self._crop_jobs and self._crop_running:
+                    self._crop_cond.wait()
+                if not self._crop_running:
+                    break
+                kind = "lanes" if "lanes" in self._crop_jobs else "roi"
+                job = self._crop_jobs.pop(kind)
+            if kind == "lanes":
+                self._process_lanes(*job)
+            else:
+                self._process_roi(*job)
 
-            player = 1 if index_x_norm < 0.5 else 2
+    def _process_lanes(self, frame_rgb, landmarks, handedness, frame_w, frame_h, t_capture):
+        """Pass crop lane untuk hasil async yang sudah dipublish dari callback."""
+        refined, refined_hd = self._refine_lanes(frame_rgb, landmarks, handedness)
+        if len(refined) > len(landmarks):
+            self._publish(self._assign(refined, refined_hd, frame_w, frame_h, t_capture))
 
-            fingertips = []
-            for tip_idx in FINGERTIP_INDICES:
-                lm = landmarks[tip_idx]
-                fingertips.append((int(lm.x * frame_w), int(lm.y * frame_h)))
+    def _publish(self, hands):
+        # Pass full (callback) dan pass ROI (worker) bisa selesai tidak berurutan
+        with self._lock:
+            old = self._latest.t_capture
+            if hands.t_capture is None or old is None or hands.t_capture >= old:
+                self._latest = hands
 
-            hands_data.append(
-                {
-                    "player": player,
-                    "index_tip": index_tip_px,
-                    "fingertips": fingertips,
-                }
-            )
+    def detect_arrays(self, frame_rgb):
+        """
+        Sinkron, tanpa assignment player dan pass crop: (landmarks, handedness).
+        Untuk worker host.py yang melayani banyak station, tiap station
+        meng-assign player sendiri.
+        """
+        mp = self._mp
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB,
+                            data=downscale(frame_rgb, self.inference_scale))
+        return _to_arrays(self.detector.detect(mp_image))
+
+    def warmup(self, timeout=5.0):
+        """
+        Run one dummy inference so graph initialization is paid now, not on
+        the first real frame. In async mode waits for the callback.
+        """
+        mp = self._mp
+        blank = np.zeros((WARMUP_SIZE[1], WARMUP_SIZE[0], 3), dtype=np.uint8)
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=blank)
+        if self.async_mode:
+            self._result_event.clear()
+            self.detector.detect_async(mp_image, self._next_timestamp_ms())
+            self._result_event.wait(timeout)
+        else:
+            self.detector.detect(mp_image)
+        if self._crop_detector is not None:
+            self._crop_detector.detect(mp_image)
+
+    def _next_timestamp_ms(self):
+        # LIVE_STREAM butuh timestamp monotonic yang selalu naik
+        ts = int(time.monotonic() * 1000)
+        if ts <= self._last_ts_ms:
+            ts = self._last_ts_ms + 1
+        self._last_ts_ms = ts
+        return ts
 
-        hands_data = self._resolve_conflicts(hands_data)
-        return hands_data
+    def _on_result(self, result, output_image, timestamp_ms):
+        frame_w, frame_h = self._frame_size
+        with self._lock:
+            t_capture, frame_rgb = self._pending_capture.pop(timestamp_ms, (None, None))
+            # Frame yang di-drop MediaPipe tidak pernah dapat callback
+            for ts in [ts for ts in self._pending_capture if ts < timestamp_ms]:
+                del self._pending_capture[ts]
+        # Callback cuma simpan hasil; pass crop lane yang blocking jalan di worker
+        # supaya graph LIVE_STREAM tidak tertahan
+        landmarks, handedness = _to_arrays(result)
+        self._publish(self._assign(landmarks, handedness, frame_w, frame_h, t_capture))
+        if frame_rgb is not None:
+            self._submit_crop("lanes", (frame_rgb, landmarks, handedness,
+                                        frame_w, frame_h, t_capture))
+        latency_ms = int(time.monotonic() * 1000) - timestamp_ms
+        with self._lock:
+            self.last_latency_ms = latency_ms
+        if self.roi:
+            self.roi.record_full(latency_ms)
+        self._result_event.set()
 
-    def _resolve_conflicts(self, hands_data):
-        """Ensure no two hands share the same player slot."""
-        if len(hands_data) < 2:
-            return hands_data
+    def _to_result(self, result, frame_w, frame_h, t_capture=None, frame_rgb=None):
+        landmarks, handedness = _to_arrays(result)
+        if self.lane_crops and frame_rgb is not None:
+            landmarks, handedness = self._refine_lanes(frame_rgb, landmarks, handedness)
+        return self._assign(landmarks, handedness, frame_w, frame_h, t_capture)
 
-        p1_hands = [h for h in hands_data if h["player"] == 1]
-        p2_hands = [h for h in hands_data if h["player"] == 2]
+    def _assign(self, landmarks, handedness, frame_w, frame_h, t_capture):
+        if not len(landmarks):
+            return HandResult.empty(frame_w, frame_h, t_capture)
 
-        if len(p1_hands) == 2:
-            p1_hands.sort(key=lambda h: h["index_tip"][0])
-            p1_hands[1]["player"] = 2
+        with self._assign_lock:
+            players = self.assigner.assign(landmarks[:, INDEX_TIP, :2])
+        keep = players > 0
+        return HandResult(landmarks[keep], players[keep], handedness[keep],
+                          frame_w, frame_h, t_capture)
 
-        if len(p2_hands) == 2:
-            p2_hands.sort(key=lambda h: h["index_tip"][0])
-            p2_hands[0]["player"] = 1
+    def _refine_lanes(self, frame_rgb, landmarks, handedness):
+        """Pass kedua di crop lane yang tangannya hilang dari pass full frame."""
+        found = set(self.lanes.lane_of(landmarks[:, INDEX_TIP, 0]).tolist())
+        with self._assign_lock:
+            recent = self.assigner.recent(CROP_WINDOW_S)
+        missing = [p for p in recent if p not in found]
+        if not missing:
+            return landmarks, handedness
 
-        return hands_data
+        t0 = time.perf_counter()
+        mosaic, layout = self._mosaic.build(frame_rgb, missing)
+        with self._crop_lock:
+            result = self._crop_detector.detect(
+                self._mp.Image(image_format=self._mp.ImageFormat.SRGB, data=mosaic))
+        crop_lm, crop_hd = _to_arrays(result)
+        crop_lm, keep = self._mosaic.to_frame(crop_lm, layout)
+        if len(landmarks) and keep.any():
+            tips = crop_lm[:, INDEX_TIP, :2]
+            dist = np.linalg.norm(tips[:, None] - landmarks[None, :, INDEX_TIP, :2], axis=2)
+            keep &= dist.min(axis=1) > CROP_DUPLICATE_DIST
+        self.crop_passes += 1
+        self.crop_hands += int(keep.sum())
+        self._crop_ms.append((time.perf_counter() - t0) * 1000.0)
+        return (np.concatenate([landmarks, crop_lm[keep]]),
+                np.concatenate([handedness, crop_hd[keep]]))
+
+    def crop_stats(self):
+        ms = self._crop_ms
+        return {"crop_passes": self.crop_passes, "crop_hands": self.crop_hands,
+                "crop_ms_p50": round(float(np.percentile(ms, 50)), 1) if ms else None}
 
     def close(self):
+        if self._crop_thread is not None:
+            with self._crop_cond:
+                self._crop_running = False
+                self._crop_cond.notify()
+            self._crop_thread.join(2.0)
         self.detector.close()
+        if self._crop_detector is not None:
+            self._crop_detector.close()
+
+
+def _to_arrays(result):
+    """(landmarks (n, 21, 3) float32, handedness (n,) int8) dari hasil landmarker."""
+    if not result.hand_landmarks:
+        return (np.zeros((0, NUM_LANDMARKS, 3), dtype=np.float32), np.zeros(0, dtype=np.int8))
+    landmarks = np.array(
+        [[(lm.x, lm.y, lm.z) for lm in hand] for hand in result.hand_landmarks],
+        dtype=np.float32,
+    )
+    handedness = np.array(
+        [(LEFT if h[0].category_name == "Left" else RIGHT) if h else -1
+         for h in result.handedness],
+        dtype=np.int8,
+    )
+    return landmarks, handedness
@@ -0,0 +1,340 @@
+"""
+Multi-station host: beberapa kamera + layar dari satu mesin.
+
+  python host.py --sources 0,2 --workers 2
+  python host.py --sources a.mp4,b.mp4 --workers 1 --headless
+
+Tiap station adalah satu proses yang menjalankan main() seperti biasa
+(window, kamera, game loop), tapi tanpa model MediaPipe sendiri. Frame
+kamera yang sudah di-downscale ke ukuran inference ditulis ke ring buffer
+shared_memory milik station; yang lewat antrean cuma (station, slot, seq).
+Sejumlah kecil proses inference worker memuat model sekali, mengambil
+request dari satu antrean bersama dan membalas ke antrean station pengirim.
+
+Penjadwalan: tiap station maksimal satu request hand dan satu request face
+yang sedang jalan. Station yang cepat tidak bisa membanjiri antrean, jadi
+worker otomatis bergiliran antar station, dan frame yang datang saat
+request masih jalan langsung dilewati (dihitung sebagai skipped).
+"""
+import argparse
+import multiprocessing as mp
+import os
+import queue
+import time
+from collections import deque
+
+import numpy as np
+
+from frame_ring import SharedFrameRing
+from hand_tracker import INDEX_TIP, HandResult, downscale
+from lanes import LaneAssigner, Lanes
+
+# Interval station kirim statistik ke host, dan host print tabelnya (detik)
+HOST_STATS_SECS = 5
+RING_SLOTS = 4
+# Request yang tidak dibalas selama ini dianggap hilang (worker mati / stale)
+REQUEST_TIMEOUT_S = 1.0
+
+
+# ── Inference worker ─────────────────────────────────────────────────────────
+def inference_worker(worker_id, request_q, response_qs, face_scale, players):
+    """Proses worker: muat model sekali, layani request dari semua station."""
+    from face_tracker import FaceTracker
+    from hand_tracker import HandTracker
+
+    # Mode IMAGE (sinkron): tidak ada state tracking per stream, jadi satu
+    # model aman dipakai bergantian oleh banyak station
+    face = FaceTracker(inference_scale=face_scale, players=players)
+    hand = HandTracker(max_hands=players, players=players)
+    face.warmup()
+    hand.warmup()
+
+    rings = {}
+    try:
+        while True:
+            req = request_q.get()
+            if req is None:
+                break
+            station, kind, ring_name, shape, slot, seq, t_submit = req
+            ring = rings.get(ring_name)
+            if ring is None:
+                ring = rings[ring_name] = SharedFrameRing.attach(ring_name, shape, RING_SLOTS)
+            frame = ring.read(slot, seq)
+            if frame is None:
+                response_qs[station].put((kind, seq, t_submit, None, worker_id, 0.0))
+                continue
+
+            t0 = time.perf_counter()
+            h, w = frame.shape[:2]
+            if kind == "hand":
+                # Assignment player punya state per stream → dikerjakan station
+                payload = hand.detect_arrays(frame)
+            else:
+                payload = face.detect_players(frame, w, h)
+            infer_ms = (time.perf_counter() - t0) * 1000.0
+            response_qs[station].put((kind, seq, t_submit, payload, worker_id, infer_ms))
+    finally:
+        for ring in rings.values():
+            ring.close()
+        face.close()
+        hand.close()
+
+
+# ── Station side ─────────────────────────────────────────────────────────────
+class StationClient:
+    """
+    A station's link to the shared inference workers.
+
+    submit() downscales a frame into the station's SharedFrameRing and
+    queues a request unless one of that kind is still in flight; poll()
+    drains replies and keeps the newest result per kind, plus round-trip
+    latency for reporting.
+    """
+
+    KINDS = ("hand", "face")
+
+    def __init__(self, station_id, request_q, response_q, ring_scale):
+        self.station_id = station_id
+        self.request_q = request_q
+        self.response_q = response_q
+        self.ring_scale = ring_scale
+        self._ring = None
+        self._in_flight = {}                  # kind -> (seq, t_submit)
+        self._t_capture = {}                  # (kind, seq) -> t_capture
+        self.latest = {}                      # kind -> (payload, t_capture)
+        self.results = {k: 0 for k in self.KINDS}   # naik tiap hasil baru
+        self.last_latency_ms = {}
+        self._latency = {k: deque(maxlen=300) for k in self.KINDS}
+        self._infer = {k: deque(maxlen=300) for k in self.KINDS}
+        self.submitted = {k: 0 for k in self.KINDS}
+        self.skipped = {k: 0 for k in self.KINDS}
+        self.stale = {k: 0 for k in self.KINDS}
+        self.timeouts = {k: 0 for k in self.KINDS}
+        self.workers = {}
+
+    def submit(self, kind, frame_rgb, t_capture=None):
+        now = time.perf_counter()
+        pending = self._in_flight.get(kind)
+        if pending is not None:
+            if now - pending[1] < REQUEST_TIMEOUT_S:
+                self.skipped[kind] += 1
+                return False
+            self.timeouts[kind] += 1
+            self._t_capture.pop((kind, pending[0]), None)
+
+        small = downscale(frame_rgb, self.ring_scale)
+        if self._ring is None:
+            self._ring = SharedFrameRing(small.shape, RING_SLOTS)
+        slot, seq = self._ring.write(small)
+        self._in_flight[kind] = (seq, now)
+        self._t_capture[(kind, seq)] = t_capture
+        self.request_q.put((self.station_id, kind, self._ring.name, small.shape, slot, seq, now))
+        self.submitted[kind] += 1
+        return True
+
+    def poll(self):
+        while True:
+            try:
+                kind, seq, t_submit, payload, worker_id, infer_ms = self.response_q.get_nowait()
+            except queue.Empty:
+                return
+            if self._in_flight.get(kind, (None,))[0] == seq:
+                del self._in_flight[kind]
+            t_capture = self._t_capture.pop((kind, seq), None)
+            if payload is None:
+                self.stale[kind] += 1
+                continue
+            latency = (time.perf_counter() - t_submit) * 1000.0
+            self.last_latency_ms[kind] = latency
+            self._latency[kind].append(latency)
+            self._infer[kind].append(infer_ms)
+            self.workers[worker_id] = self.workers.get(worker_id, 0) + 1
+            self.latest[kind] = (payload, t_capture)
+            self.results[kind] += 1
+
+    def stats(self):
+        out = {}
+        for kind in self.KINDS:
+            lat, inf = self._latency[kind], self._infer[kind]
+            out[kind] = {
+                "submitted": self.submitted[kind],
+                "skipped": self.skipped[kind],
+                "stale": self.stale[kind],
+                "timeouts": self.timeouts[kind],
+                "latency_ms_p50": round(float(np.percentile(lat, 50)), 1) if lat else None,
+                "latency_ms_p95": round(float(np.percentile(lat, 95)), 1) if lat else None,
+                "infer_ms_p50": round(float(np.percentile(inf, 50)), 1) if inf else None,
+            }
+        out["workers"] = dict(self.workers)
+        return out
+
+    def close(self):
+        if self._ring is not None:
+            self._ring.close()
+            self._ring = None
+
+
+class RemoteHandTracker:
+    """HandTracker stand-in (async semantics) served by the shared workers."""
+
+    async_mode = True
+
+    def __init__(self, client, players=2):
+        self.client = client
+        self.assigner = LaneAssigner(Lanes(players))
+        self.last_latency_ms = None
+        self._seen = 0
+        self._latest = HandResult.empty()
+
+    def process(self, frame_rgb, frame_w, frame_h, t_capture=None):
+        client = self.client
+        client.poll()
+        client.submit("hand", frame_rgb, t_capture)
+        if client.results["hand"] != self._seen:
+            # Objek baru hanya saat ada hasil baru (PredictiveHandTracker cek identitas)
+            self._seen = client.results["hand"]
+            (landmarks, handedness), t_cap = client.latest["hand"]
+            players = self.assigner.assign(landmarks[:, INDEX_TIP, :2])
+            keep = players > 0
+            self._latest = HandResult(landmarks[keep], players[keep], handedness[keep],
+                                      frame_w, frame_h, t_cap)
+            self.last_latency_ms = client.last_latency_ms.get("hand")
+        return self._latest
+
+    def warmup(self):
+        pass   # model ada di worker, sudah di-warmup di sana
+
+    def close(self):
+        pass
+
+
+class RemoteFaceTracker:
+    """FaceTracker stand-in served by the shared workers."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def detect_players(self, frame_rgb, frame_w, frame_h):
+        self.client.poll()
+        self.client.submit("face", frame_rgb)
+        latest = self.client.latest.get("face")
+        return latest[0] if latest else set()
+
+    def close(self):
+        pass
+
+
+def run_station(station_id, source, extra_argv, request_q, response_q, stats_q, ring_scale,
+                players):
+    """Proses station: main() biasa dengan tracker remote."""
+    import main as game_main
+    from hand_filter import PredictiveHandTracker
+
+    client = StationClient(station_id, request_q, response_q, ring_scale)
+    builders = {
+        "face": lambda: RemoteFaceTracker(client),
+        "hand": lambda: PredictiveHandTracker(
+            RemoteHandTracker(client, players),
+            detect_every=game_main.HAND_DETECT_EVERY,
+            adaptive=game_main.HAND_DETECT_ADAPTIVE,
+            frame_budget_ms=1000.0 / game_main.TARGET_FPS,
+        ),
+    }
+
+    def on_stats(stats):
+        stats_q.put({"station": station_id, "source": source, **stats, "inference": client.stats()})
+
+    try:
+        game_main.main(["--source", str(source), "--players", str(players), *extra_argv],
+                       tracker_builders=builders,
+                       on_stats=on_stats, stats_secs=HOST_STATS_SECS)
+    finally:
+        client.close()
+        stats_q.put({"station": station_id, "exited": True})
+
+
+# ── Host ─────────────────────────────────────────────────────────────────────
+def format_table(latest):
+    lines = [f"{'st':>3} {'state':<10}{'fps':>6}{'cam fps':>8}{'hand p50/p95':>14}"
+             f"{'face p50':>9}{'skip':>6}{'stale':>6}  workers"]
+    for sid in sorted(latest):
+        s = latest[sid]
+        if s.get("exited"):
+            lines.append(f"{sid:>3} (keluar)")
+            continue
+        hand, face = s["inference"]["hand"], s["inference"]["face"]
+        skipped = hand["skipped"] + face["skipped"]
+        stale = hand["stale"] + face["stale"]
+        lines.append(
+            f"{sid:>3} {s['state']:<10}{s['fps']:>6.1f}{s['capture'].get('capture_fps', 0):>8}"
+            f"{str(hand['latency_ms_p50']) + '/' + str(hand['latency_ms_p95']):>14}"
+            f"{str(face['latency_ms_p50']):>9}{skipped:>6}{stale:>6}  {s['inference']['workers']}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    import main as game_main
+
+    parser = argparse.ArgumentParser(description="Bubble Pop! multi-station host")
+    parser.add_argument("--sources", required=True,
+                        help="source per station dipisah koma (index kamera / file / folder)")
+    parser.add_argument("--workers", type=int, default=max(1, min(4, (os.cpu_count() or 2) // 2)),
+                        help="jumlah proses inference bersama")
+    parser.add_argument("--players", type=int, default=game_main.NUM_PLAYERS,
+                        help="jumlah player per station")
+    parser.add_argument("--headless", action="store_true")
+    args = parser.parse_args()
+
+    sources = args.sources.split(",")
+    extra = ["--headless"] if args.headless else []
+    # Ring berisi frame ukuran inference; face boleh lebih kecil lagi di worker
+    ring_scale = max(game_main.HAND_INFERENCE_SCALE, game_main.FACE_INFERENCE_SCALE)
+    face_scale = game_main.FACE_INFERENCE_SCALE / ring_scale
+
+    # spawn: mediapipe / SDL tidak aman di-fork
+    ctx = mp.get_context("spawn")
+    request_q = ctx.Queue()
+    response_qs = [ctx.Queue() for _ in sources]
+    stats_q = ctx.Queue()
+
+    workers = [ctx.Process(target=inference_worker, name=f"inference-{i}",
+                           args=(i, request_q, response_qs, face_scale, args.players),
+                           daemon=True)
+               for i in range(args.workers)]
+    stations = [ctx.Process(target=run_station, name=f"station-{i}",
+                            args=(i, src, extra, request_q, response_qs[i], stats_q, ring_scale,
+                                  args.players))
+                for i, src in enumerate(sources)]
+    for p in workers + stations:
+        p.start()
+    print(f"[INFO] Host: {len(stations)} station, {len(workers)} inference worker")
+
+    latest = {}
+    last_print = time.perf_counter()
+    try:
+        while any(p.is_alive() for p in stations):
+            try:
+                s = stats_q.get(timeout=0.5)
+                latest[s["station"]] = s
+            except queue.Empty:
+                pass
+            if latest and time.perf_counter() - last_print >= HOST_STATS_SECS:
+                last_print = time.perf_counter()
+                print(f"[INFO] Stations:\n{format_table(latest)}")
+    except KeyboardInterrupt:
+        for p in stations:
+            p.terminate()
+    finally:
+        for p in stations:
+            p.join(timeout=5.0)
+        for _ in workers:
+            request_q.put(None)
+        for p in workers:
+            p.join(timeout=5.0)
+    if latest:
+        print(f"[INFO] Stations:\n{format_table(latest)}")
+
+
+if __name__ == "__main__":
+    main()
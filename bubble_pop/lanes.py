@@ -0,0 +1,154 @@
+import math
+import time
+
+import numpy as np
+
+from roi import CropMosaic
+
+MAX_PLAYERS = 6
+
+
+class Lanes:
+    """
+    Equal-width vertical lanes across the (mirrored) camera frame.
+
+    Player p (1-based) owns lane p counting from the left. Positions are
+    normalized x in 0..1, the same space as MediaPipe landmarks.
+    """
+
+    def __init__(self, players=2):
+        if not 1 <= players <= MAX_PLAYERS:
+            raise ValueError(f"Jumlah player harus 1..{MAX_PLAYERS}, bukan {players}")
+        self.players = players
+        self.width = 1.0 / players
+
+    @property
+    def ids(self):
+        return range(1, self.players + 1)
+
+    def lane_of(self, x):
+        """Player pemilik posisi x (scalar atau array)."""
+        lane = np.floor(np.asarray(x, dtype=np.float64) * self.players).astype(np.int32) + 1
+        return np.clip(lane, 1, self.players)
+
+    def center(self, player):
+        return (player - 0.5) * self.width
+
+    def span(self, player, margin=0.0):
+        """(x0, x1) lane player, diperlebar margin x lebar lane di tiap sisi."""
+        x0 = (player - 1 - margin) * self.width
+        x1 = (player + margin) * self.width
+        return max(x0, 0.0), min(x1, 1.0)
+
+    def pixel_span(self, player, frame_w, margin=0.0):
+        x0, x1 = self.span(player, margin)
+        return int(x0 * frame_w), int(math.ceil(x1 * frame_w))
+
+
+class LaneAssigner:
+    """
+    Stable hand -> player matching over N lanes, one hand per player.
+
+    A hand normally belongs to the lane its point (index tip) is in, but a
+    player keeps the hand it already tracks while that hand stays within
+    `margin` lane-widths of the lane, so reaching over a line does not flip
+    owners frame to frame. A spare hand may go to a free neighbouring
+    player at a penalty, which with two players is the old "second hand in
+    one half goes to the other player" rule.
+
+    The assignment is the minimum total cost over all hands (distance to
+    each player's last position, or to the lane centre plus a penalty for
+    players without one), solved exactly with a DP over used-player
+    bitmasks; with at most 6 players that is at most 64 states per hand.
+    Hands that cannot be placed get player 0.
+    """
+
+    # Player tanpa posisi terakhir kalah dari player yang sedang di-track
+    NEW_PENALTY = 1.0
+    NEIGHBOUR_PENALTY = 2.0
+    # Lebih mahal dari assignment apa pun yang mungkin, jadi cuma kalau terpaksa
+    DROP_COST = 10.0
+
+    def __init__(self, lanes, margin=0.25, lost_after_s=0.5):
+        self.lanes = lanes
+        self.margin = margin
+        self.lost_after_s = lost_after_s
+        self._last = {}   # player -> (x, y, t)
+
+    def assign(self, points, t=None):
+        """points: (m, 2) normalized. Return (m,) int32 player per hand (0 = tidak ada)."""
+        if t is None:
+            t = time.perf_counter()
+        m = len(points)
+        if m == 0:
+            return np.zeros(0, dtype=np.int32)
+
+        players = np.array(self._best(self._costs(points, t)), dtype=np.int32)
+        for i, p in enumerate(players.tolist()):
+            if p:
+                self._last[p] = (float(points[i, 0]), float(points[i, 1]), t)
+        return players
+
+    def _costs(self, points, t):
+        x, y = points[:, 0], points[:, 1]
+        # Landmark bisa sedikit di luar frame; span di-clip ke [0, 1] jadi
+        # tanpa clamp tangan di tepi tidak masuk lane mana pun (seperti lane_of)
+        xs = np.clip(x, 0.0, np.nextafter(1.0, 0.0))
+        cost = np.full((len(points), self.lanes.players), np.inf)
+        for j, p in enumerate(self.lanes.ids):
+            center = self.lanes.center(p)
+            x0, x1 = self.lanes.span(p, 1.0)
+            cost[:, j] = np.where((xs >= x0) & (xs < x1),
+                                  np.abs(x - center) + self.NEIGHBOUR_PENALTY, np.inf)
+            x0, x1 = self.lanes.span(p, self.margin)
+            own = (xs >= x0) & (xs < x1)
+            last = self._last.get(p)
+            if last is not None and t - last[2] <= self.lost_after_s:
+                d = np.hypot(x - last[0], y - last[1])
+            else:
+                d = np.abs(x - center) + self.NEW_PENALTY
+            cost[:, j] = np.where(own, d, cost[:, j])
+        return cost
+
+    def _best(self, cost):
+        # best[mask] = (total, player per tangan sejauh ini), mask = player terpakai
+        best = {0: (0.0, ())}
+        for row in cost.tolist():
+            nxt = {}
+            for mask, (total, chosen) in best.items():
+                options = [(total + self.DROP_COST, mask, chosen + (0,))]
+                options += [(total + c, mask | 1 << j, chosen + (j + 1,))
+                            for j, c in enumerate(row) if not mask >> j & 1 and c != math.inf]
+                for total_o, mask_o, chosen_o in options:
+                    if mask_o not in nxt or total_o < nxt[mask_o][0]:
+                        nxt[mask_o] = (total_o, chosen_o)
+            best = nxt
+        return min(best.values())[1]
+
+    def recent(self, within_s, t=None):
+        """Player yang tangannya terlihat dalam within_s detik terakhir."""
+        if t is None:
+            t = time.perf_counter()
+        return [p for p, (_, _, seen) in sorted(self._last.items()) if t - seen <= within_s]
+
+
+class LaneMosaic(CropMosaic):
+    """
+    CropMosaic of full-height lane crops.
+
+    Used for the second, per-lane landmark pass: the crops of every lane
+    that needs one share a single inference call instead of one call per
+    lane.
+    """
+
+    def __init__(self, lanes, margin=0.15, max_side=640):
+        super().__init__(max_side)
+        self.lanes = lanes
+        self.margin = margin
+
+    def build(self, frame_rgb, players):
+        """Return (mosaic, layout); layout dipakai to_frame()."""
+        h, w = frame_rgb.shape[:2]
+        boxes = [(x0, 0, x1, h) for x0, x1 in
+                 (self.lanes.pixel_span(p, w, self.margin) for p in players)]
+        return super().build(frame_rgb, boxes)
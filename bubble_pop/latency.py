@@ -0,0 +1,47 @@
+import numpy as np
+
+# buffer     : umur frame di buffer driver/OpenCV saat cap.read() selesai
+# queue      : umur frame saat diambil game loop dari ring buffer capture
+# background : frame ditangkap -> frame itu tampil sebagai background (flip)
+# hand       : frame ditangkap -> landmark dari frame itu tampil (flip)
+# pop        : frame ditangkap -> bubble yang dipop dari frame itu tampil (flip)
+SERIES = ("buffer", "queue", "background", "hand", "pop")
+
+
+class LatencyMeter:
+    """Ring buffer per seri latency (ms) dengan ringkasan persentil."""
+
+    def __init__(self, capacity=2000, series=SERIES):
+        self.series = series
+        self._buf = {name: np.zeros(capacity, dtype=np.float32) for name in series}
+        self._count = {name: 0 for name in series}
+
+    def add(self, name, ms):
+        if ms is None:
+            return
+        buf = self._buf[name]
+        buf[self._count[name] % len(buf)] = ms
+        self._count[name] += 1
+
+    def report(self):
+        out = {}
+        for name in self.series:
+            n = min(self._count[name], len(self._buf[name]))
+            if n == 0:
+                continue
+            data = self._buf[name][:n]
+            p50, p95, p99 = np.percentile(data, (50, 95, 99))
+            out[name] = {
+                "n": self._count[name],
+                "p50": round(float(p50), 1),
+                "p95": round(float(p95), 1),
+                "p99": round(float(p99), 1),
+                "max": round(float(data.max()), 1),
+            }
+        return out
+
+    def format(self):
+        lines = [f"{'latency ms':<11}{'p50':>7}{'p95':>7}{'p99':>7}{'max':>7}{'n':>7}"]
+        for name, r in self.report().items():
+            lines.append(f"{name:<11}{r['p50']:>7}{r['p95']:>7}{r['p99']:>7}{r['max']:>7}{r['n']:>7}")
+        return "\n".join(lines)
@@ -1,33 +1,118 @@
 """
-Bubble Pop! - 2 Player Hand Tracking Game
-==========================================
+Bubble Pop! - Multi Player Hand Tracking Game
+=============================================
 Cara main:
-  - Berdiri di depan kamera, masing-masing di kiri / kanan layar
+  - Berdiri di depan kamera, satu orang per jalur (P1 paling kiri)
   - Wajah terdeteksi → status READY
-  - Kedua player READY → countdown 3-2-1 GO → game mulai
+  - Semua player READY → countdown 3-2-1 GO → game mulai
   - Pecahin bubble pakai tangan! Siapa paling banyak menang.
   - Tekan Q / ESC untuk keluar
 
+Rekam / replay sesi (lihat session.py):
+  python main.py --record sesi1 --seed 7     rekam frame kamera + hasil tracker
+  python main.py --replay sesi1 --headless   jalankan ulang tanpa kamera / window
+
+Layar lebar 3-6 player:
+  python main.py --players 4
+
 Requirements:
   pip install -r requirements.txt
 """
 
+import argparse
+import json
+import os
+import random
 import sys
-import cv2
+import time
+
+_T_START = time.perf_counter()   # awal proses, acuan laporan startup
+
 import pygame
-import numpy as np
 from enum import Enum, auto
 
-from hand_tracker import HandTracker
+from hand_tracker import HandTracker, HandResult, load_mediapipe
+from hand_filter import PredictiveHandTracker
 from face_tracker import FaceTracker
-from game import Game
+from game import Game, PLAYER_COLORS
+from lanes import MAX_PLAYERS
+from capture import CameraCapture
+from sources import open_source
+from startup import StartupProfiler, ModelLoader
+from quality import QualityGovernor, QUALITY_LEVELS
+from video_recorder import GameplayRecorder
+from spectator import SpectatorServer
+from roi import FaceGate
+from background import CameraBackground
+import ui_cache
+from perf import StageTimer, PerfHUD, PerfExporter
+from latency import LatencyMeter
+from session import (SessionRecorder, SessionReader, ReplaySource,
+                     ReplayHandTracker, ReplayFaceTracker)
 
 # ── Config ───────────────────────────────────────────────────────────────────
 WINDOW_TITLE  = "Bubble Pop!"
-CAM_INDEX     = 0
-TARGET_FPS    = 30
+# Index kamera, atau path video / folder / glob gambar untuk testing
+CAM_SOURCE    = 0
+TARGET_FPS    = 30   # rate render; simulasi game jalan di Game.SIM_HZ sendiri
 FLIP_CAMERA   = True
 CAM_W, CAM_H  = 1280, 720
+# Format yang diminta ke kamera. MJPG = FPS penuh di HD pada kebanyakan
+# webcam USB; None = biarkan default driver (sering YUYV lambat)
+CAM_FOURCC    = "MJPG"
+CAM_FPS       = 30
+# Ukuran ring buffer thread capture (frame lama otomatis dibuang)
+CAPTURE_BUFFER = 2
+# True = MediaPipe LIVE_STREAM (detect_async), game loop tidak pernah nunggu
+# inference. False = detect() sinkron seperti dulu, buat perbandingan.
+ASYNC_INFERENCE = True
+# Skala resolusi frame yang dikirim ke model (1.0 = full CAM_W x CAM_H).
+# Model downscale sendiri di dalam, jadi pixel ekstra cuma buang waktu.
+HAND_INFERENCE_SCALE = 0.5
+FACE_INFERENCE_SCALE = 0.5
+# Hand landmarker cuma jalan tiap N frame, di antaranya posisi fingertip
+# diprediksi (alpha-beta filter). ADAPTIVE = N naik/turun sesuai beban.
+HAND_DETECT_EVERY    = 2
+HAND_DETECT_ADAPTIVE = True
+# Interval print statistik capture ke console (detik), 0 = mati
+CAPTURE_STATS_SECS = 10
+# Overlay timing per stage (p50/p95/p99), toggle pakai F3
+PERF_HUD = False
+# Export timing periodik: *.prom = Prometheus textfile, lainnya JSON lines.
+# None = mati
+PERF_EXPORT_PATH = None
+PERF_EXPORT_SECS = 30
+# Ukur motion-to-photon: frame ditangkap -> hasilnya tampil (display.flip),
+# plus umur frame di buffer OpenCV. Laporan di console tiap CAPTURE_STATS_SECS.
+LATENCY_MODE = False
+# Turunkan kualitas (resolusi inference, cadence tracking, partikel, efek
+# overlay, refresh background) saat frame lewat budget, naikkan lagi saat
+# longgar. Level + alasannya tampil di HUD F3 dan export perf.
+QUALITY_GOVERNOR = True
+# Simpan video tiap ronde (countdown s/d GAME OVER + ekor) ke folder ini,
+# None = mati. Encode di thread terpisah; kalau tertinggal frame di-drop.
+VIDEO_RECORD_DIR  = None
+VIDEO_DROP_POLICY = "newest"   # "newest" / "oldest", lihat video_recorder.py
+VIDEO_TAIL_SECS   = 3.0
+# Port WebSocket untuk penonton (snapshot biner + delta, lihat spectator.py),
+# None = mati
+SPECTATOR_PORT = None
+# Alamat bind server penonton. Default cuma lokal; "0.0.0.0" = buka ke
+# jaringan (penonton di mesin lain), harus diminta eksplisit
+SPECTATOR_HOST = "127.0.0.1"
+
+# Jumlah player = jumlah jalur (lane) sama lebar dari kiri ke kanan, 2..6
+NUM_PLAYERS = 2
+# Player yang tangannya hilang dari pass full frame dicari lagi di crop
+# jalurnya (semua crop digabung jadi satu pass inference tambahan)
+LANE_CROPS = True
+# Deteksi tangan kebanyakan cuma di crop sekitar posisi tangan / wajah
+# terakhir tiap player; full frame tiap N deteksi dan saat tangan hilang.
+# 0 = selalu full frame
+HAND_ROI_FULL_EVERY = 8
+# Lobby: kalau status READY semua player sudah stabil, deteksi wajah cuma
+# tiap N frame kamera (di antaranya pakai hasil terakhir). 1 = tiap frame
+FACE_STABLE_EVERY = 6
 
 # Berapa frame wajah harus terdeteksi terus sebelum dianggap READY
 READY_HOLD_FRAMES  = 40
@@ -36,8 +121,6 @@ UNREADY_HOLD_FRAMES = 25
 
 COUNTDOWN_SECS = 3   # 3-2-1 lalu GO
 GO_HOLD_SECS   = 0.8 # durasi tampil "GO!" sebelum game mulai
-
-PLAYER_COLORS = {1: (100, 200, 255), 2: (255, 150, 100)}
 # ─────────────────────────────────────────────────────────────────────────────
 
 
@@ -48,40 +131,84 @@ class GameState(Enum):
     GAME_OVER = auto()
 
 
-def frame_to_surface(frame_bgr: np.ndarray) -> pygame.Surface:
-    frame_rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
-    return pygame.surfarray.make_surface(np.transpose(frame_rgb, (1, 0, 2)))
+def draw_overlay(surface, alpha=100):
+    tint = ui_cache.layer(("overlay", alpha), surface.get_size(),
+                          lambda ov: ov.fill((0, 0, 0, alpha)))
+    surface.blit(tint, (0, 0))
 
 
-def draw_overlay(surface, alpha=100):
-    ov = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
-    ov.fill((0, 0, 0, alpha))
-    surface.blit(ov, (0, 0))
+def lane_centers(w, players):
+    """x tengah jalur tiap player (pixel), P1 paling kiri."""
+    return {p: int((p - 0.5) * w / players) for p in range(1, players + 1)}
+
+
+def card_width(w, players, preferred):
+    # Kartu menyempit di layar dengan banyak jalur, sisakan jarak antar kartu
+    return min(preferred, w // players - 20)
 
 
-def draw_lobby(screen, w, h, player_ready, face_hold, font_title, font_sub, font_hint):
-    draw_overlay(screen, alpha=110)
+def _draw_lobby_static(layer, w, h, players, font_title, font_sub, font_hint):
+    layer.fill((0, 0, 0, 110))
 
-    # Garis tengah
-    pygame.draw.line(screen, (255, 255, 255), (w // 2, 0), (w // 2, h), 2)
+    # Garis antar jalur
+    for p in range(1, players):
+        x = int(p * w / players)
+        pygame.draw.line(layer, (255, 255, 255), (x, 0), (x, h), 2)
 
-    for player in [1, 2]:
+    card_w, card_h = card_width(w, players, 320), 200
+    # Label besar tidak muat di kartu sempit
+    font_label = font_title if card_w >= 300 else font_sub
+    for player, cx in lane_centers(w, players).items():
         color  = PLAYER_COLORS[player]
-        cx     = w // 4 if player == 1 else 3 * w // 4
-        ready  = player_ready[player]
 
         # Kotak kartu (semi transparan)
-        card_w, card_h = 320, 200
         card_x = cx - card_w // 2
         card_y = h // 2 - card_h // 2 - 20
         card_surf = pygame.Surface((card_w, card_h), pygame.SRCALPHA)
         card_surf.fill((0, 0, 0, 140))
         pygame.draw.rect(card_surf, (*color, 180), (0, 0, card_w, card_h), 3, border_radius=16)
-        screen.blit(card_surf, (card_x, card_y))
+        layer.blit(card_surf, (card_x, card_y))
 
         # Label "PLAYER X"
-        lbl = font_title.render(f"PLAYER {player}", True, color)
-        screen.blit(lbl, (cx - lbl.get_width() // 2, card_y + 20))
+        lbl = font_label.render(f"PLAYER {player}", True, color)
+        layer.blit(lbl, (cx - lbl.get_width() // 2, card_y + 20))
+
+    # Hint di atas
+    if players == 2:
+        hint_txt = "Berdiri di depan kamera — kiri = P1, kanan = P2"
+    else:
+        hint_txt = f"Berdiri di depan kamera — satu orang per jalur, P1 paling kiri, P{players} paling kanan"
+    hint = font_hint.render(hint_txt, True, (220, 220, 220))
+    layer.blit(hint, (w // 2 - hint.get_width() // 2, 30))
+
+
+def draw_lobby(screen, w, h, player_ready, face_hold, font_title, font_sub, font_hint,
+               loading=None):
+    """loading: teks status selama model masih dimuat, None = model siap."""
+    # Overlay, garis tengah, kartu dan label statis → satu layer yang di-cache
+    players = len(player_ready)
+    static = ui_cache.layer(("lobby", players, font_title, font_sub, font_hint), (w, h),
+                            lambda ly: _draw_lobby_static(ly, w, h, players,
+                                                          font_title, font_sub, font_hint))
+    screen.blit(static, (0, 0))
+    centers = lane_centers(w, players)
+
+    if loading:
+        # Kamera sudah jalan tapi deteksi wajah belum bisa → belum ada status player
+        for cx in centers.values():
+            wait_surf = ui_cache.render_text(font_sub, "MEMUAT...", (180, 180, 180))
+            screen.blit(wait_surf, (cx - wait_surf.get_width() // 2, h // 2 - 30))
+        msg = ui_cache.render_text(font_hint, loading, (220, 220, 220))
+        screen.blit(msg, (w // 2 - msg.get_width() // 2, h - 60))
+        return
+
+    card_w, card_h = card_width(w, players, 320), 200
+    for player, cx in centers.items():
+        color  = PLAYER_COLORS[player]
+        ready  = player_ready[player]
+
+        card_x = cx - card_w // 2
+        card_y = h // 2 - card_h // 2 - 20
 
         # Status
         if ready:
@@ -91,7 +218,7 @@ def draw_lobby(screen, w, h, player_ready, face_hold, font_title, font_sub, font
             status_txt   = "NOT READY"
             status_color = (200, 60, 60)
 
-        status_surf = font_sub.render(status_txt, True, status_color)
+        status_surf = ui_cache.render_text(font_sub, status_txt, status_color)
         screen.blit(status_surf, (cx - status_surf.get_width() // 2, card_y + 90))
 
         # Progress bar (berapa lama wajah sudah terdeteksi)
@@ -103,13 +230,9 @@ def draw_lobby(screen, w, h, player_ready, face_hold, font_title, font_sub, font
         if bar_fill > 0:
             pygame.draw.rect(screen, color, (bar_x, bar_y, bar_fill, 14), border_radius=7)
 
-    # Hint di atas
-    hint = font_hint.render("Berdiri di depan kamera — kiri = P1, kanan = P2", True, (220, 220, 220))
-    screen.blit(hint, (w // 2 - hint.get_width() // 2, 30))
 
-
-def draw_countdown(screen, w, h, number, font_big, font_sub):
-    draw_overlay(screen, alpha=130)
+def _draw_countdown_layer(layer, w, h, number, font_big, font_sub):
+    layer.fill((0, 0, 0, 130))
 
     if number > 0:
         text  = str(number)
@@ -123,15 +246,22 @@ def draw_countdown(screen, w, h, number, font_big, font_sub):
     shadow = font_big.render(text, True, (0, 0, 0))
     cx = w // 2 - rendered.get_width() // 2
     cy = h // 2 - rendered.get_height() // 2
-    screen.blit(shadow, (cx + 4, cy + 4))
-    screen.blit(rendered, (cx, cy))
+    layer.blit(shadow, (cx + 4, cy + 4))
+    layer.blit(rendered, (cx, cy))
 
     sub = font_sub.render("Siapkan tangan kamu!", True, (220, 220, 220))
-    screen.blit(sub, (w // 2 - sub.get_width() // 2, cy + rendered.get_height() + 10))
+    layer.blit(sub, (w // 2 - sub.get_width() // 2, cy + rendered.get_height() + 10))
 
 
-def draw_game_over(screen, w, h, scores, winner, font_title, font_sub, font_hint):
-    draw_overlay(screen, alpha=160)
+def draw_countdown(screen, w, h, number, font_big, font_sub):
+    # Satu layer per angka, tidak ada yang berubah selama angka sama
+    ly = ui_cache.layer(("countdown", number, font_big, font_sub), (w, h),
+                        lambda ly: _draw_countdown_layer(ly, w, h, number, font_big, font_sub))
+    screen.blit(ly, (0, 0))
+
+
+def _draw_game_over_layer(layer, w, h, scores, winner, font_title, font_sub, font_hint):
+    layer.fill((0, 0, 0, 160))
 
     # Judul
     title_color = (255, 220, 60)
@@ -139,16 +269,16 @@ def draw_game_over(screen, w, h, scores, winner, font_title, font_sub, font_hint
     shadow = font_title.render("GAME OVER!", True, (0, 0, 0))
     tx = w // 2 - title.get_width() // 2
     ty = h // 2 - 160
-    screen.blit(shadow, (tx + 3, ty + 3))
-    screen.blit(title, (tx, ty))
+    layer.blit(shadow, (tx + 3, ty + 3))
+    layer.blit(title, (tx, ty))
 
     # Skor masing-masing player
-    for player, cx in [(1, w // 4), (2, 3 * w // 4)]:
+    card_w, card_h = card_width(w, len(scores), 280), 160
+    for player, cx in lane_centers(w, len(scores)).items():
         color = PLAYER_COLORS[player]
         is_winner = winner == player
 
         # Kotak
-        card_w, card_h = 280, 160
         card_x = cx - card_w // 2
         card_y = h // 2 - 70
         border_color = (255, 220, 60) if is_winner else color
@@ -157,123 +287,376 @@ def draw_game_over(screen, w, h, scores, winner, font_title, font_sub, font_hint
         border_thick = 4 if is_winner else 2
         pygame.draw.rect(card_surf, (*border_color, 220),
                          (0, 0, card_w, card_h), border_thick, border_radius=16)
-        screen.blit(card_surf, (card_x, card_y))
+        layer.blit(card_surf, (card_x, card_y))
 
         # Label player
         lbl = font_sub.render(f"Player {player}", True, color)
-        screen.blit(lbl, (cx - lbl.get_width() // 2, card_y + 15))
+        layer.blit(lbl, (cx - lbl.get_width() // 2, card_y + 15))
 
         # Skor
         sc = font_title.render(str(scores[player]), True, color)
-        screen.blit(sc, (cx - sc.get_width() // 2, card_y + 60))
+        layer.blit(sc, (cx - sc.get_width() // 2, card_y + 60))
 
         # Mahkota kalau menang
         if is_winner:
             crown = font_sub.render("WINNER!", True, (255, 220, 60))
-            screen.blit(crown, (cx - crown.get_width() // 2, card_y + card_h + 10))
+            layer.blit(crown, (cx - crown.get_width() // 2, card_y + card_h + 10))
 
     if winner is None:
         tie = font_sub.render("SERI!", True, (220, 220, 220))
-        screen.blit(tie, (w // 2 - tie.get_width() // 2, h // 2 + 120))
+        layer.blit(tie, (w // 2 - tie.get_width() // 2, h // 2 + 120))
 
     # Hint restart
     hint = font_hint.render("Tekan SPACE untuk main lagi  |  ESC untuk keluar", True, (180, 180, 180))
-    screen.blit(hint, (w // 2 - hint.get_width() // 2, h - 50))
-
+    layer.blit(hint, (w // 2 - hint.get_width() // 2, h - 50))
 
-def main():
-    # Camera
-    cap = cv2.VideoCapture(CAM_INDEX)
-    if not cap.isOpened():
-        print(f"[ERROR] Tidak bisa buka kamera index {CAM_INDEX}")
-        sys.exit(1)
 
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAM_W)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAM_H)
-    W = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-    H = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-    print(f"[INFO] Kamera: {W}x{H}")
+def draw_game_over(screen, w, h, scores, winner, font_title, font_sub, font_hint):
+    # Skor sudah final selama GAME OVER → seluruh layar jadi satu layer
+    key = ("game_over", tuple(sorted(scores.items())), winner, font_title, font_sub, font_hint)
+    ly = ui_cache.layer(key, (w, h),
+                        lambda ly: _draw_game_over_layer(ly, w, h, scores, winner,
+                                                         font_title, font_sub, font_hint))
+    screen.blit(ly, (0, 0))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=WINDOW_TITLE)
+    parser.add_argument("--record", metavar="DIR",
+                        help="rekam frame kamera + hasil tracker ke folder DIR")
+    parser.add_argument("--no-record-frames", action="store_true",
+                        help="rekam hasil tracker saja, tanpa frame kamera")
+    parser.add_argument("--source", default=CAM_SOURCE,
+                        help="index kamera, file video, atau folder / glob gambar")
+    parser.add_argument("--replay", metavar="DIR",
+                        help="jalankan sesi rekaman dari DIR, bukan kamera")
+    parser.add_argument("--retrack", action="store_true",
+                        help="saat replay: jalankan model lagi di frame rekaman")
+    parser.add_argument("--headless", action="store_true",
+                        help="tanpa window; dengan --replay juga tanpa batas FPS")
+    parser.add_argument("--record-video", metavar="DIR", default=VIDEO_RECORD_DIR,
+                        help="simpan video gameplay tiap ronde ke DIR")
+    parser.add_argument("--spectate", type=int, metavar="PORT", default=SPECTATOR_PORT,
+                        help="siarkan state game ke penonton WebSocket di PORT")
+    parser.add_argument("--spectate-host", metavar="HOST", default=SPECTATOR_HOST,
+                        help="alamat bind server penonton (0.0.0.0 = semua interface)")
+    parser.add_argument("--players", type=int, default=NUM_PLAYERS,
+                        choices=range(2, MAX_PLAYERS + 1), metavar="N",
+                        help=f"jumlah player / jalur (2-{MAX_PLAYERS})")
+    parser.add_argument("--seed", type=int,
+                        help="seed random spawn (ronde ke-k pakai seed + k)")
+    return parser.parse_args(argv)
+
+
+def draw_splash(screen, font, text):
+    """Frame pertama sebelum kamera terbuka, supaya kiosk tidak layar hitam."""
+    screen.fill((0, 0, 0))
+    surf = font.render(text, True, (220, 220, 220))
+    screen.blit(surf, (screen.get_width() // 2 - surf.get_width() // 2,
+                       screen.get_height() // 2 - surf.get_height() // 2))
+    pygame.display.flip()
+
+
+def apply_quality(level, face_tracker, hand_tracker, game, background):
+    """Terapkan satu QualityLevel ke semua knob; tracker replay dilewati."""
+    if isinstance(face_tracker, FaceTracker):
+        face_tracker.inference_scale = FACE_INFERENCE_SCALE * level.inference_factor
+    if isinstance(hand_tracker, PredictiveHandTracker):
+        if isinstance(hand_tracker.tracker, HandTracker):
+            hand_tracker.tracker.inference_scale = HAND_INFERENCE_SCALE * level.inference_factor
+        hand_tracker.min_every = level.min_detect_every
+        hand_tracker.detect_every = max(hand_tracker.detect_every, level.min_detect_every)
+    game.particles_per_pop = level.particles_per_pop
+    game.draw_skeleton = Game.DRAW_SKELETON and level.effects
+    background.refresh_every = level.background_every
+
+
+def build_face_tracker(players=NUM_PLAYERS):
+    return FaceTracker(async_mode=ASYNC_INFERENCE, inference_scale=FACE_INFERENCE_SCALE,
+                       players=players)
+
+
+def build_hand_tracker(players=NUM_PLAYERS):
+    return PredictiveHandTracker(
+        HandTracker(max_hands=players, async_mode=ASYNC_INFERENCE,
+                    inference_scale=HAND_INFERENCE_SCALE, players=players,
+                    lane_crops=LANE_CROPS, roi_full_every=HAND_ROI_FULL_EVERY),
+        detect_every=HAND_DETECT_EVERY,
+        adaptive=HAND_DETECT_ADAPTIVE,
+        frame_budget_ms=1000.0 / TARGET_FPS,
+    )
+
+
+def reset_lobby(players):
+    """Counter hysteresis lobby yang baru: (face_hold, face_miss, player_ready)."""
+    return ({p: 0 for p in players},    # frame terdeteksi berturut
+            {p: 0 for p in players},    # frame tidak terdeteksi berturut
+            {p: False for p in players})
+
+
+def main(argv=None, tracker_builders=None, on_stats=None, stats_secs=CAPTURE_STATS_SECS):
+    """
+    tracker_builders: {"face": fn, "hand": fn} pengganti tracker lokal
+    (dipakai host.py untuk tracker remote). on_stats(dict) dipanggil tiap
+    stats_secs dengan fps, state dan statistik capture. Return list hasil
+    ronde ({"seed", "scores", "winner", "ticks"}) yang selesai di sesi ini.
+    """
+    startup = StartupProfiler(_T_START)
+    startup.mark("main")
+    args = parse_args(argv)
+    if args.headless:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    cap = None
+    reader = None
+    exact_replay = False
+    W, H = CAM_W, CAM_H
+    if args.replay:
+        # Replay: frame dan waktu dari rekaman, game loop jadi deterministik
+        reader = SessionReader(args.replay)
+        W, H = reader.width, reader.height
+        args.players = reader.players
+        print(f"[INFO] Replay: {args.replay} ({W}x{H}, {reader.meta['frames']} frame)")
+        if not reader.has_updates:
+            print("[INFO] Sesi tanpa updates.bin: replay melangkah per frame rekaman, "
+                  "skor bisa beda dari sesi live")
+        capture = ReplaySource(reader)
+        # --retrack menghasilkan tangan baru, update rekaman tidak berlaku
+        exact_replay = reader.has_updates and not args.retrack
+        base_seed = args.seed if args.seed is not None else reader.seed
+
+    # Window dulu, baru kamera dan model: kiosk langsung tampil sesuatu
+    with startup.phase("window"):
+        pygame.init()
+        screen = pygame.display.set_mode((W, H))
+        pygame.display.set_caption(WINDOW_TITLE)
+        font_hint = pygame.font.SysFont("Arial", 22)
+        draw_splash(screen, font_hint, "Menyiapkan kamera...")
+    startup.mark("window_shown")
+
+    # Model di-load + warmup di background selama kamera dibuka
+    loader = None
+    if reader and not args.retrack:
+        face_tracker = ReplayFaceTracker(reader, capture)
+        hand_tracker = ReplayHandTracker(reader, capture)
+    else:
+        face_tracker = hand_tracker = None
+        if tracker_builders:
+            loader = ModelLoader(list(tracker_builders.items()), startup).start()
+        else:
+            loader = ModelLoader([("face", lambda: build_face_tracker(args.players)),
+                                  ("hand", lambda: build_hand_tracker(args.players))],
+                                 startup, prepare=load_mediapipe).start()
+
+    if not reader:
+        # Camera / file source
+        with startup.phase("camera_open"):
+            try:
+                cap = open_source(args.source, CAM_W, CAM_H, CAM_FPS, CAM_FOURCC)
+            except RuntimeError as e:
+                print(f"[ERROR] {e}")
+                pygame.quit()
+                sys.exit(1)
+        print(f"[INFO] Kamera: {cap.info}")
+        if (cap.info["width"], cap.info["height"]) != (W, H):
+            # Kamera tidak mau resolusi yang diminta → window ikut kamera
+            W, H = cap.info["width"], cap.info["height"]
+            screen = pygame.display.set_mode((W, H))
+        capture = CameraCapture(cap, flip=FLIP_CAMERA, buffer_size=CAPTURE_BUFFER,
+                                measure_buffer_age=LATENCY_MODE).start()
+        base_seed = args.seed
+        if args.record and base_seed is None:
+            # Rekaman harus bisa di-replay persis, jadi seed selalu dicatat
+            base_seed = random.getrandbits(32)
+
+    recorder = None
+    if args.record:
+        recorder = SessionRecorder(args.record, W, H, seed=base_seed,
+                                   record_frames=not args.no_record_frames,
+                                   players=args.players)
+        print(f"[INFO] Rekam sesi ke {args.record} (seed {base_seed})")
+    rounds = []
+    video = None
+    if args.record_video:
+        video = GameplayRecorder(args.record_video, fps=TARGET_FPS, drop_policy=VIDEO_DROP_POLICY)
+        print(f"[INFO] Rekam video ronde ke {args.record_video}")
+    game_over_at = 0.0
+    spectator = None
+    if args.spectate is not None:
+        spectator = SpectatorServer(host=args.spectate_host, port=args.spectate).start()
+        print(f"[INFO] Spectator server di {spectator.host}:{spectator.port}")
+
+    def round_seed():
+        return None if base_seed is None else base_seed + len(rounds)
 
     # Pygame
-    pygame.init()
-    screen = pygame.display.set_mode((W, H))
-    pygame.display.set_caption(WINDOW_TITLE)
     clock = pygame.time.Clock()
+    background = CameraBackground((W, H))
 
     font_title     = pygame.font.SysFont("Arial", 52, bold=True)
     font_sub       = pygame.font.SysFont("Arial", 34, bold=True)
-    font_hint      = pygame.font.SysFont("Arial", 22)
     font_countdown = pygame.font.SysFont("Arial", 200, bold=True)
 
-    face_tracker = FaceTracker()
-    hand_tracker = HandTracker(max_hands=2)
-    game = Game(W, H)
+    players = list(range(1, args.players + 1))
+    game = Game(W, H, seed=round_seed(), players=args.players)
+    startup_reported = False
+    # Replay harus deterministik: jumlah partikel ikut menentukan urutan random
+    governor = QualityGovernor(TARGET_FPS) if QUALITY_GOVERNOR and not reader else None
+    quality = QUALITY_LEVELS[0]
 
     state = GameState.LOBBY
 
     # Hysteresis counters
-    face_hold   = {1: 0, 2: 0}   # frame terdeteksi berturut
-    face_miss   = {1: 0, 2: 0}   # frame tidak terdeteksi berturut
-    player_ready = {1: False, 2: False}
-
-    countdown_start_ms = 0
+    face_hold, face_miss, player_ready = reset_lobby(players)
+    # Replay harus memanggil detect_players tiap frame seperti rekamannya
+    face_gate = FaceGate(READY_HOLD_FRAMES + 5, FACE_STABLE_EVERY) \
+        if FACE_STABLE_EVERY > 1 and not reader else None
+
+    countdown_start = 0.0
+
+    last_seq = 0
+    hands = HandResult.empty(W, H)
+    last_stats_t = time.perf_counter()
+    last_loop_t = None
+
+    perf = StageTimer()
+    perf_hud = PerfHUD(pygame.font.SysFont("Consolas", 16))
+    perf_hud.visible = PERF_HUD
+    perf_export = PerfExporter(PERF_EXPORT_PATH, PERF_EXPORT_SECS) if PERF_EXPORT_PATH else None
+    # Waktu replay bukan perf_counter, latency tidak bermakna di sana
+    latency = LatencyMeter() if LATENCY_MODE and not reader else None
+    last_hand_t_capture = None
 
     running = True
     while running:
+        perf.start()
+
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
             elif event.type == pygame.KEYDOWN:
                 if event.key in (pygame.K_q, pygame.K_ESCAPE):
                     running = False
-                elif event.key == pygame.K_SPACE and state == GameState.GAME_OVER:
+                elif event.key == pygame.K_F3:
+                    perf_hud.toggle()
+                elif event.key == pygame.K_SPACE and state == GameState.GAME_OVER \
+                        and not reader:
                     # Restart: kembali ke lobby
                     state = GameState.LOBBY
-                    face_hold = {1: 0, 2: 0}
-                    face_miss = {1: 0, 2: 0}
-                    player_ready = {1: False, 2: False}
-
-        ret, frame = cap.read()
-        if not ret:
+                    if video:
+                        video.end_round()
+                    face_hold, face_miss, player_ready = reset_lobby(players)
+                    if face_gate:
+                        face_gate.reset()
+
+        perf.lap("events")
+
+        frame = capture.latest()
+        perf.lap("capture")
+        if frame is None:
+            if reader:
+                break   # rekaman habis
+            # Kamera belum kirim frame pertama
+            clock.tick(TARGET_FPS)
             continue
-
-        if FLIP_CAMERA:
-            frame = cv2.flip(frame, 1)
-
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        startup.mark("first_frame")
+
+        if loader and face_tracker is None and loader.wait(0):
+            if loader.failed:
+                print(f"[ERROR] {loader.status}")
+                break
+            face_tracker = loader.trackers["face"]
+            hand_tracker = loader.trackers["hand"]
+            apply_quality(quality, face_tracker, hand_tracker, game, background)
+        if not startup_reported and face_tracker is not None:
+            startup_reported = True
+            startup.mark("ready")
+            print(f"[INFO] Startup:\n{startup.report()}")
+
+        # Jam loop: waktu nyata, atau waktu rekaman saat replay. Dipakai
+        # simulasi fixed-timestep dan countdown.
+        now = frame.t_capture if reader else time.perf_counter()
+        dt = 0.0 if last_loop_t is None else now - last_loop_t
+        last_loop_t = now
+
+        if reader and state == GameState.GAME_OVER and reader.faces_for(frame.seq) is not None:
+            # Hasil wajah cuma direkam di lobby → di sesi aslinya SPACE ditekan di sini
+            state = GameState.LOBBY
+            if video:
+                video.end_round()
+            face_hold, face_miss, player_ready = reset_lobby(players)
+
+        # Tracker cuma jalan kalau ada frame baru, sisanya pakai hasil terakhir
+        new_frame = frame.seq != last_seq
+        last_seq = frame.seq
+        frame_rgb = frame.rgb
+        if new_frame:
+            perf.record("convert", frame.convert_ms)
+            if recorder:
+                recorder.add_frame(frame)
+            if latency:
+                latency.add("buffer", frame.buffer_age_ms)
+                latency.add("queue", frame.age_ms)
 
         # Background kamera
-        screen.blit(frame_to_surface(frame), (0, 0))
+        background.draw(screen, frame_rgb)
+        perf.lap("background")
 
         # ── LOBBY ─────────────────────────────────────────────────────────────
         if state == GameState.LOBBY:
-            detected = face_tracker.detect_players(frame_rgb, W, H)
-
-            for p in [1, 2]:
-                if p in detected:
-                    face_hold[p] = min(face_hold[p] + 1, READY_HOLD_FRAMES + 5)
-                    face_miss[p] = 0
+            # Hold counter dihitung per frame kamera, bukan per loop render
+            if new_frame and face_tracker is not None:
+                if face_gate is None:
+                    detected = face_tracker.detect_players(frame_rgb, W, H)
+                elif face_gate.should_run(face_hold):
+                    t0 = time.perf_counter()
+                    detected = face_tracker.detect_players(frame_rgb, W, H)
+                    call_ms = (time.perf_counter() - t0) * 1000.0
+                    # Async: biaya inference sebenarnya ada di latency callback
+                    latency_ms = getattr(face_tracker, "last_latency_ms", None)
+                    face_gate.record(detected, latency_ms if latency_ms is not None else call_ms)
                 else:
-                    face_miss[p] += 1
-                    if face_miss[p] >= UNREADY_HOLD_FRAMES:
-                        face_hold[p] = max(face_hold[p] - 2, 0)
-
-                player_ready[p] = face_hold[p] >= READY_HOLD_FRAMES
-
-            draw_lobby(screen, W, H, player_ready, face_hold, font_title, font_sub, font_hint)
-
-            # Kalau dua-duanya READY → mulai countdown
-            if player_ready[1] and player_ready[2]:
+                    detected = face_gate.last
+                perf.lap("face")
+                if recorder:
+                    recorder.add_faces(frame.seq, frame.t_capture, detected)
+
+                for p in players:
+                    if p in detected:
+                        face_hold[p] = min(face_hold[p] + 1, READY_HOLD_FRAMES + 5)
+                        face_miss[p] = 0
+                    else:
+                        face_miss[p] += 1
+                        if face_miss[p] >= UNREADY_HOLD_FRAMES:
+                            face_hold[p] = max(face_hold[p] - 2, 0)
+
+                    player_ready[p] = face_hold[p] >= READY_HOLD_FRAMES
+
+            draw_lobby(screen, W, H, player_ready, face_hold, font_title, font_sub, font_hint,
+                       loading=None if face_tracker is not None else loader.status)
+            perf.lap("ui")
+
+            # Kalau semua READY → mulai countdown
+            if all(player_ready.values()):
                 state = GameState.COUNTDOWN
-                countdown_start_ms = pygame.time.get_ticks()
-                game = Game(W, H)   # reset game baru
+                countdown_start = now
+                game = Game(W, H, seed=round_seed(), players=args.players)   # reset game baru
+                apply_quality(quality, face_tracker, hand_tracker, game, background)
+                inner = getattr(hand_tracker, "tracker", None)
+                if isinstance(inner, HandTracker) and inner.roi:
+                    # Wajah lobby = petunjuk awal di mana tangan tiap player
+                    inner.roi.start_round(getattr(face_tracker, "boxes", None))
+                if video:
+                    video.start_round(time.strftime("round_%Y%m%d_%H%M%S") + f"_{len(rounds) + 1:03d}")
 
         # ── COUNTDOWN ─────────────────────────────────────────────────────────
         elif state == GameState.COUNTDOWN:
-            elapsed_s = (pygame.time.get_ticks() - countdown_start_ms) / 1000.0
+            elapsed_s = now - countdown_start
             number    = COUNTDOWN_SECS - int(elapsed_s)   # 3 → 2 → 1 → 0 (GO!)
 
             draw_countdown(screen, W, H, max(number, 0), font_countdown, font_hint)
+            perf.lap("ui")
 
             if elapsed_s >= COUNTDOWN_SECS + GO_HOLD_SECS:
                 state = GameState.PLAYING
@@ -281,29 +664,163 @@ def main():
 
         # ── PLAYING ───────────────────────────────────────────────────────────
         elif state == GameState.PLAYING:
-            draw_overlay(screen, alpha=75)
-            hands_data = hand_tracker.process(frame_rgb, W, H)
-            game.update(hands_data)
-            game.draw(screen, hands_data)
+            if quality.effects:
+                draw_overlay(screen, alpha=75)
+            perf.lap("ui")
+            if exact_replay:
+                # Jalankan ulang persis (dt, tangan) tiap Game.update() sesi live,
+                # termasuk loop render yang live-nya cuma predict()
+                perf.lap("hand")
+                while not game.finished:
+                    update = reader.next_update(frame.seq, W, H)
+                    if update is None:
+                        break
+                    dt_rec, hands = update
+                    game.update(hands, dt_rec)
+                perf.lap("update")
+            else:
+                if new_frame:
+                    hands = hand_tracker.process(frame_rgb, W, H, frame.t_capture)
+                    if recorder:
+                        recorder.add_hands(frame.seq, frame.t_capture, hands)
+                else:
+                    # Belum ada frame baru: ekstrapolasi posisi terakhir
+                    hands = hand_tracker.predict()
+                perf.lap("hand")
+                game.update(hands, dt)
+                if recorder:
+                    recorder.add_update(frame.seq, dt, hands)
+                perf.lap("update")
+            game.draw(screen, hands)
+            perf.lap("draw")
 
             if game.finished:
                 state = GameState.GAME_OVER
+                game_over_at = now
+                rounds.append({"seed": game.seed, "scores": dict(game.scores),
+                               "winner": game.get_winner(), "ticks": game.ticks})
 
         # ── GAME OVER ─────────────────────────────────────────────────────────
         elif state == GameState.GAME_OVER:
-            draw_overlay(screen, alpha=75)
-            game.draw(screen, [])   # gambar sisa partikel
+            if quality.effects:
+                draw_overlay(screen, alpha=75)
+            game.draw(screen)   # gambar sisa partikel
+            perf.lap("draw")
             draw_game_over(screen, W, H, game.scores, game.get_winner(),
                            font_title, font_sub, font_hint)
+            perf.lap("ui")
+            if video and video.recording and now - game_over_at >= VIDEO_TAIL_SECS:
+                video.end_round()
+
+        if spectator:
+            spectator.publish(game, state.name, hands if state == GameState.PLAYING else None,
+                              ready=[p for p in player_ready if player_ready[p]])
+            perf.lap("spectator")
+
+        if video:
+            # Sebelum HUD: HUD perf tidak ikut terekam
+            video.add_frame(screen, now)
+            perf.lap("record")
+
+        hud_extra = {"state": state.name, "fps": round(clock.get_fps(), 1)}
+        if governor:
+            hud_extra["quality"] = f"{quality.name} ({governor.reason})"
+        perf_hud.draw(screen, perf, hud_extra)
+        perf.lap("hud")
 
         pygame.display.flip()
-        clock.tick(TARGET_FPS)
-
-    face_tracker.close()
-    hand_tracker.close()
-    cap.release()
+        perf.lap("flip")
+        if latency:
+            t_flip = time.perf_counter()
+            if new_frame:
+                latency.add("background", (t_flip - frame.t_capture) * 1000.0)
+            if state == GameState.PLAYING and hands.t_capture is not None \
+                    and hands.t_capture != last_hand_t_capture:
+                # Hitung sekali per hasil deteksi, saat pertama kali tampil
+                last_hand_t_capture = hands.t_capture
+                latency.add("hand", (t_flip - hands.t_capture) * 1000.0)
+            for t_cap in game.pop_capture_times:
+                latency.add("pop", (t_flip - t_cap) * 1000.0)
+        # Selalu dikosongkan: tanpa LATENCY_MODE list ini tumbuh sepanjang proses
+        game.pop_capture_times.clear()
+        if args.headless and reader:
+            # Replay pakai jam rekaman, jadi aman jalan secepat mungkin. Live
+            # headless (station host.py) tetap dibatasi supaya tidak busy-spin.
+            clock.tick()
+        else:
+            clock.tick(TARGET_FPS)
+        perf.lap("idle")
+        perf.end_frame()
+        # Waktu kerja frame = total dikurangi tidur di clock.tick
+        if governor and governor.observe(perf.last("frame") - perf.last("idle")):
+            _, old, new, reason = governor.changes[-1]
+            print(f"[INFO] Kualitas: {old} -> {new} ({reason})")
+            quality = governor.current
+            apply_quality(quality, face_tracker, hand_tracker, game, background)
+        if perf_export:
+            perf_export.maybe_export(perf, {**capture.stats(), **(governor.status() if governor else {})})
+
+        if stats_secs and time.perf_counter() - last_stats_t >= stats_secs:
+            last_stats_t = time.perf_counter()
+            if on_stats:
+                on_stats({"state": state.name, "fps": round(clock.get_fps(), 1),
+                          "capture": capture.stats(),
+                          "quality": quality.name if governor else None})
+            print(f"[INFO] Capture: {capture.stats()}")
+            if governor:
+                print(f"[INFO] Kualitas: {governor.status()}")
+            if video:
+                print(f"[INFO] Video: {video.stats()}")
+            if spectator:
+                print(f"[INFO] Spectator: {spectator.stats()}")
+            inner = getattr(hand_tracker, "tracker", None)
+            if isinstance(inner, HandTracker) and inner.lane_crops:
+                print(f"[INFO] Crop lane: {inner.crop_stats()}")
+            if isinstance(inner, HandTracker) and inner.roi:
+                print(f"[INFO] ROI tangan: {inner.roi.stats()}")
+            if face_gate:
+                print(f"[INFO] ROI wajah: {face_gate.stats()}")
+            if latency:
+                print(f"[INFO] Motion-to-photon:\n{latency.format()}")
+
+    capture.stop()
+    if spectator:
+        spectator.close()
+        print(f"[INFO] Spectator: {spectator.stats()}")
+    if video:
+        video.close()
+        print(f"[INFO] Video: {video.stats()}")
+    if recorder:
+        recorder.close()
+        print(f"[INFO] Sesi tersimpan: {recorder.frames_written} frame "
+              f"({recorder.frames_dropped} drop), {recorder.hands_written} hasil tangan, "
+              f"{recorder.faces_written} hasil wajah, {recorder.updates_written} update game")
+    if reader:
+        # Satu baris JSON per sesi, gampang dibandingkan antar run
+        print(json.dumps({"replay": args.replay, "seed": base_seed, "rounds": rounds}))
+    print(f"[INFO] Capture: {capture.stats()}")
+    inner = getattr(hand_tracker, "tracker", None)
+    if isinstance(inner, HandTracker) and inner.roi:
+        print(f"[INFO] ROI tangan: {inner.roi.stats()}")
+    if face_gate:
+        print(f"[INFO] ROI wajah: {face_gate.stats()}")
+    if latency:
+        print(f"[INFO] Motion-to-photon:\n{latency.format()}")
+    if perf_export:
+        perf_export.export(perf, {**capture.stats(), **(governor.status() if governor else {})})
+    if loader:
+        # Tutup juga tracker yang sempat jadi walau loader gagal / belum selesai
+        loader.wait(5.0)
+        for tracker in loader.trackers.values():
+            tracker.close()
+    else:
+        face_tracker.close()
+        hand_tracker.close()
+    if cap is not None:
+        cap.release()
     pygame.quit()
     print("[INFO] Game selesai.")
+    return rounds
 
 
 if __name__ == "__main__":
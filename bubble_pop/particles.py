@@ -0,0 +1,117 @@
+import math
+
+import numpy as np
+
+from sprites import particle_sprite
+
+
+class ParticleSystem:
+    """
+    Fixed-capacity, array-backed pool of pop particles.
+
+    All particle state lives in preallocated arrays; slots [0, n) are live.
+    emit() writes into free slots, update() advances every particle in one
+    batched step and compacts dead ones in place. Nothing is allocated per
+    particle, and `capacity` is a hard cap: a burst that would exceed it is
+    truncated instead of growing the pool.
+    """
+
+    GRAVITY = 0.18
+    DECAY = 0.055
+
+    def __init__(self, capacity=800, rng=None):
+        self.capacity = capacity
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.n = 0
+        self.dropped = 0   # partikel yang tidak jadi di-spawn karena pool penuh
+
+        self.x = np.zeros(capacity, dtype=np.float64)
+        self.y = np.zeros(capacity, dtype=np.float64)
+        self.prev_x = np.zeros(capacity, dtype=np.float64)
+        self.prev_y = np.zeros(capacity, dtype=np.float64)
+        self.vx = np.zeros(capacity, dtype=np.float64)
+        self.vy = np.zeros(capacity, dtype=np.float64)
+        self.life = np.zeros(capacity, dtype=np.float64)
+        self.radius = np.zeros(capacity, dtype=np.int32)
+        self.color_idx = np.zeros(capacity, dtype=np.int32)
+        self._colors = []
+
+    def __len__(self):
+        return self.n
+
+    @property
+    def colors(self):
+        """Palet warna; color_idx partikel menunjuk ke sini."""
+        return tuple(self._colors)
+
+    def _color_index(self, color):
+        try:
+            return self._colors.index(color)
+        except ValueError:
+            self._colors.append(color)
+            return len(self._colors) - 1
+
+    def emit(self, x, y, color, count):
+        """Spawn sampai `count` partikel di (x, y). Return jumlah yang benar-benar dibuat."""
+        count_ok = min(count, self.capacity - self.n)
+        self.dropped += count - count_ok
+        if count_ok <= 0:
+            return 0
+
+        rng = self.rng
+        s = slice(self.n, self.n + count_ok)
+        angle = rng.uniform(0, math.pi * 2, count_ok)
+        speed = rng.uniform(2, 7, count_ok)
+        self.x[s] = x
+        self.y[s] = y
+        self.prev_x[s] = x
+        self.prev_y[s] = y
+        self.vx[s] = np.cos(angle) * speed
+        self.vy[s] = np.sin(angle) * speed
+        self.life[s] = 1.0
+        self.radius[s] = rng.integers(3, 8, count_ok)
+        self.color_idx[s] = self._color_index(color)
+        self.n += count_ok
+        return count_ok
+
+    def update(self):
+        n = self.n
+        if n == 0:
+            return
+        self.prev_x[:n] = self.x[:n]
+        self.prev_y[:n] = self.y[:n]
+        self.x[:n] += self.vx[:n]
+        self.y[:n] += self.vy[:n]
+        self.vy[:n] += self.GRAVITY
+        self.life[:n] -= self.DECAY
+
+        keep = self.life[:n] > 0
+        k = int(np.count_nonzero(keep))
+        if k < n:
+            for arr in (self.x, self.y, self.prev_x, self.prev_y, self.vx, self.vy, self.life,
+                        self.radius, self.color_idx):
+                arr[:k] = arr[:n][keep]
+            self.n = k
+
+    def clear(self):
+        self.n = 0
+
+    def draw(self, surface, alpha=1.0):
+        """alpha: interpolasi antara posisi tick sebelumnya (0) dan sekarang (1)."""
+        n = self.n
+        if n == 0:
+            return
+        r = self.radius[:n]
+        x, y = self.x[:n], self.y[:n]
+        if alpha < 1.0:
+            x = self.prev_x[:n] + (x - self.prev_x[:n]) * alpha
+            y = self.prev_y[:n] + (y - self.prev_y[:n]) * alpha
+        xs = (x.astype(np.int32) - r).tolist()
+        ys = (y.astype(np.int32) - r).tolist()
+        alphas = (self.life[:n] * 255).astype(np.int32).tolist()
+        colors = self._colors
+        surface.blits(
+            [(particle_sprite(colors[c], rad, a), (px, py))
+             for c, rad, a, px, py in zip(self.color_idx[:n].tolist(), r.tolist(), alphas, xs, ys)],
+            doreturn=False,
+        )
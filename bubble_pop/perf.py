@@ -0,0 +1,168 @@
+import json
+import os
+import socket
+import time
+
+import numpy as np
+import pygame
+
+# Urutan stage di HUD / export. "frame" = total satu loop.
+STAGES = (
+    "events", "capture", "convert", "background", "face", "hand",
+    "update", "draw", "ui", "spectator", "record", "hud", "flip", "idle", "frame",
+)
+PERCENTILES = (50, 95, 99)
+
+
+class StageTimer:
+    """
+    Per-stage frame timings in a fixed-size ring buffer.
+
+    Call start() at the top of the loop, lap(stage) after each stage (time
+    since the previous lap is added to that stage), and end_frame() at the
+    bottom. Laps only touch a Python list; the ring buffer row is written
+    once per frame.
+    """
+
+    def __init__(self, capacity=600, stages=STAGES):
+        self.stages = stages
+        self._index = {name: i for i, name in enumerate(stages)}
+        self._frame_i = self._index["frame"]
+        self._buf = np.zeros((capacity, len(stages)), dtype=np.float32)
+        self._cur = [0.0] * len(stages)
+        self._pos = 0
+        self.frames = 0
+        self._t_start = self._t_last = time.perf_counter()
+
+    def start(self):
+        self._cur = [0.0] * len(self.stages)
+        self._t_start = self._t_last = time.perf_counter()
+
+    def lap(self, stage):
+        t = time.perf_counter()
+        self._cur[self._index[stage]] += (t - self._t_last) * 1000.0
+        self._t_last = t
+
+    def record(self, stage, ms):
+        """Catat durasi yang diukur di tempat lain (mis. konversi warna di thread capture)."""
+        self._cur[self._index[stage]] += ms
+
+    def end_frame(self):
+        self._cur[self._frame_i] = (time.perf_counter() - self._t_start) * 1000.0
+        self._buf[self._pos] = self._cur
+        self._pos = (self._pos + 1) % len(self._buf)
+        self.frames += 1
+
+    def last(self, stage):
+        """Durasi stage (ms) di frame terakhir yang sudah end_frame()."""
+        return float(self._buf[self._pos - 1, self._index[stage]])
+
+    def percentiles(self):
+        """{stage: (p50, p95, p99)} dalam ms dari isi ring buffer."""
+        n = min(self.frames, len(self._buf))
+        if n == 0:
+            return {}
+        p = np.percentile(self._buf[:n], PERCENTILES, axis=0)
+        return {name: tuple(float(v) for v in p[:, i]) for i, name in enumerate(self.stages)}
+
+
+class PerfHUD:
+    """Overlay p50/p95/p99 per stage; teks di-refresh beberapa kali per detik saja."""
+
+    def __init__(self, font, refresh_secs=0.5):
+        self.font = font
+        self.refresh_secs = refresh_secs
+        self.visible = False
+        self._panel = None
+        self._last_refresh = 0.0
+
+    def toggle(self):
+        self.visible = not self.visible
+        self._panel = None
+
+    def draw(self, surface, timer, extra=None):
+        if not self.visible:
+            return
+        now = time.perf_counter()
+        if self._panel is None or now - self._last_refresh >= self.refresh_secs:
+            self._panel = self._build(timer, extra or {})
+            self._last_refresh = now
+        surface.blit(self._panel, (10, surface.get_height() - self._panel.get_height() - 10))
+
+    def _build(self, timer, extra):
+        lines = [f"{'stage':<11}{'p50':>7}{'p95':>7}{'p99':>7}"]
+        for name, (p50, p95, p99) in timer.percentiles().items():
+            lines.append(f"{name:<11}{p50:>7.1f}{p95:>7.1f}{p99:>7.1f}")
+        lines += [f"{k}: {v}" for k, v in extra.items()]
+
+        # Angka berubah tiap refresh, jangan dimasukkan ke text cache UI
+        rendered = [self.font.render(line, True, (230, 230, 230)) for line in lines]
+        line_h = self.font.get_linesize()
+        w = max(r.get_width() for r in rendered) + 16
+        panel = pygame.Surface((w, line_h * len(rendered) + 12), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        for i, r in enumerate(rendered):
+            panel.blit(r, (8, 6 + i * line_h))
+        return panel
+
+
+class PerfExporter:
+    """
+    Periodically write stage percentiles to local disk.
+
+    *.prom  -> Prometheus textfile (node_exporter textfile collector),
+               rewritten atomically each time
+    other   -> one JSON object appended per line (JSON lines)
+    """
+
+    def __init__(self, path, interval_secs=10.0):
+        self.path = path
+        self.interval_secs = interval_secs
+        self.prometheus = path.endswith(".prom")
+        self.host = socket.gethostname()
+        self._last = time.perf_counter()
+
+    def maybe_export(self, timer, extra=None):
+        now = time.perf_counter()
+        if now - self._last < self.interval_secs:
+            return False
+        self._last = now
+        self.export(timer, extra)
+        return True
+
+    def export(self, timer, extra=None):
+        stats = timer.percentiles()
+        if not stats:
+            return
+        if self.prometheus:
+            self._write_prometheus(stats, timer.frames)
+        else:
+            record = {
+                "ts": time.time(),
+                "host": self.host,
+                "frames": timer.frames,
+                "stages": {name: {f"p{q}": round(v, 3) for q, v in zip(PERCENTILES, vals)}
+                           for name, vals in stats.items()},
+            }
+            if extra:
+                record["extra"] = extra
+            with open(self.path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+
+    def _write_prometheus(self, stats, frames):
+        lines = [
+            "# HELP bubble_pop_stage_ms Frame stage duration percentiles (ms).",
+            "# TYPE bubble_pop_stage_ms gauge",
+        ]
+        for name, vals in stats.items():
+            for q, v in zip(PERCENTILES, vals):
+                lines.append(f'bubble_pop_stage_ms{{stage="{name}",quantile="{q / 100}"}} {v:.3f}')
+        lines += [
+            "# HELP bubble_pop_frames_total Frames rendered since start.",
+            "# TYPE bubble_pop_frames_total counter",
+            f"bubble_pop_frames_total {frames}",
+        ]
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp, self.path)
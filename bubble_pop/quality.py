@@ -0,0 +1,81 @@
+import time
+from collections import deque, namedtuple
+
+import numpy as np
+
+# Satu tingkat kualitas. inference_factor dikali *_INFERENCE_SCALE config,
+# min_detect_every = batas bawah interval deteksi tangan, effects = overlay
+# gelap + skeleton tangan, background_every = kamera di-convert tiap N frame.
+QualityLevel = namedtuple(
+    "QualityLevel",
+    "name inference_factor min_detect_every particles_per_pop effects background_every",
+)
+
+QUALITY_LEVELS = (
+    QualityLevel("high",    1.0,  1, 10, True,  1),
+    QualityLevel("medium",  0.8,  2, 6,  True,  1),
+    QualityLevel("low",     0.65, 2, 4,  False, 2),
+    QualityLevel("minimum", 0.5,  3, 2,  False, 3),
+)
+
+
+class QualityGovernor:
+    """
+    Step quality down when frames run over budget and back up when there is
+    headroom, with hysteresis.
+
+    observe(work_ms) takes the time each frame spent working (everything but
+    the clock.tick sleep). Every `window` frames the p90 is checked:
+    above degrade_ratio x budget -> one level down straight away; below
+    upgrade_ratio x budget for upgrade_hold_s since the last change -> one
+    level up. The gap between the two ratios plus the hold time keeps it
+    from bouncing between levels. Samples are dropped after every change
+    so each level is judged on its own frames.
+    """
+
+    def __init__(self, target_fps, levels=QUALITY_LEVELS, window=45,
+                 degrade_ratio=0.9, upgrade_ratio=0.6, upgrade_hold_s=5.0):
+        self.levels = levels
+        self.budget_ms = 1000.0 / target_fps
+        self.window = window
+        self.degrade_ratio = degrade_ratio
+        self.upgrade_ratio = upgrade_ratio
+        self.upgrade_hold_s = upgrade_hold_s
+        self.level = 0
+        self.reason = "start"
+        self.changes = []          # (time.time(), dari, ke, alasan)
+        self._samples = deque(maxlen=window)
+        self._last_change_t = time.perf_counter()
+
+    @property
+    def current(self):
+        return self.levels[self.level]
+
+    def observe(self, work_ms):
+        """Return True kalau level berubah di frame ini."""
+        self._samples.append(work_ms)
+        if len(self._samples) < self.window:
+            return False
+
+        p90 = float(np.percentile(self._samples, 90))
+        self._samples.clear()
+        degrade_ms = self.budget_ms * self.degrade_ratio
+        upgrade_ms = self.budget_ms * self.upgrade_ratio
+        if p90 > degrade_ms and self.level < len(self.levels) - 1:
+            return self._set(self.level + 1, f"p90 {p90:.1f} ms > {degrade_ms:.1f} ms")
+        if p90 < upgrade_ms and self.level > 0 \
+                and time.perf_counter() - self._last_change_t >= self.upgrade_hold_s:
+            return self._set(self.level - 1, f"p90 {p90:.1f} ms < {upgrade_ms:.1f} ms")
+        return False
+
+    def _set(self, level, reason):
+        self.changes.append((time.time(), self.levels[self.level].name,
+                             self.levels[level].name, reason))
+        self.level = level
+        self.reason = reason
+        self._last_change_t = time.perf_counter()
+        return True
+
+    def status(self):
+        return {"quality": self.current.name, "quality_level": self.level,
+                "quality_reason": self.reason}
@@ -0,0 +1,286 @@
+import math
+from collections import deque
+
+import cv2
+import numpy as np
+
+# Landmark yang dipakai untuk menentukan tile / duplikat (sama dengan hand_tracker)
+_WRIST = 0
+_INDEX_TIP = 8
+
+
+def _p50(values):
+    return round(float(np.percentile(values, 50)), 1) if values else None
+
+
+class CropMosaic:
+    """
+    Pack pixel boxes cropped from a frame into one near-square image.
+
+    Every box gets an equal grid slot (sized after the largest box) and is
+    scaled to fill it, so several crops share a single inference call.
+    to_frame() maps landmarks found in the mosaic back to normalized
+    full-frame coordinates.
+    """
+
+    def __init__(self, max_side=640):
+        self.max_side = max_side
+
+    def build(self, frame_rgb, boxes):
+        """boxes: [(x0, y0, x1, y1)] pixel frame. Return (mosaic, layout); layout dipakai to_frame()."""
+        h, w = frame_rgb.shape[:2]
+        slot_w = max(x1 - x0 for x0, _, x1, _ in boxes)
+        slot_h = max(y1 - y0 for _, y0, _, y1 in boxes)
+        k = len(boxes)
+        # Kolom grid yang bikin mosaic paling mendekati persegi
+        cols = min(range(1, k + 1),
+                   key=lambda c: abs(math.log(c * slot_w / (math.ceil(k / c) * slot_h))))
+        rows = math.ceil(k / cols)
+        scale = min(1.0, self.max_side / max(cols * slot_w, rows * slot_h))
+        sw, sh = max(1, int(slot_w * scale)), max(1, int(slot_h * scale))
+
+        mosaic = np.zeros((rows * sh, cols * sw, 3), dtype=np.uint8)
+        tiles = []
+        for i, (x0, y0, x1, y1) in enumerate(boxes):
+            r, c = divmod(i, cols)
+            s = min(sw / (x1 - x0), sh / (y1 - y0))
+            tw, th = max(1, int((x1 - x0) * s)), max(1, int((y1 - y0) * s))
+            interp = cv2.INTER_AREA if s < 1.0 else cv2.INTER_LINEAR
+            mosaic[r * sh:r * sh + th, c * sw:c * sw + tw] = cv2.resize(
+                frame_rgb[y0:y1, x0:x1], (tw, th), interpolation=interp)
+            tiles.append((x0, y0, s, tw, th))
+        return mosaic, (tiles, cols, sw, sh, w, h)
+
+    def to_frame(self, landmarks, layout):
+        """
+        landmarks: (n, 21, 3) normalized ke mosaic. Return (landmarks full
+        frame, mask tangan yang jatuh di dalam satu tile).
+        """
+        tiles, cols, sw, sh, w, h = layout
+        out = landmarks.copy()
+        keep = np.zeros(len(landmarks), bool)
+        if not len(landmarks):
+            return out, keep
+        mw, mh = cols * sw, math.ceil(len(tiles) / cols) * sh
+        px = landmarks[:, :, 0] * mw
+        py = landmarks[:, :, 1] * mh
+        # Tile ditentukan dari wrist, seluruh tangan ikut tile itu
+        col = (px[:, _WRIST] // sw).astype(np.int32)
+        row = (py[:, _WRIST] // sh).astype(np.int32)
+        idx = row * cols + col
+        for i in range(len(landmarks)):
+            if not (0 <= col[i] < cols and 0 <= idx[i] < len(tiles)):
+                continue
+            x0, y0, s, tw, th = tiles[idx[i]]
+            local_x = px[i] - col[i] * sw
+            local_y = py[i] - row[i] * sh
+            if not (0 <= local_x[_WRIST] < tw and 0 <= local_y[_WRIST] < th):
+                continue   # wrist di padding hitam
+            out[i, :, 0] = (x0 + local_x / s) / w
+            out[i, :, 1] = (y0 + local_y / s) / h
+            keep[i] = True
+        return out, keep
+
+
+def dedupe(landmarks, min_dist):
+    """Mask tangan yang index tip-nya tidak sedekat min_dist dengan tangan sebelumnya."""
+    keep = np.ones(len(landmarks), bool)
+    tips = landmarks[:, _INDEX_TIP, :2]
+    for i in range(1, len(landmarks)):
+        dist = np.linalg.norm(tips[:i][keep[:i]] - tips[i], axis=1)
+        keep[i] = not (dist <= min_dist).any()
+    return keep
+
+
+class RoiScheduler:
+    """
+    Decide, per hand detection, between a full-frame pass and a pass over
+    crops around where each player was last seen.
+
+    Each player gets a box around their hand from the latest result; a
+    player without one gets a region under their face (from the lobby, see
+    start_round()) or, failing that, their whole lane. plan() returns None,
+    meaning "search the full frame", every `full_every` detections, when the
+    latest result is older than `lost_after_s`, when too many players would
+    need whole lanes, and right after a crop pass lost a hand it was
+    tracking. Crop passes that track at least one hand and find every
+    tracked hand count as hits.
+    """
+
+    # Box tangan = bbox landmark diperlebar PAD x ukurannya di tiap sisi
+    PAD = 1.0
+    # Sisi minimum box tangan, relatif ke tinggi frame
+    MIN_SIDE = 0.25
+    # Wilayah tangan di bawah wajah, dalam lebar / tinggi wajah
+    FACE_REACH_X = 3.0
+    FACE_REACH_UP = 1.0
+    FACE_REACH_DOWN = 5.0
+
+    def __init__(self, lanes, full_every=8, lost_after_s=0.5, lane_margin=0.15):
+        self.lanes = lanes
+        self.full_every = full_every
+        self.lost_after_s = lost_after_s
+        self.lane_margin = lane_margin
+        self.faces = {}          # player -> (x0, y0, x1, y1) normalized, dari lobby
+        self._since_full = full_every
+        self._lost = True
+
+        self.full_passes = 0
+        self.roi_passes = 0
+        self.roi_hits = 0
+        self._full_ms = deque(maxlen=300)
+        self._roi_ms = deque(maxlen=300)
+        self._roi_area = deque(maxlen=300)   # luas box / luas frame
+
+    def start_round(self, faces=None):
+        """Ronde baru: posisi tangan lama tidak berlaku, wajah lobby jadi petunjuk awal."""
+        self.faces = dict(faces or {})
+        self._lost = True
+
+    def plan(self, latest, t_capture, frame_w, frame_h):
+        """
+        latest: HandResult terakhir. Return None (pass full frame) atau list
+        (player, box pixel (x0, y0, x1, y1), tracked) untuk pass crop.
+        """
+        if (self._lost or self._since_full + 1 >= self.full_every or t_capture is None
+                or latest.t_capture is None or t_capture - latest.t_capture > self.lost_after_s):
+            return None
+
+        plan, whole_lanes = [], 0
+        for p in self.lanes.ids:
+            rows = np.flatnonzero(latest.players == p)
+            if len(rows):
+                box, tracked = self._hand_box(latest.landmarks[rows[0]], frame_w, frame_h), True
+            elif p in self.faces:
+                box, tracked = self._face_box(p, self.faces[p], frame_w, frame_h), False
+            else:
+                x0, x1 = self.lanes.pixel_span(p, frame_w, self.lane_margin)
+                box, tracked = (x0, 0, x1, frame_h), False
+                whole_lanes += 1
+            plan.append((p, box, tracked))
+        # Kebanyakan lane penuh = mosaic hampir seluas frame, full pass lebih jujur
+        if whole_lanes > self.lanes.players // 2:
+            return None
+        return plan
+
+    def _hand_box(self, landmarks, frame_w, frame_h):
+        x = landmarks[:, 0] * frame_w
+        y = landmarks[:, 1] * frame_h
+        cx, cy = (x.min() + x.max()) / 2, (y.min() + y.max()) / 2
+        side = max(x.max() - x.min(), y.max() - y.min()) * (1 + 2 * self.PAD)
+        side = max(side, self.MIN_SIDE * frame_h)
+        return _clip_box(cx - side / 2, cy - side / 2, cx + side / 2, cy + side / 2,
+                         frame_w, frame_h)
+
+    def _face_box(self, player, face, frame_w, frame_h):
+        x0, y0, x1, y1 = face
+        fw, fh = x1 - x0, y1 - y0
+        cx = (x0 + x1) / 2
+        lx0, lx1 = self.lanes.span(player, self.lane_margin)
+        return _clip_box(max(cx - self.FACE_REACH_X * fw, lx0) * frame_w,
+                         (y0 - self.FACE_REACH_UP * fh) * frame_h,
+                         min(cx + self.FACE_REACH_X * fw, lx1) * frame_w,
+                         (y1 + self.FACE_REACH_DOWN * fh) * frame_h,
+                         frame_w, frame_h)
+
+    def record_full(self, ms):
+        self.full_passes += 1
+        self._since_full = 0
+        self._lost = False
+        if ms is not None:
+            self._full_ms.append(ms)
+
+    def record_roi(self, plan, found_players, ms, frame_w, frame_h):
+        """found_players: player yang tangannya ketemu di pass crop ini."""
+        self.roi_passes += 1
+        self._since_full += 1
+        self._roi_ms.append(ms)
+        self._roi_area.append(sum((x1 - x0) * (y1 - y0) for _, (x0, y0, x1, y1), _ in plan)
+                              / float(frame_w * frame_h))
+        tracked = [p for p, _, t in plan if t]
+        if any(p not in found_players for p in tracked):
+            # Tangan yang di-track hilang dari box-nya → cari ulang di full frame
+            self._lost = True
+        elif tracked:
+            # Pass yang cuma mencari di box wajah / lane bukan hit (all() dari
+            # list kosong selalu True)
+            self.roi_hits += 1
+
+    def stats(self):
+        full_p50, roi_p50 = _p50(self._full_ms), _p50(self._roi_ms)
+        saved = None
+        if full_p50 is not None and roi_p50 is not None:
+            # Estimasi: tiap pass crop menggantikan satu pass full frame
+            saved = round(self.roi_passes * (full_p50 - roi_p50), 1)
+        return {
+            "full_passes": self.full_passes,
+            "roi_passes": self.roi_passes,
+            "roi_hit_rate": round(self.roi_hits / self.roi_passes, 3) if self.roi_passes else None,
+            "roi_area_p50": round(float(np.percentile(self._roi_area, 50)), 3)
+            if self._roi_area else None,
+            "full_ms_p50": full_p50,
+            "roi_ms_p50": roi_p50,
+            "saved_ms": saved,
+        }
+
+
+def _clip_box(x0, y0, x1, y1, frame_w, frame_h):
+    x0, y0 = max(int(x0), 0), max(int(y0), 0)
+    x1, y1 = min(int(math.ceil(x1)), frame_w), min(int(math.ceil(y1)), frame_h)
+    return x0, y0, max(x1, x0 + 1), max(y1, y0 + 1)
+
+
+class FaceGate:
+    """
+    Throttle lobby face detection while readiness is stable.
+
+    The lobby is stable when every player's face_hold is either saturated
+    (ready, face seen continuously) or zero (nobody there). Then detection
+    runs only every `every` camera frames and the frames in between reuse
+    the last detected set, which leaves the hold counters where a full
+    run would have put them as long as nothing changes. Any change in the
+    detected set, or a player leaving the stable band, goes back to every
+    frame.
+    """
+
+    def __init__(self, hold_max, every=6):
+        self.hold_max = hold_max
+        self.every = every
+        self.last = set()
+        self._since = 0
+        self.runs = 0
+        self.skips = 0
+        self._ms = deque(maxlen=300)
+
+    def reset(self):
+        self.last = set()
+        self._since = 0
+
+    def should_run(self, face_hold):
+        stable = all(h in (0, self.hold_max) for h in face_hold.values())
+        self._since += 1
+        if not stable or self._since >= self.every:
+            return True
+        self.skips += 1
+        return False
+
+    def record(self, detected, ms):
+        self.runs += 1
+        if detected != self.last:
+            self._since = self.every   # set berubah → frame berikutnya dicek lagi
+        else:
+            self._since = 0
+        self.last = set(detected)
+        if ms is not None:
+            self._ms.append(ms)
+
+    def stats(self):
+        p50 = _p50(self._ms)
+        total = self.runs + self.skips
+        return {
+            "runs": self.runs,
+            "skips": self.skips,
+            "skip_rate": round(self.skips / total, 3) if total else None,
+            "face_ms_p50": p50,
+            "saved_ms": round(self.skips * p50, 1) if p50 is not None else None,
+        }
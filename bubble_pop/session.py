@@ -0,0 +1,367 @@
+"""
+Session recording and deterministic replay.
+
+A session is a folder:
+  meta.json    ukuran frame, seed, jumlah record, dtype
+  frames.bin   JPEG frame kamera (RGB yang sudah di-flip) disambung berurutan
+  frames.idx   record FRAME_DTYPE (seq, t, offset, length) per frame
+  hands.bin    record hand_dtype(max_hands) per hasil HandTracker
+  faces.bin    record FACE_DTYPE per hasil FaceTracker
+  updates.bin  record update_dtype(max_hands) per Game.update() saat PLAYING:
+               dt dan tangan yang dipakai, termasuk loop render tanpa frame
+               kamera baru (tangan hasil predict()). Replay menjalankan ulang
+               persis urutan ini, jadi skor dan tick sama dengan sesi live.
+
+Semua .idx / .bin selain frames.bin adalah array record fixed-size, jadi
+bisa langsung di-np.memmap tanpa parsing. t = detik sejak awal rekaman.
+"""
+import json
+import os
+import queue
+import threading
+
+import cv2
+import numpy as np
+
+from capture import Frame
+from hand_tracker import NUM_LANDMARKS, HandResult
+
+FORMAT_VERSION = 2
+# Versi 1 belum punya updates.bin; replay-nya melangkah per frame rekaman
+READ_VERSIONS = (1, 2)
+
+FRAME_DTYPE = np.dtype([("seq", "<i8"), ("t", "<f8"), ("offset", "<i8"), ("length", "<i4")])
+# players = bitmask player id (bit p = player p terdeteksi)
+FACE_DTYPE = np.dtype([("seq", "<i8"), ("t", "<f8"), ("players", "<u8")])
+
+
+def hand_dtype(max_hands):
+    return np.dtype([
+        ("seq", "<i8"), ("t", "<f8"), ("n", "<i4"),
+        ("players", "<i4", (max_hands,)),
+        ("handedness", "i1", (max_hands,)),
+        ("landmarks", "<f4", (max_hands, NUM_LANDMARKS, 3)),
+    ])
+
+
+def update_dtype(max_hands):
+    # seq = frame kamera terakhir saat update, dt = argumen Game.update()
+    return np.dtype([("dt", "<f8")] + hand_dtype(max_hands).descr)
+
+
+def _fill_hands(rec, hands, max_hands):
+    n = min(len(hands), max_hands)
+    rec["n"] = n
+    rec["players"][0, :n] = hands.players[:n]
+    rec["handedness"][0, :n] = hands.handedness[:n]
+    rec["landmarks"][0, :n] = hands.landmarks[:n]
+
+
+def _hand_result(rec, frame_w, frame_h, t_capture=None):
+    n = int(rec["n"])
+    return HandResult(
+        np.array(rec["landmarks"][:n], dtype=np.float32),
+        np.array(rec["players"][:n], dtype=np.int32),
+        np.array(rec["handedness"][:n], dtype=np.int8),
+        frame_w, frame_h, t_capture,
+    )
+
+
+class SessionRecorder:
+    """
+    Write camera frames and tracker outputs of a live session to a folder.
+
+    Landmark and face records are tiny and written straight away. JPEG
+    encoding of frames happens on a writer thread behind a bounded queue;
+    when it falls behind, frames are dropped (counted in frames_dropped)
+    rather than stalling the game loop.
+    """
+
+    def __init__(self, path, width, height, seed=None, record_frames=True,
+                 max_hands=8, jpeg_quality=90, queue_size=32, players=2):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.width = width
+        self.height = height
+        self.seed = seed
+        self.players = players
+        self.record_frames = record_frames
+        self.max_hands = max_hands
+        self.jpeg_quality = jpeg_quality
+        self._hand_dtype = hand_dtype(max_hands)
+        self._update_dtype = update_dtype(max_hands)
+        self._t0 = None
+
+        self._hands_f = open(os.path.join(path, "hands.bin"), "wb")
+        self._faces_f = open(os.path.join(path, "faces.bin"), "wb")
+        self._updates_f = open(os.path.join(path, "updates.bin"), "wb")
+        self.hands_written = 0
+        self.faces_written = 0
+        self.updates_written = 0
+
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        if record_frames:
+            self._frames_f = open(os.path.join(path, "frames.bin"), "wb")
+            self._idx_f = open(os.path.join(path, "frames.idx"), "wb")
+            self._thread = threading.Thread(target=self._write_frames, name="session-writer", daemon=True)
+            self._thread.start()
+
+    def _rel(self, t_capture):
+        if self._t0 is None:
+            self._t0 = t_capture
+        return t_capture - self._t0
+
+    def add_frame(self, frame):
+        t = self._rel(frame.t_capture)
+        if not self.record_frames:
+            return
+        try:
+            self._queue.put_nowait((frame.seq, t, frame.rgb))
+        except queue.Full:
+            self.frames_dropped += 1
+
+    def add_hands(self, seq, t_capture, hands):
+        rec = np.zeros(1, dtype=self._hand_dtype)
+        rec["seq"] = seq
+        rec["t"] = self._rel(t_capture)
+        _fill_hands(rec, hands, self.max_hands)
+        self._hands_f.write(rec.tobytes())
+        self.hands_written += 1
+
+    def add_update(self, seq, dt, hands):
+        """Satu panggilan Game.update(hands, dt), tiap loop render selama PLAYING."""
+        rec = np.zeros(1, dtype=self._update_dtype)
+        rec["seq"] = seq
+        # t = capture time tangan yang dipakai, -1 kalau tidak diketahui
+        rec["t"] = -1.0 if hands.t_capture is None else self._rel(hands.t_capture)
+        rec["dt"] = dt
+        _fill_hands(rec, hands, self.max_hands)
+        self._updates_f.write(rec.tobytes())
+        self.updates_written += 1
+
+    def add_faces(self, seq, t_capture, players):
+        rec = np.zeros(1, dtype=FACE_DTYPE)
+        rec["seq"] = seq
+        rec["t"] = self._rel(t_capture)
+        rec["players"] = sum(1 << p for p in players)
+        self._faces_f.write(rec.tobytes())
+        self.faces_written += 1
+
+    def _write_frames(self):
+        offset = 0
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            seq, t, rgb = item
+            ok, jpg = cv2.imencode(".jpg", cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR),
+                                   [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+            if not ok:
+                self.frames_dropped += 1
+                continue
+            data = jpg.tobytes()
+            self._frames_f.write(data)
+            rec = np.array([(seq, t, offset, len(data))], dtype=FRAME_DTYPE)
+            self._idx_f.write(rec.tobytes())
+            offset += len(data)
+            self.frames_written += 1
+
+    def close(self):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+            self._frames_f.close()
+            self._idx_f.close()
+        self._hands_f.close()
+        self._faces_f.close()
+        self._updates_f.close()
+
+        meta = {
+            "version": FORMAT_VERSION,
+            "width": self.width,
+            "height": self.height,
+            "seed": self.seed,
+            "players": self.players,
+            "max_hands": self.max_hands,
+            "frames": self.frames_written,
+            "frames_dropped": self.frames_dropped,
+            "hands": self.hands_written,
+            "faces": self.faces_written,
+            "updates": self.updates_written,
+        }
+        with open(os.path.join(self.path, "meta.json"), "w") as f:
+            json.dump(meta, f, indent=2)
+
+
+def _memmap(path, dtype):
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r")
+
+
+class SessionReader:
+    """Read-only view of a recorded session; record streams are memory-mapped."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "meta.json")) as f:
+            self.meta = json.load(f)
+        if self.meta.get("version") not in READ_VERSIONS:
+            raise ValueError(f"Format sesi tidak didukung: {self.meta.get('version')}")
+        self.width = self.meta["width"]
+        self.height = self.meta["height"]
+        self.seed = self.meta.get("seed")
+        # Sesi lama belum mencatat jumlah player, semuanya 2 player
+        self.players = self.meta.get("players", 2)
+
+        self.frames = _memmap(os.path.join(path, "frames.idx"), FRAME_DTYPE)
+        self.hands = _memmap(os.path.join(path, "hands.bin"), hand_dtype(self.meta["max_hands"]))
+        self.faces = _memmap(os.path.join(path, "faces.bin"), FACE_DTYPE)
+        self.updates = _memmap(os.path.join(path, "updates.bin"),
+                               update_dtype(self.meta["max_hands"]))
+        self._update_pos = 0
+        self._blob = None
+        if len(self.frames):
+            self._blob = np.memmap(os.path.join(path, "frames.bin"), dtype=np.uint8, mode="r")
+
+        self._hand_by_seq = {int(s): i for i, s in enumerate(self.hands["seq"])}
+        self._face_by_seq = {int(s): i for i, s in enumerate(self.faces["seq"])}
+        self._frame_by_seq = {int(s): i for i, s in enumerate(self.frames["seq"])}
+
+    def timeline(self):
+        """(seq, t) semua frame yang punya data apa pun, urut seq."""
+        seen = {}
+        for arr in (self.frames, self.hands, self.faces):
+            for seq, t in zip(arr["seq"].tolist(), arr["t"].tolist()):
+                seen.setdefault(seq, t)
+        return sorted(seen.items())
+
+    def frame_rgb(self, seq):
+        i = self._frame_by_seq.get(seq)
+        if i is None:
+            return None
+        rec = self.frames[i]
+        start, length = int(rec["offset"]), int(rec["length"])
+        bgr = cv2.imdecode(np.asarray(self._blob[start:start + length]), cv2.IMREAD_COLOR)
+        return cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+
+    def hands_for(self, seq, frame_w, frame_h, t_capture=None):
+        i = self._hand_by_seq.get(seq)
+        if i is None:
+            return None
+        return _hand_result(self.hands[i], frame_w, frame_h, t_capture)
+
+    @property
+    def has_updates(self):
+        """Sesi mencatat tiap Game.update() (versi 2); replay bisa persis sama dengan live."""
+        return len(self.updates) > 0
+
+    def next_update(self, seq, frame_w, frame_h):
+        """
+        (dt, HandResult) update berikutnya yang terjadi paling lambat di frame
+        seq, atau None. Dipanggil berulang: tiap record dikembalikan sekali,
+        berurutan.
+        """
+        if self._update_pos >= len(self.updates):
+            return None
+        rec = self.updates[self._update_pos]
+        if int(rec["seq"]) > seq:
+            return None
+        self._update_pos += 1
+        t = float(rec["t"])
+        return float(rec["dt"]), _hand_result(rec, frame_w, frame_h, t if t >= 0 else None)
+
+    def faces_for(self, seq):
+        i = self._face_by_seq.get(seq)
+        if i is None:
+            return None
+        mask = int(self.faces[i]["players"])
+        return {p for p in range(64) if mask >> p & 1}
+
+
+class ReplaySource:
+    """
+    CameraCapture stand-in that steps through a recorded session.
+
+    Every latest() call advances exactly one recorded frame, so the game
+    loop sees each frame as new no matter how fast it runs. Frame.t_capture
+    is the recorded session time; main() uses it as its clock in replay.
+    Sessions recorded without frames replay on a black background.
+    """
+
+    def __init__(self, reader):
+        self.reader = reader
+        self._timeline = reader.timeline()
+        self._pos = 0
+        self._blank = None
+        self._last_rgb = None
+        self.current_seq = None
+        self.finished = False
+
+    def start(self):
+        return self
+
+    def latest(self):
+        if self._pos >= len(self._timeline):
+            self.finished = True
+            return None
+        seq, t = self._timeline[self._pos]
+        self._pos += 1
+        self.current_seq = seq
+
+        rgb = self.reader.frame_rgb(seq)
+        if rgb is None:
+            # Frame tidak direkam (atau di-drop saat rekam): pakai frame terakhir
+            if self._last_rgb is None:
+                if self._blank is None:
+                    self._blank = np.zeros((self.reader.height, self.reader.width, 3), dtype=np.uint8)
+                rgb = self._blank
+            else:
+                rgb = self._last_rgb
+        self._last_rgb = rgb
+        return Frame(rgb, seq, t)
+
+    def stats(self):
+        return {"replay_pos": self._pos, "replay_len": len(self._timeline)}
+
+    def stop(self):
+        pass
+
+
+class ReplayHandTracker:
+    """HandTracker / PredictiveHandTracker stand-in returning recorded results."""
+
+    def __init__(self, reader, source):
+        self.reader = reader
+        self.source = source
+        self._last = HandResult.empty(reader.width, reader.height)
+
+    def process(self, frame_rgb, frame_w, frame_h, t_capture=None):
+        hands = self.reader.hands_for(self.source.current_seq, frame_w, frame_h, t_capture)
+        self._last = hands if hands is not None else HandResult.empty(frame_w, frame_h, t_capture)
+        return self._last
+
+    def predict(self):
+        return self._last
+
+    def close(self):
+        pass
+
+
+class ReplayFaceTracker:
+    """FaceTracker stand-in returning recorded player sets."""
+
+    def __init__(self, reader, source):
+        self.reader = reader
+        self.source = source
+
+    def detect_players(self, frame_rgb, frame_w, frame_h):
+        detected = self.reader.faces_for(self.source.current_seq)
+        return detected if detected is not None else set()
+
+    def close(self):
+        pass
@@ -0,0 +1,216 @@
+"""
+Capture sources for CameraCapture.
+
+Semua source punya interface kecil yang sama dengan cv2.VideoCapture yang
+dipakai CameraCapture: read() -> (ok, frame_bgr), get(prop), set(prop, value),
+release(). Ditambah:
+  info       dict hasil negosiasi (backend, format, resolusi, FPS)
+  finished   True kalau source habis (file / image sequence tanpa loop)
+
+open_source(spec) memilih source dari spec: index kamera (int / "0"),
+folder atau glob gambar, atau path file video.
+"""
+import glob
+import os
+import sys
+import time
+
+import cv2
+
+
+def fourcc_to_str(value):
+    value = int(value)
+    if value <= 0:
+        return None
+    return "".join(chr((value >> (8 * i)) & 0xFF) for i in range(4)).strip("\0") or None
+
+
+class CameraSource:
+    """
+    Live webcam with low-latency negotiation.
+
+    On Linux the V4L2 backend is used directly. MJPG is requested before
+    size and FPS (V4L2 only offers high frame rates at HD sizes in MJPG; raw
+    YUYV usually drops to 5-10 FPS) and the driver buffer is shrunk to one
+    frame. What the driver actually accepted ends up in info, including an
+    FPS measured over the first probe_frames reads.
+    """
+
+    def __init__(self, index=0, width=1280, height=720, fps=30, fourcc="MJPG", probe_frames=15):
+        backend = cv2.CAP_V4L2 if sys.platform.startswith("linux") else cv2.CAP_ANY
+        self.cap = cv2.VideoCapture(index, backend)
+        if not self.cap.isOpened() and backend != cv2.CAP_ANY:
+            self.cap = cv2.VideoCapture(index)
+        self.finished = False
+        if not self.cap.isOpened():
+            raise RuntimeError(f"Tidak bisa buka kamera index {index}")
+
+        # Urutan penting di V4L2: format dulu, baru ukuran lalu FPS
+        if fourcc:
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        if fps:
+            self.cap.set(cv2.CAP_PROP_FPS, fps)
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+        self.info = {
+            "source": f"camera:{index}",
+            "backend": self.cap.getBackendName(),
+            "format": fourcc_to_str(self.cap.get(cv2.CAP_PROP_FOURCC)),
+            "requested_format": fourcc,
+            "width": int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            "height": int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            "driver_fps": round(self.cap.get(cv2.CAP_PROP_FPS), 1),
+            "requested_fps": fps,
+            "buffersize": int(self.cap.get(cv2.CAP_PROP_BUFFERSIZE)),
+            "measured_fps": self._probe_fps(probe_frames),
+        }
+
+    def _probe_fps(self, frames):
+        # Driver sering bilang 30 padahal jalan 15 (auto exposure, YUYV, USB 2)
+        if frames < 2:
+            return None
+        stamps = []
+        for _ in range(frames):
+            ret, _ = self.cap.read()
+            if ret:
+                stamps.append(time.perf_counter())
+        if len(stamps) < 2 or stamps[-1] == stamps[0]:
+            return None
+        return round((len(stamps) - 1) / (stamps[-1] - stamps[0]), 1)
+
+    def read(self):
+        return self.cap.read()
+
+    def get(self, prop):
+        return self.cap.get(prop)
+
+    def set(self, prop, value):
+        return self.cap.set(prop, value)
+
+    def release(self):
+        self.cap.release()
+
+
+class _PacedSource:
+    """Shared pacing for file sources: hand out frames no faster than fps, like a camera."""
+
+    def __init__(self, fps, realtime):
+        self.fps = fps
+        self.realtime = realtime
+        self.finished = False
+        self._next_t = None
+
+    def _pace(self):
+        if not self.realtime or not self.fps:
+            return
+        now = time.perf_counter()
+        if self._next_t is None or now - self._next_t > 1.0:
+            self._next_t = now
+        elif self._next_t > now:
+            time.sleep(self._next_t - now)
+        self._next_t += 1.0 / self.fps
+
+    def get(self, prop):
+        # Tidak ada timestamp buffer driver, CameraCapture menganggap None
+        return 0.0
+
+    def set(self, prop, value):
+        return False
+
+
+class VideoFileSource(_PacedSource):
+    """Video file as a camera stand-in, optionally looped."""
+
+    def __init__(self, path, loop=True, realtime=True):
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise RuntimeError(f"Tidak bisa buka video {path}")
+        super().__init__(self.cap.get(cv2.CAP_PROP_FPS) or 30.0, realtime)
+        self.loop = loop
+        self.info = {
+            "source": f"file:{path}",
+            "backend": self.cap.getBackendName(),
+            "format": fourcc_to_str(self.cap.get(cv2.CAP_PROP_FOURCC)),
+            "width": int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            "height": int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            "driver_fps": round(self.fps, 1),
+            "frames": int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT)),
+            "loop": loop,
+        }
+
+    def read(self):
+        if self.finished:
+            return False, None
+        self._pace()
+        ret, frame = self.cap.read()
+        if not ret and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read()
+        if not ret:
+            self.finished = True
+        return ret, frame
+
+    def release(self):
+        self.cap.release()
+
+
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+class ImageSequenceSource(_PacedSource):
+    """Folder or glob of images played back in name order at a fixed fps."""
+
+    def __init__(self, pattern, fps=30.0, loop=True, realtime=True):
+        if os.path.isdir(pattern):
+            paths = [os.path.join(pattern, name) for name in os.listdir(pattern)
+                     if name.lower().endswith(IMAGE_EXTS)]
+        else:
+            paths = glob.glob(pattern)
+        self.paths = sorted(paths)
+        if not self.paths:
+            raise RuntimeError(f"Tidak ada gambar di {pattern}")
+        super().__init__(fps, realtime)
+        self.loop = loop
+        self._i = 0
+        first = cv2.imread(self.paths[0])
+        if first is None:
+            raise RuntimeError(f"Tidak bisa baca {self.paths[0]}")
+        h, w = first.shape[:2]
+        self.info = {
+            "source": f"images:{pattern}",
+            "backend": "imread",
+            "format": os.path.splitext(self.paths[0])[1].lstrip(".").upper(),
+            "width": w,
+            "height": h,
+            "driver_fps": fps,
+            "frames": len(self.paths),
+            "loop": loop,
+        }
+
+    def read(self):
+        if self._i >= len(self.paths):
+            if not self.loop:
+                self.finished = True
+                return False, None
+            self._i = 0
+        self._pace()
+        frame = cv2.imread(self.paths[self._i])
+        self._i += 1
+        return frame is not None, frame
+
+    def release(self):
+        pass
+
+
+def open_source(spec, width=1280, height=720, fps=30, fourcc="MJPG", loop=True):
+    """Buka source dari spec: index kamera, folder / glob gambar, atau file video."""
+    if isinstance(spec, int) or str(spec).isdigit():
+        return CameraSource(int(spec), width, height, fps, fourcc)
+    spec = str(spec)
+    # Karakter wildcard glob (glob.has_magic bukan API publik)
+    is_glob = any(c in spec for c in "*?[")
+    if os.path.isdir(spec) or is_glob or spec.lower().endswith(IMAGE_EXTS):
+        return ImageSequenceSource(spec, fps=fps or 30.0, loop=loop)
+    return VideoFileSource(spec, loop=loop)
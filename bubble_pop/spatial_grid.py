@@ -0,0 +1,46 @@
+import math
+
+import numpy as np
+
+
+class SpatialGrid:
+    """
+    Uniform grid index over points (bubble centers), rebuilt per tick.
+
+    build() sorts point indices by cell id (row-major) and records where
+    each cell starts, so all cells of one grid row inside a query box are a
+    single contiguous slice. Points outside the screen are clamped into the
+    border cells; queries clamp the same way, so nothing is missed.
+    """
+
+    def __init__(self, width, height, cell_size):
+        self.cell_size = float(cell_size)
+        self.cols = max(1, math.ceil(width / cell_size))
+        self.rows = max(1, math.ceil(height / cell_size))
+        self._order = np.empty(0, dtype=np.intp)
+        self._starts = [0] * (self.cols * self.rows + 1)
+
+    def _cell_xy(self, x, y):
+        cx = np.clip(np.floor_divide(x, self.cell_size), 0, self.cols - 1).astype(np.intp)
+        cy = np.clip(np.floor_divide(y, self.cell_size), 0, self.rows - 1).astype(np.intp)
+        return cx, cy
+
+    def build(self, x, y):
+        cx, cy = self._cell_xy(x, y)
+        cell = cy * self.cols + cx
+        self._order = np.argsort(cell, kind="stable")
+        self._starts = np.searchsorted(cell[self._order],
+                                       np.arange(self.cols * self.rows + 1)).tolist()
+
+    def query(self, x0, y0, x1, y1):
+        """Index semua titik di cell yang bersinggungan dengan kotak [x0, x1] x [y0, y1]."""
+        # Scalar Python, jauh lebih murah dari ufunc numpy untuk satu kotak
+        cs, cols = self.cell_size, self.cols
+        cx0 = min(max(int(min(x0, x1) // cs), 0), cols - 1)
+        cx1 = min(max(int(max(x0, x1) // cs), 0), cols - 1)
+        cy0 = min(max(int(min(y0, y1) // cs), 0), self.rows - 1)
+        cy1 = min(max(int(max(y0, y1) // cs), 0), self.rows - 1)
+        starts = self._starts
+        parts = [self._order[starts[row * cols + cx0]:starts[row * cols + cx1 + 1]]
+                 for row in range(cy0, cy1 + 1)]
+        return np.concatenate(parts) if len(parts) > 1 else parts[0]
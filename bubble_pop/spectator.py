@@ -0,0 +1,586 @@
+"""
+Spectator server: siarkan state game ke penonton lewat WebSocket.
+
+  python main.py --spectate 8765                  # game + server di 127.0.0.1:8765
+  python main.py --spectate 8765 --spectate-host 0.0.0.0   # buka ke jaringan
+  python spectator.py --connect 127.0.0.1:8765     # penonton stand-in, print statistik
+
+Tiap snapshot (bubble, partikel, skor, cursor fingertip) di-encode biner
+dan dikirim sebagai satu pesan WebSocket binary. Penonton membalas ack
+berisi tick yang sudah di-decode; snapshot berikutnya untuk penonton itu
+berupa delta terhadap tick yang terakhir di-ack. Penonton yang belum ack,
+atau ack-nya sudah keluar dari history server, dapat keyframe.
+
+Encode dilakukan sekali per base tick yang berbeda, bukan per penonton:
+penonton yang ack tick yang sama berbagi byte pesan yang sama persis,
+jadi CPU server hampir tidak naik saat penonton bertambah. Penonton yang
+buffer kirimnya penuh dilewati (ack-nya tidak maju, jadi delta berikutnya
+tetap benar).
+
+Format (little-endian):
+  header   magic "BP", version u8, kind u8 (0 key / 1 delta), tick u32,
+           base_tick u32, state u8, ready u8 (bitmask player), remaining u16
+  scores   u8 n, n x (player u8, score i32)
+  palette  u8 n, n x rgb u8
+  cursors  u8 n, n x (player u8, 5 fingertip x/y i16)
+  particles u16 n, n x (x i16, y i16, radius u8, life u8, color u8)
+  bubbles  key:   u16 n, n x (id u32, x i16, y i16, radius u8, alpha u8)
+           delta: u16 n_removed, n x base index u16
+                  u16 n_moved,   n x (base index u16, dx i8, dy i8)
+                  u16 n_upsert,  n x bubble (baru, atau geser > 127 px)
+Partikel selalu dikirim penuh: umurnya < 1 detik dan hampir semuanya
+bergerak tiap tick, delta tidak menghemat apa-apa.
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict, deque, namedtuple
+
+import numpy as np
+
+PROTO_MAGIC = b"BP"
+PROTO_VERSION = 1
+KIND_KEY = 0
+KIND_DELTA = 1
+STATE_NAMES = ("LOBBY", "COUNTDOWN", "PLAYING", "GAME_OVER")
+
+# Snapshot yang disimpan untuk jadi base delta (~2 detik di 30 Hz)
+SPECTATOR_HISTORY = 64
+# Penonton dengan data belum terkirim lebih dari ini dilewati (byte)
+SPECTATOR_MAX_BUFFER = 256 * 1024
+
+HEADER = struct.Struct("<2sBBIIBBH")
+U8 = struct.Struct("<B")
+U16 = struct.Struct("<H")
+U32 = struct.Struct("<I")
+SCORE_DTYPE = np.dtype([("player", "u1"), ("score", "<i4")])
+CURSOR_DTYPE = np.dtype([("player", "u1"), ("tips", "<i2", (5, 2))])
+PARTICLE_DTYPE = np.dtype([("x", "<i2"), ("y", "<i2"), ("radius", "u1"),
+                           ("life", "u1"), ("color", "u1")])
+BUBBLE_DTYPE = np.dtype([("id", "<u4"), ("x", "<i2"), ("y", "<i2"),
+                         ("radius", "u1"), ("alpha", "u1")])
+MOVE_DTYPE = np.dtype([("idx", "<u2"), ("dx", "i1"), ("dy", "i1")])
+
+Snapshot = namedtuple("Snapshot", "tick state ready remaining scores palette cursors particles bubbles")
+
+
+def capture_snapshot(tick, game, state, hands=None, ready=()):
+    """Salin state game yang terlihat penonton ke array wire-format."""
+    scores = np.array(sorted(game.scores.items()), dtype=np.int64)
+    score_arr = np.empty(len(scores), SCORE_DTYPE)
+    if len(scores):
+        score_arr["player"], score_arr["score"] = scores[:, 0], scores[:, 1]
+
+    cursors = np.empty(0, CURSOR_DTYPE)
+    if hands is not None and len(hands):
+        tips = hands.fingertips
+        cursors = np.empty(len(hands), CURSOR_DTYPE)
+        cursors["player"] = hands.players
+        cursors["tips"][:, :tips.shape[1]] = np.rint(tips)
+        cursors["tips"][:, tips.shape[1]:] = cursors["tips"][:, :1]
+
+    ps = game.particles
+    n = ps.n
+    particles = np.empty(n, PARTICLE_DTYPE)
+    particles["x"] = np.rint(ps.x[:n])
+    particles["y"] = np.rint(ps.y[:n])
+    particles["radius"] = ps.radius[:n]
+    particles["life"] = np.clip(ps.life[:n] * 255, 0, 255)
+    particles["color"] = ps.color_idx[:n]
+
+    bf = game.bubbles
+    n = bf.n
+    bubbles = np.empty(n, BUBBLE_DTYPE)
+    bubbles["id"] = bf.id[:n]
+    bubbles["x"] = np.rint(bf.x[:n])
+    bubbles["y"] = np.rint(bf.y[:n])
+    bubbles["radius"] = bf.radius[:n]
+    bubbles["alpha"] = bf.alpha[:n]
+
+    ready_mask = 0
+    for p in ready:
+        ready_mask |= 1 << (p - 1)
+    return Snapshot(tick, state, ready_mask, game.remaining, score_arr,
+                    ps.colors, cursors, particles, bubbles)
+
+
+# ── Encode / decode ──────────────────────────────────────────────────────────
+def encode_snapshot(snap, base=None):
+    """bytes satu snapshot; base=None -> keyframe, selain itu delta terhadap base."""
+    kind = KIND_KEY if base is None else KIND_DELTA
+    parts = [
+        HEADER.pack(PROTO_MAGIC, PROTO_VERSION, kind, snap.tick,
+                    0 if base is None else base.tick, STATE_NAMES.index(snap.state),
+                    snap.ready, min(snap.remaining, 0xFFFF)),
+        U8.pack(len(snap.scores)), snap.scores.tobytes(),
+        U8.pack(len(snap.palette)), bytes(c for rgb in snap.palette for c in rgb),
+        U8.pack(len(snap.cursors)), snap.cursors.tobytes(),
+        U16.pack(len(snap.particles)), snap.particles.tobytes(),
+    ]
+    if base is None:
+        parts += [U16.pack(len(snap.bubbles)), snap.bubbles.tobytes()]
+    else:
+        parts += _bubble_delta(snap.bubbles, base.bubbles)
+    return b"".join(parts)
+
+
+def _bubble_delta(cur, old):
+    # id di kedua array urut naik (BubbleField.compact menjaga urutan), jadi
+    # pasangan bubble yang sama dicari dengan searchsorted
+    if len(old):
+        pos = np.minimum(np.searchsorted(old["id"], cur["id"]), len(old) - 1)
+        present = old["id"][pos] == cur["id"]
+    else:
+        pos = np.zeros(len(cur), np.intp)
+        present = np.zeros(len(cur), bool)
+    matched = np.zeros(len(old), bool)
+    matched[pos[present]] = True
+    removed = np.flatnonzero(~matched).astype("<u2")
+
+    dx = cur["x"].astype(np.int32) - old["x"][pos] if len(old) else np.zeros(len(cur), np.int32)
+    dy = cur["y"].astype(np.int32) - old["y"][pos] if len(old) else np.zeros(len(cur), np.int32)
+    small = present & (np.abs(dx) <= 127) & (np.abs(dy) <= 127)
+    if len(old):
+        small &= (cur["radius"] == old["radius"][pos]) & (cur["alpha"] == old["alpha"][pos])
+    moved = small & ((dx != 0) | (dy != 0))
+    moves = np.empty(int(np.count_nonzero(moved)), MOVE_DTYPE)
+    moves["idx"], moves["dx"], moves["dy"] = pos[moved], dx[moved], dy[moved]
+    upserts = cur[~small]
+    return [U16.pack(len(removed)), removed.tobytes(),
+            U16.pack(len(moves)), moves.tobytes(),
+            U16.pack(len(upserts)), upserts.tobytes()]
+
+
+class _Reader:
+    def __init__(self, data, offset=0):
+        self.data = data
+        self.offset = offset
+
+    def unpack(self, st):
+        value = st.unpack_from(self.data, self.offset)[0]
+        self.offset += st.size
+        return value
+
+    def array(self, dtype, count):
+        arr = np.frombuffer(self.data, dtype, count, self.offset)
+        self.offset += dtype.itemsize * count
+        return arr
+
+    def counted(self, dtype, st=U8):
+        return self.array(dtype, self.unpack(st))
+
+
+def decode_snapshot(data, bases):
+    """Snapshot dari bytes; bases: tick -> Snapshot yang sudah di-decode (untuk delta)."""
+    magic, version, kind, tick, base_tick, state, ready, remaining = HEADER.unpack_from(data)
+    if magic != PROTO_MAGIC or version != PROTO_VERSION:
+        raise ValueError(f"Bukan snapshot Bubble Pop v{PROTO_VERSION}")
+    r = _Reader(data, HEADER.size)
+    scores = r.counted(SCORE_DTYPE)
+    rgb = r.array(np.dtype("u1"), 3 * r.unpack(U8)).reshape(-1, 3)
+    palette = tuple(tuple(c) for c in rgb.tolist())
+    cursors = r.counted(CURSOR_DTYPE)
+    particles = r.counted(PARTICLE_DTYPE, U16)
+
+    if kind == KIND_KEY:
+        bubbles = r.counted(BUBBLE_DTYPE, U16).copy()
+    else:
+        base = bases.get(base_tick)
+        if base is None:
+            raise KeyError(f"Base tick {base_tick} tidak ada")
+        removed = r.counted(np.dtype("<u2"), U16)
+        moves = r.counted(MOVE_DTYPE, U16)
+        upserts = r.counted(BUBBLE_DTYPE, U16)
+        bubbles = base.bubbles.copy()
+        bubbles["x"][moves["idx"]] += moves["dx"]
+        bubbles["y"][moves["idx"]] += moves["dy"]
+        keep = np.ones(len(bubbles), bool)
+        keep[removed] = False
+        keep &= ~np.isin(bubbles["id"], upserts["id"])
+        bubbles = np.concatenate([bubbles[keep], upserts])
+        bubbles = bubbles[np.argsort(bubbles["id"], kind="stable")]
+    return Snapshot(tick, STATE_NAMES[state], ready, remaining, scores, palette,
+                    cursors, particles, bubbles)
+
+
+# ── WebSocket (RFC 6455, cukup untuk pesan binary kecil) ─────────────────────
+_WS_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+OP_BINARY, OP_CLOSE, OP_PING, OP_PONG = 0x2, 0x8, 0x9, 0xA
+# Pesan dari penonton cuma ack / ping, yang lebih besar dianggap rusak
+MAX_CLIENT_MESSAGE = 1024
+
+
+def _ws_accept(key):
+    return base64.b64encode(hashlib.sha1(key.encode() + _WS_GUID).digest()).decode()
+
+
+def ws_frame(opcode, payload, mask=False):
+    n = len(payload)
+    head = bytearray([0x80 | opcode])
+    mask_bit = 0x80 if mask else 0
+    if n < 126:
+        head.append(mask_bit | n)
+    elif n < 1 << 16:
+        head.append(mask_bit | 126)
+        head += struct.pack(">H", n)
+    else:
+        head.append(mask_bit | 127)
+        head += struct.pack(">Q", n)
+    if mask:
+        key = os.urandom(4)
+        head += key
+        payload = _unmask(payload, key)
+    return bytes(head) + payload
+
+
+def _unmask(payload, key):
+    arr = np.frombuffer(payload, np.uint8)
+    return (arr ^ np.resize(np.frombuffer(key, np.uint8), len(arr))).tobytes()
+
+
+async def read_frame(reader, max_size=None):
+    """(opcode, payload) satu frame WebSocket."""
+    b0, b1 = await reader.readexactly(2)
+    n = b1 & 0x7F
+    if n == 126:
+        n = struct.unpack(">H", await reader.readexactly(2))[0]
+    elif n == 127:
+        n = struct.unpack(">Q", await reader.readexactly(8))[0]
+    if max_size is not None and n > max_size:
+        raise ValueError(f"Pesan WebSocket terlalu besar ({n} byte)")
+    key = await reader.readexactly(4) if b1 & 0x80 else None
+    payload = await reader.readexactly(n)
+    if key:
+        payload = _unmask(payload, key)
+    return b0 & 0x0F, payload
+
+
+async def _read_http_head(reader):
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            k, v = line.split(":", 1)
+            headers[k.strip().lower()] = v.strip()
+    return lines[0], headers
+
+
+# ── Server ───────────────────────────────────────────────────────────────────
+class _Spectator:
+    def __init__(self, writer):
+        self.writer = writer
+        self.task = asyncio.current_task()
+        self.acked = None
+        self.bytes_sent = 0
+        self.skipped = 0
+
+
+class SpectatorServer:
+    """
+    Broadcast game snapshots to WebSocket spectators from a background thread.
+
+    publish() is called from the game loop: it copies the visible state
+    into a Snapshot and hands it to the asyncio loop, keeping only the
+    newest one if the loop has not caught up yet. Each broadcast encodes
+    one payload per distinct acked base tick and writes the same bytes to
+    every spectator sharing that base.
+
+    The server binds to localhost unless `host` says otherwise (e.g.
+    "0.0.0.0" to accept spectators from other machines).
+    """
+
+    def __init__(self, host="127.0.0.1", port=8765, history=SPECTATOR_HISTORY,
+                 max_buffer=SPECTATOR_MAX_BUFFER):
+        self.host = host
+        self.port = port
+        self.history = history
+        self.max_buffer = max_buffer
+        self.tick = 0
+        self._history = OrderedDict()
+        self._clients = set()
+        self._pending = None
+        self._lock = threading.Lock()
+        self._loop = None
+        self._stop = None
+        self._started = threading.Event()
+        self._thread = None
+        self.error = None
+
+        self.snapshots = 0
+        self.keyframes = 0
+        self.deltas = 0
+        self.bytes_sent = 0
+        self.messages_sent = 0
+        self.skipped_slow = 0
+        self.connections = 0
+        self._encode_ms = deque(maxlen=300)
+        self._broadcast_ms = deque(maxlen=300)   # satu snapshot ke semua penonton
+        self._payload_bytes = {KIND_KEY: deque(maxlen=300), KIND_DELTA: deque(maxlen=300)}
+
+    def start(self):
+        self._thread = threading.Thread(target=lambda: asyncio.run(self._serve()),
+                                        name="spectator", daemon=True)
+        self._thread.start()
+        self._started.wait()
+        if self.error:
+            raise self.error
+        return self
+
+    async def _serve(self):
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        try:
+            server = await asyncio.start_server(self._handle, self.host, self.port)
+        except OSError as e:
+            self.error = e
+            self._started.set()
+            return
+        self.port = server.sockets[0].getsockname()[1]
+        self._started.set()
+        async with server:
+            await self._stop.wait()
+            # Tutup rapi dan tunggu handler selesai, jangan biarkan di-cancel asyncio.run
+            for client in list(self._clients):
+                client.writer.write(ws_frame(OP_CLOSE, b"\x03\xe9"))
+                client.writer.close()
+            tasks = [c.task for c in self._clients]
+            if tasks:
+                await asyncio.wait(tasks, timeout=1.0)
+
+    @property
+    def clients(self):
+        return len(self._clients)
+
+    # ── Game loop side ──────────────────────────────────────────────────────
+    def publish(self, game, state, hands=None, ready=()):
+        if self._loop is None or not self._clients:
+            return   # tanpa penonton tidak perlu salin state
+        self.tick += 1
+        snap = capture_snapshot(self.tick, game, state, hands, ready)
+        with self._lock:
+            scheduled = self._pending is not None
+            self._pending = snap
+        if not scheduled:
+            self._loop.call_soon_threadsafe(self._broadcast)
+
+    # ── Asyncio loop side ───────────────────────────────────────────────────
+    def _broadcast(self):
+        with self._lock:
+            snap, self._pending = self._pending, None
+        if snap is None:
+            return
+        t_start = time.perf_counter()
+        base_snaps = self._history
+        base_snaps[snap.tick] = snap
+        while len(base_snaps) > self.history:
+            base_snaps.popitem(last=False)
+        self.snapshots += 1
+
+        framed = {}   # base tick -> frame WebSocket siap kirim
+        for client in list(self._clients):
+            if client.writer.transport.get_write_buffer_size() > self.max_buffer:
+                client.skipped += 1
+                self.skipped_slow += 1
+                continue
+            base = client.acked if client.acked in base_snaps else None
+            data = framed.get(base)
+            if data is None:
+                t0 = time.perf_counter()
+                payload = encode_snapshot(snap, None if base is None else base_snaps[base])
+                data = framed[base] = ws_frame(OP_BINARY, payload)
+                self._encode_ms.append((time.perf_counter() - t0) * 1000.0)
+                kind = KIND_KEY if base is None else KIND_DELTA
+                self._payload_bytes[kind].append(len(payload))
+                if kind == KIND_KEY:
+                    self.keyframes += 1
+                else:
+                    self.deltas += 1
+            client.writer.write(data)
+            client.bytes_sent += len(data)
+            self.bytes_sent += len(data)
+            self.messages_sent += 1
+        self._broadcast_ms.append((time.perf_counter() - t_start) * 1000.0)
+
+    async def _handle(self, reader, writer):
+        try:
+            request, headers = await _read_http_head(reader)
+            key = headers.get("sec-websocket-key")
+            if not request.startswith("GET ") or headers.get("upgrade", "").lower() != "websocket" \
+                    or not key:
+                writer.write(b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\n\r\n")
+                await writer.drain()
+                return
+            writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n"
+                          "Connection: Upgrade\r\n"
+                          f"Sec-WebSocket-Accept: {_ws_accept(key)}\r\n\r\n").encode())
+            await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+
+        client = _Spectator(writer)
+        self._clients.add(client)
+        self.connections += 1
+        try:
+            while True:
+                opcode, payload = await read_frame(reader, MAX_CLIENT_MESSAGE)
+                if opcode == OP_BINARY and len(payload) == U32.size:
+                    tick = U32.unpack(payload)[0]
+                    if client.acked is None or tick > client.acked:
+                        client.acked = tick
+                elif opcode == OP_PING:
+                    writer.write(ws_frame(OP_PONG, payload))
+                elif opcode == OP_CLOSE:
+                    writer.write(ws_frame(OP_CLOSE, payload[:2]))
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            self._clients.discard(client)
+            writer.close()
+
+    def stats(self):
+        enc, bc = self._encode_ms, self._broadcast_ms
+        key, delta = self._payload_bytes[KIND_KEY], self._payload_bytes[KIND_DELTA]
+        return {
+            "clients": self.clients,
+            "snapshots": self.snapshots,
+            "keyframes": self.keyframes,
+            "deltas": self.deltas,
+            "encodes_per_snapshot": round((self.keyframes + self.deltas) / self.snapshots, 2)
+            if self.snapshots else None,
+            "encode_ms_p50": round(float(np.percentile(enc, 50)), 3) if enc else None,
+            "broadcast_ms_p50": round(float(np.percentile(bc, 50)), 3) if bc else None,
+            "key_bytes_p50": int(np.percentile(key, 50)) if key else None,
+            "delta_bytes_p50": int(np.percentile(delta, 50)) if delta else None,
+            "bytes_sent": self.bytes_sent,
+            "skipped_slow": self.skipped_slow,
+        }
+
+    def close(self):
+        if self._loop is not None and self._stop is not None:
+            self._loop.call_soon_threadsafe(self._stop.set)
+        if self._thread is not None:
+            self._thread.join(5.0)
+
+
+# ── Penonton stand-in ────────────────────────────────────────────────────────
+class SpectatorClient:
+    """
+    Minimal asyncio spectator used for testing and benchmarking.
+
+    Decodes every snapshot against its own history of decoded states and
+    acks it, exactly like a real viewer would; `state` is the newest
+    reconstructed Snapshot.
+    """
+
+    def __init__(self, host, port, ack=True, keep=SPECTATOR_HISTORY):
+        self.host = host
+        self.port = port
+        self.ack = ack
+        self.keep = keep
+        self.state = None
+        self._bases = OrderedDict()
+        self._reader = self._writer = None
+        self.messages = 0
+        self.bytes_received = 0
+        self.keyframes = 0
+        self.deltas = 0
+
+    async def connect(self):
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        key = base64.b64encode(os.urandom(16)).decode()
+        self._writer.write((f"GET / HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+                            "Upgrade: websocket\r\nConnection: Upgrade\r\n"
+                            f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n").encode())
+        status, headers = await _read_http_head(self._reader)
+        if " 101 " not in status or headers.get("sec-websocket-accept") != _ws_accept(key):
+            raise ConnectionError(f"Handshake WebSocket gagal: {status}")
+        return self
+
+    async def run(self, duration=None):
+        """Terima snapshot sampai koneksi ditutup atau `duration` detik lewat."""
+        try:
+            await asyncio.wait_for(self._receive(), duration)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _receive(self):
+        while True:
+            try:
+                opcode, payload = await read_frame(self._reader)
+            except (asyncio.IncompleteReadError, ConnectionError):
+                return
+            if opcode == OP_CLOSE:
+                return
+            if opcode != OP_BINARY:
+                continue
+            self.on_message(payload)
+
+    def on_message(self, payload):
+        snap = decode_snapshot(payload, self._bases)
+        self.messages += 1
+        self.bytes_received += len(payload)
+        if payload[3] == KIND_KEY:
+            self.keyframes += 1
+        else:
+            self.deltas += 1
+        self.state = snap
+        self._bases[snap.tick] = snap
+        while len(self._bases) > self.keep:
+            self._bases.popitem(last=False)
+        if self.ack:
+            self._writer.write(ws_frame(OP_BINARY, U32.pack(snap.tick), mask=True))
+
+    async def close(self):
+        if self._writer is not None:
+            try:
+                self._writer.write(ws_frame(OP_CLOSE, b"\x03\xe8", mask=True))
+                await self._writer.drain()
+            except ConnectionError:
+                pass
+            self._writer.close()
+
+    def stats(self):
+        return {"messages": self.messages, "bytes": self.bytes_received,
+                "keyframes": self.keyframes, "deltas": self.deltas,
+                "bytes_per_message": round(self.bytes_received / self.messages, 1)
+                if self.messages else None,
+                "tick": self.state.tick if self.state else None}
+
+
+async def _watch(host, port, secs):
+    client = await SpectatorClient(host, port).connect()
+    t0 = time.perf_counter()
+    while secs is None or time.perf_counter() - t0 < secs:
+        await client.run(duration=5.0)
+        s = client.state
+        if s is not None:
+            scores = {int(p): int(v) for p, v in s.scores}
+            print(f"[INFO] tick {s.tick} {s.state} skor {scores} bubble {len(s.bubbles)} "
+                  f"partikel {len(s.particles)} cursor {len(s.cursors)} | {client.stats()}")
+        if client._reader.at_eof():
+            break
+    await client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bubble Pop! penonton stand-in")
+    parser.add_argument("--connect", default="127.0.0.1:8765", metavar="HOST:PORT")
+    parser.add_argument("--secs", type=float, help="berhenti setelah N detik")
+    args = parser.parse_args()
+    host, port = args.connect.rsplit(":", 1)
+    try:
+        asyncio.run(_watch(host, int(port), args.secs))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+from collections import OrderedDict
+
+import pygame
+
+
+class SpriteCache:
+    """
+    Bounded LRU cache of pre-rendered surfaces.
+
+    get(key, build) returns the cached surface for key, or calls build() once
+    and stores the result. When the cache is full the least recently used
+    surface is evicted.
+    """
+
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, build):
+        surf = self._items.get(key)
+        if surf is not None:
+            self._items.move_to_end(key)
+            self.hits += 1
+            return surf
+
+        self.misses += 1
+        surf = build()
+        self._items[key] = surf
+        if len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+        return surf
+
+    def clear(self):
+        self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+
+# Alpha bubble dibulatkan ke kelipatan ini supaya jumlah sprite tetap kecil
+BUBBLE_ALPHA_STEP = 4
+
+_bubble_cache = SpriteCache(maxsize=512)
+
+
+def _render_bubble(radius, alpha):
+    size = radius * 2 + 4
+    surf = pygame.Surface((size, size), pygame.SRCALPHA)
+    cx = cy = radius + 2
+
+    pygame.draw.circle(surf, (255, 255, 255, alpha // 4), (cx, cy), radius)
+    pygame.draw.circle(surf, (255, 255, 255, alpha), (cx, cy), radius, 2)
+    glint_x = cx - radius // 3
+    glint_y = cy - radius // 3
+    pygame.draw.circle(surf, (255, 255, 255, alpha), (glint_x, glint_y), radius // 5)
+    return surf
+
+
+def bubble_sprite(radius, alpha):
+    """Sprite bubble (lingkaran isi, outline, glint) dari cache."""
+    alpha -= alpha % BUBBLE_ALPHA_STEP
+    return _bubble_cache.get((radius, alpha), lambda: _render_bubble(radius, alpha))
+
+
+# Alpha partikel dikelompokkan per bucket, life partikel turun terus jadi
+# tidak perlu presisi alpha penuh
+PARTICLE_ALPHA_STEP = 16
+
+_particle_cache = SpriteCache(maxsize=512)
+
+
+def _render_particle(color, radius, alpha):
+    r, g, b = color
+    surf = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+    pygame.draw.circle(surf, (r, g, b, alpha), (radius, radius), radius)
+    return surf
+
+
+def particle_sprite(color, radius, alpha):
+    """Sprite partikel pop per (warna, radius, bucket alpha) dari cache."""
+    alpha -= alpha % PARTICLE_ALPHA_STEP
+    return _particle_cache.get((color, radius, alpha),
+                               lambda: _render_particle(color, radius, alpha))
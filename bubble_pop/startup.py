@@ -0,0 +1,100 @@
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupProfiler:
+    """
+    Wall-clock breakdown of startup phases.
+
+    phase(name) times a block (from any thread); mark(name) records a
+    milestone as time since t0. report() lists both in start order.
+    """
+
+    def __init__(self, t0=None):
+        self.t0 = t0 if t0 is not None else time.perf_counter()
+        self._lock = threading.Lock()
+        self.phases = []       # (name, start_ms, dur_ms, thread)
+        self.marks = {}        # name -> ms sejak t0
+
+    @contextmanager
+    def phase(self, name):
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            with self._lock:
+                self.phases.append((name, (t - self.t0) * 1000.0, (end - t) * 1000.0,
+                                    threading.current_thread().name))
+
+    def mark(self, name):
+        with self._lock:
+            self.marks.setdefault(name, (time.perf_counter() - self.t0) * 1000.0)
+
+    def report(self):
+        lines = [f"  {'phase':<20}{'start ms':>10}{'dur ms':>9}  thread"]
+        for name, start, dur, thread in sorted(self.phases, key=lambda p: p[1]):
+            lines.append(f"  {name:<20}{start:>10.0f}{dur:>9.0f}  {thread}")
+        for name, t in sorted(self.marks.items(), key=lambda m: m[1]):
+            lines.append(f"  @{name:<19}{t:>10.0f}")
+        return "\n".join(lines)
+
+
+class ModelLoader:
+    """
+    Build and warm up trackers on a background thread.
+
+    steps: list of (name, build) where build() returns a tracker; trackers
+    with a warmup() method get one dummy inference right after being built.
+    While loading, status holds a short description for the lobby; once
+    ready is True the built trackers are in trackers[name]. A failure ends
+    up in error instead of killing the game loop.
+    """
+
+    def __init__(self, steps, profiler, prepare=None):
+        self.steps = steps
+        self.profiler = profiler
+        self.prepare = prepare     # jalan sekali sebelum build (mis. import mediapipe)
+        self.trackers = {}
+        self.status = "Memuat model..."
+        self.error = None
+        self._ready = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="model-loader", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            if self.prepare:
+                with self.profiler.phase("import_mediapipe"):
+                    self.prepare()
+            for name, build in self.steps:
+                self.status = f"Memuat model {name}..."
+                with self.profiler.phase(f"{name}_load"):
+                    tracker = build()
+                if hasattr(tracker, "warmup"):
+                    self.status = f"Pemanasan model {name}..."
+                    with self.profiler.phase(f"{name}_warmup"):
+                        tracker.warmup()
+                self.trackers[name] = tracker
+            self.profiler.mark("models_ready")
+        except Exception as e:   # dilaporkan lewat error, main() yang memutuskan
+            self.error = e
+            self.status = f"Gagal memuat model: {e}"
+        finally:
+            self._ready.set()
+
+    @property
+    def ready(self):
+        return self._ready.is_set() and self.error is None
+
+    @property
+    def failed(self):
+        return self.error is not None
+
+    def wait(self, timeout=None):
+        return self._ready.wait(timeout)
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Modul game di-import flat (from lanes import ...), sama seperti main.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
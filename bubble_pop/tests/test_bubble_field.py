@@ -0,0 +1,173 @@
+import numpy as np
+import pytest
+
+from bubble_field import BubbleField
+
+W, H = 1280, 720
+
+
+def field_with(bubbles):
+    """bubbles: [(x, y, radius)] diam di tempat (prev = sekarang)."""
+    f = BubbleField(W, H, capacity=4, rng=np.random.default_rng(0))
+    f.spawn(len(bubbles))
+    arr = np.array(bubbles, dtype=np.float64)
+    n = len(bubbles)
+    f.x[:n] = f.prev_x[:n] = arr[:, 0]
+    f.y[:n] = f.prev_y[:n] = arr[:, 1]
+    f.radius[:n] = arr[:, 2]
+    return f
+
+
+def test_spawn_grows_capacity_and_compact_keeps_order():
+    f = BubbleField(W, H, capacity=4, rng=np.random.default_rng(1))
+    f.spawn(10)
+    assert len(f) == 10 and f.capacity >= 10
+    assert (f.radius[:10] >= BubbleField.MIN_RADIUS).all()
+    assert (f.radius[:10] <= BubbleField.MAX_RADIUS).all()
+    x_before = f.x[:10].copy()
+    f.alive[[1, 4, 7]] = False
+    assert f.compact() == 3
+    assert len(f) == 7
+    keep = [i for i in range(10) if i not in (1, 4, 7)]
+    np.testing.assert_array_equal(f.x[:7], x_before[keep])
+    np.testing.assert_array_equal(f.id[:7], keep)
+
+
+def test_bubbles_leaving_the_top_die():
+    f = field_with([(200, -60, 30), (400, 300, 30)])
+    f.vy[:2] = -1.0
+    f.update()
+    assert f.alive[:2].tolist() == [False, True]
+
+
+def test_pop_marks_hit_bubbles_dead():
+    f = field_with([(100, 100, 30), (500, 500, 30)])
+    b, p = f.pop_hits(np.array([[105.0, 95.0]]))
+    assert b.tolist() == [0] and p.tolist() == [0]
+    assert f.alive[:2].tolist() == [False, True]
+    # Bubble mati tidak bisa dipop lagi
+    assert len(f.pop_hits(np.array([[100.0, 100.0]]))[0]) == 0
+
+
+def test_first_fingertip_wins():
+    f = field_with([(100, 100, 30), (300, 100, 30), (500, 100, 30)])
+    # Tip 2 dan 4 sama-sama kena bubble 1, tip 1 dan 3 kena bubble 2; tip 0 meleset
+    tips = np.array([[10.0, 600.0], [505.0, 100.0], [300.0, 110.0], [500.0, 95.0],
+                     [295.0, 90.0]])
+    b, p = f.pop_hits(tips)
+    assert dict(zip(b.tolist(), p.tolist())) == {1: 2, 2: 1}
+
+
+def test_swept_fingertip_pops_bubble_it_tunnels_past():
+    f = field_with([(400, 300, 25), (900, 300, 25)])
+    # Lompat 200 px dalam satu tick, posisi awal dan akhir dua-duanya di luar bubble
+    tips, prev = np.array([[500.0, 300.0]]), np.array([[300.0, 300.0]])
+    assert len(field_with([(400, 300, 25)]).pop_hits(tips)[0]) == 0
+    b, _ = f.pop_hits(tips, prev)
+    assert b.tolist() == [0]
+
+
+def test_sweep_follows_bubble_motion():
+    f = field_with([(400, 300, 20)])
+    # Bubble bergerak 60 px ke kanan melewati fingertip yang diam
+    f.prev_x[0], f.x[0] = 340.0, 400.0
+    tip = np.array([[370.0, 300.0]])
+    assert f.pop_hits(tip, tip)[0].tolist() == [0]
+
+
+def test_teleport_guard_uses_euclidean_distance():
+    import pygame
+    from game import Game
+
+    pygame.init()
+    game = Game(W, H, seed=0)
+    tips = np.zeros((1, 5, 2))
+    game._prev_tips = {1: tips[0].copy()}
+    # Diagonal 250 px: L1 500 px, Euclid < MAX_SWEEP_PX -> tetap di-sweep
+    moved = tips + 250 / np.sqrt(2)
+    np.testing.assert_array_equal(game._sweep_start([1], moved), tips)
+    # Lebih jauh dari MAX_SWEEP_PX -> teleport, sweep mulai di posisi baru
+    far = tips + (Game.MAX_SWEEP_PX + 10) / np.sqrt(2)
+    np.testing.assert_array_equal(game._sweep_start([1], far), far)
+
+
+def make_game():
+    import pygame
+    from game import Game
+
+    pygame.init()
+    game = Game(W, H, seed=0)
+    game.initial_spawn()
+    return game
+
+
+def test_accumulator_runs_fixed_steps_and_keeps_remainder():
+    from hand_tracker import HandResult
+
+    game = make_game()
+    hands = HandResult.empty(W, H)
+    assert game.update(hands, game.SIM_DT * 2.5) == 2
+    assert game._accum == pytest.approx(game.SIM_DT * 0.5)
+    assert game._alpha == pytest.approx(0.5)
+    # Sisa setengah tick + sedikit lebih dari setengah tick baru = satu tick lagi
+    assert game.update(hands, game.SIM_DT * 0.6) == 1
+    assert game.ticks == 3
+    assert game.update(hands, 0.0) == 0
+
+
+def test_accumulator_caps_steps_and_clamps_remainder():
+    from hand_tracker import HandResult
+
+    game = make_game()
+    hands = HandResult.empty(W, H)
+    # Mesin "macet" 2 detik: cuma MAX_STEPS_PER_UPDATE tick, sisa waktu dibuang
+    assert game.update(hands, 2.0) == game.MAX_STEPS_PER_UPDATE
+    assert game.ticks == game.MAX_STEPS_PER_UPDATE
+    assert game._accum <= game.SIM_DT
+    assert 0.0 <= game._alpha <= 1.0
+    assert game.update(hands, 0.0) <= 1
+
+
+def test_update_without_dt_runs_one_tick():
+    from hand_tracker import HandResult
+
+    game = make_game()
+    assert game.update(HandResult.empty(W, H)) == 1
+    assert game.ticks == 1 and game._alpha == 1.0
+
+
+def random_field(rng, n):
+    f = BubbleField(W, H, rng=rng)
+    f.spawn(n, start_y=rng.integers(0, H, n))
+    f.update()   # prev_x/prev_y != x/y: bubble ikut bergerak dalam sweep
+    return f
+
+
+def test_grid_and_dense_paths_return_same_hits():
+    rng = np.random.default_rng(12)
+    for _ in range(200):
+        n, m = int(rng.integers(1, 120)), int(rng.integers(1, 15))
+        seed = int(rng.integers(1 << 31))
+        p1 = rng.uniform([-50, -50], [W + 50, H + 50], (m, 2))
+        p0 = p1 + rng.normal(0, 120, (m, 2))
+        f_dense = random_field(np.random.default_rng(seed), n)
+        f_grid = random_field(np.random.default_rng(seed), n)
+        b0, t0 = f_dense.pop_hits(p1, p0, use_grid=False)
+        b1, t1 = f_grid.pop_hits(p1, p0, use_grid=True)
+        np.testing.assert_array_equal(b0, b1)
+        np.testing.assert_array_equal(t0, t1)
+        np.testing.assert_array_equal(f_dense.alive[:n], f_grid.alive[:n])
+
+
+def test_grid_path_keeps_first_fingertip_order():
+    f = field_with([(100, 100, 30), (300, 100, 30), (500, 100, 30)])
+    tips = np.array([[10.0, 600.0], [505.0, 100.0], [300.0, 110.0], [500.0, 95.0],
+                     [295.0, 90.0]])
+    b, p = f.pop_hits(tips, use_grid=True)
+    assert dict(zip(b.tolist(), p.tolist())) == {1: 2, 2: 1}
+
+
+def test_grid_query_covers_bubbles_outside_the_screen():
+    f = field_with([(-20, 300, 40), (W + 10, H + 30, 40)])
+    b, _ = f.pop_hits(np.array([[5.0, 300.0], [W - 5.0, H - 5.0]]), use_grid=True)
+    assert sorted(b.tolist()) == [0, 1]
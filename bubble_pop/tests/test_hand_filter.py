@@ -0,0 +1,39 @@
+import numpy as np
+
+from hand_filter import PredictiveHandTracker
+from hand_tracker import HandResult
+
+
+class ScriptedTracker:
+    """HandTracker stand-in: tiap process() mengembalikan hasil berikutnya dari skrip."""
+
+    def __init__(self, script):
+        self.script = list(script)
+        self.calls = 0
+
+    def process(self, frame_rgb, frame_w, frame_h, t_capture=None):
+        players = self.script[min(self.calls, len(self.script) - 1)]
+        self.calls += 1
+        lm = np.zeros((len(players), 21, 3), np.float32)
+        for i, p in enumerate(players):
+            lm[i, :, 0] = 0.25 if p == 1 else 0.75
+            lm[i, :, 1] = 0.1 * self.calls
+        return HandResult(lm, np.array(players, np.int32), np.ones(len(players), np.int8),
+                          frame_w, frame_h, t_capture)
+
+
+def test_player_missing_from_fresh_detection_is_dropped():
+    tracker = PredictiveHandTracker(ScriptedTracker([[1, 2], [1, 2], [1], [1]]),
+                                    detect_every=1, adaptive=False, lost_after_s=10.0)
+    seen = [tracker.process(None, 100, 100).players.tolist() for _ in range(4)]
+    assert seen == [[1, 2], [1, 2], [1], [1]]
+
+
+def test_prediction_between_detections_coasts_all_players():
+    tracker = PredictiveHandTracker(ScriptedTracker([[1, 2], [1]]),
+                                    detect_every=3, adaptive=False, lost_after_s=10.0)
+    assert tracker.process(None, 100, 100).players.tolist() == [1, 2]
+    # Frame tanpa deteksi: kedua player tetap diprediksi
+    assert tracker.process(None, 100, 100).players.tolist() == [1, 2]
+    assert tracker.predict().players.tolist() == [1, 2]
+    assert tracker.tracker.calls == 1
@@ -0,0 +1,137 @@
+import numpy as np
+
+from lanes import LaneAssigner, LaneMosaic, Lanes
+from roi import CropMosaic, RoiScheduler
+
+
+def test_hands_at_frame_edges_are_assigned():
+    assigner = LaneAssigner(Lanes(2))
+    players = assigner.assign(np.array([[1.02, 0.5], [-0.01, 0.4]]), t=0.0)
+    assert players.tolist() == [2, 1]
+    assert LaneAssigner(Lanes(2)).assign(np.array([[1.0, 0.5]]), t=0.0).tolist() == [2]
+    assert LaneAssigner(Lanes(3)).assign(np.array([[0.0, 0.5]]), t=0.0).tolist() == [1]
+
+
+def assign(assigner, xs, t):
+    return assigner.assign(np.array([[x, 0.5] for x in xs], dtype=np.float64), t=t).tolist()
+
+
+def test_lane_of_clamps_to_edge_lanes():
+    lanes = Lanes(4)
+    assert lanes.lane_of([-0.2, 0.0, 0.24, 0.26, 0.99, 1.0, 1.3]).tolist() == [1, 1, 1, 2, 4, 4, 4]
+
+
+def test_hand_keeps_owner_while_reaching_over_the_line():
+    assigner = LaneAssigner(Lanes(2), margin=0.25)
+    assert assign(assigner, [0.4], 0.0) == [1]
+    # 0.55 ada di lane 2 tapi masih dalam margin lane 1 -> tetap player 1
+    assert assign(assigner, [0.55], 0.1) == [1]
+    # Terlalu jauh dari lane 1 -> pindah ke pemilik lane
+    assert assign(assigner, [0.8], 0.2) == [2]
+
+
+def test_owner_released_after_hand_is_lost():
+    assigner = LaneAssigner(Lanes(2), margin=0.25, lost_after_s=0.5)
+    assert assign(assigner, [0.45], 0.0) == [1]
+    # Tangan player 2 datang dekat garis setelah player 1 lama hilang
+    assert assign(assigner, [0.55], 1.0) == [2]
+
+
+def test_owners_follow_hands_not_input_order():
+    assigner = LaneAssigner(Lanes(2), margin=0.25)
+    assert assign(assigner, [0.4, 0.6], 0.0) == [1, 2]
+    # MediaPipe tidak menjamin urutan tangan antar frame
+    assert assign(assigner, [0.58, 0.43], 0.1) == [2, 1]
+    # Kedua tangan mendekati garis dari sisinya masing-masing
+    assert assign(assigner, [0.47, 0.53], 0.2) == [1, 2]
+
+
+def test_spare_hand_goes_to_free_neighbour():
+    assigner = LaneAssigner(Lanes(2))
+    # Dua tangan di lane 1, lane 2 kosong: tangan kedua ke player 2
+    assert sorted(assign(assigner, [0.2, 0.3], 0.0)) == [1, 2]
+
+
+def test_n_players_each_lane_gets_its_hand():
+    lanes = Lanes(5)
+    assigner = LaneAssigner(lanes)
+    xs = [lanes.center(p) for p in (3, 1, 5, 2, 4)]
+    assert assign(assigner, xs, 0.0) == [3, 1, 5, 2, 4]
+    # Gerak kecil tiap frame: assignment stabil
+    for i in range(1, 10):
+        assert assign(assigner, [x + 0.01 * i * (-1) ** i for x in xs], 0.05 * i) == [3, 1, 5, 2, 4]
+
+
+def test_n_players_extra_hands_are_dropped():
+    lanes = Lanes(3)
+    assigner = LaneAssigner(lanes)
+    players = assign(assigner, [0.1, 0.15, 0.5, 0.85, 0.9], 0.0)
+    assert sorted(p for p in players if p) == [1, 2, 3]
+    assert players.count(0) == 2
+    # Tangan yang jauh dari lane bebas mana pun tidak dipaksa masuk
+    assigner = LaneAssigner(Lanes(4))
+    players = assign(assigner, [0.05, 0.1, 0.2], 0.0)
+    assert players.count(0) == 1 and set(players) - {0} == {1, 2}
+
+
+def test_lane_mosaic_round_trip():
+    lanes = Lanes(3)
+    frame = np.zeros((720, 1280, 3), np.uint8)
+    mosaic = LaneMosaic(lanes, margin=0.15, max_side=640)
+    image, layout = mosaic.build(frame, [1, 3])
+    assert max(image.shape[:2]) <= 640
+
+    targets = np.array([[0.1, 0.3], [0.9, 0.75]])
+    lm = to_mosaic(layout, image.shape, [0, 1], targets * [1280, 720])
+    out, keep = mosaic.to_frame(lm, layout)
+    assert keep.all()
+    np.testing.assert_allclose(out[:, 0, :2], targets, atol=2e-3)
+
+
+def test_crop_mosaic_round_trip_and_padding():
+    frame = np.zeros((720, 1280, 3), np.uint8)
+    mosaic = CropMosaic(max_side=384)
+    boxes = [(100, 200, 400, 500), (700, 50, 900, 650), (1000, 300, 1200, 400)]
+    image, layout = mosaic.build(frame, boxes)
+    points = np.array([[250, 350], [800, 300], [1100, 350]], dtype=np.float64)
+    lm = to_mosaic(layout, image.shape, [0, 1, 2], points)
+    out, keep = mosaic.to_frame(lm, layout)
+    assert keep.all()
+    np.testing.assert_allclose(out[:, 0, :2] * [1280, 720], points, atol=2.0)
+
+    # Wrist di padding hitam tile (box 3 lebih pendek dari slot) atau di luar grid
+    tiles, cols, sw, sh = layout[:4]
+    th = tiles[2][4]
+    r, c = divmod(2, cols)
+    pad = np.zeros((2, 21, 3), np.float32)
+    pad[0, :, 0] = (c * sw + 1) / image.shape[1]
+    pad[0, :, 1] = (r * sh + th + 1) / image.shape[0]
+    pad[1, :, :2] = 1.5
+    assert not mosaic.to_frame(pad, layout)[1].any()
+
+
+def to_mosaic(layout, shape, tile_ids, points_px):
+    """Landmark (n, 21, 3) normalized mosaic dari titik pixel frame di tile tertentu."""
+    tiles, cols, sw, sh = layout[:4]
+    lm = np.zeros((len(tile_ids), 21, 3), np.float32)
+    for i, (idx, (x, y)) in enumerate(zip(tile_ids, points_px)):
+        x0, y0, s = tiles[idx][:3]
+        r, c = divmod(idx, cols)
+        lm[i, :, 0] = (c * sw + (x - x0) * s) / shape[1]
+        lm[i, :, 1] = (r * sh + (y - y0) * s) / shape[0]
+    return lm
+
+
+def test_roi_hit_needs_a_tracked_hand():
+    roi = RoiScheduler(Lanes(2))
+    roi.record_full(1.0)
+    face_only = [(1, (0, 0, 10, 10), False), (2, (10, 0, 20, 10), False)]
+    roi.record_roi(face_only, set(), 1.0, 100, 100)
+    assert roi.stats()["roi_hit_rate"] == 0.0
+    assert not roi._lost
+
+    tracked = [(1, (0, 0, 10, 10), True), (2, (10, 0, 20, 10), False)]
+    roi.record_roi(tracked, {1}, 1.0, 100, 100)
+    assert roi.stats()["roi_hit_rate"] == 0.5
+    roi.record_roi(tracked, set(), 1.0, 100, 100)
+    assert roi._lost
@@ -0,0 +1,84 @@
+import cv2
+import numpy as np
+import pygame
+
+import main as game_main
+from hand_tracker import HandResult
+
+
+class FakeFaceTracker:
+    """Semua player selalu terlihat → lobby langsung READY."""
+
+    def __init__(self, players):
+        self.players = set(players)
+
+    def detect_players(self, frame_rgb, frame_w, frame_h):
+        return set(self.players)
+
+    def close(self):
+        pass
+
+
+class SweepHandTracker:
+    """
+    Tangan tiap player menyapu lane-nya. process() dan predict() memberi
+    posisi berbeda, jadi replay yang cuma mengulang hasil process() per frame
+    akan menyimpang dari sesi live.
+    """
+
+    def __init__(self, players):
+        self.players = list(players)
+        self._size = None
+        self.calls = 0
+
+    def _hands(self, frame_w, frame_h, t_capture, phase):
+        self.calls += 1
+        n = len(self.players)
+        lm = np.zeros((n, 21, 3), np.float32)
+        for i in range(n):
+            u = (self.calls * 0.37 + phase) % 1.0
+            lm[i, :, 0] = (i + 0.1 + 0.8 * u) / n + np.linspace(-0.04, 0.04, 21)
+            lm[i, :, 1] = 1.0 - ((self.calls * 0.13 + 0.3 * i) % 1.0)
+        self._size = (frame_w, frame_h)
+        return HandResult(lm, np.array(self.players, np.int32), np.ones(n, np.int8),
+                          frame_w, frame_h, t_capture)
+
+    def process(self, frame_rgb, frame_w, frame_h, t_capture=None):
+        return self._hands(frame_w, frame_h, t_capture, 0.0)
+
+    def predict(self):
+        if self._size is None:
+            return HandResult.empty()   # sama seperti PredictiveHandTracker sebelum deteksi pertama
+        return self._hands(*self._size, None, 0.5)
+
+    def close(self):
+        pass
+
+
+def test_record_then_replay_gives_identical_rounds(tmp_path, monkeypatch):
+    frames = tmp_path / "frames"
+    frames.mkdir()
+    for i in range(8):
+        cv2.imwrite(str(frames / f"{i:03d}.png"), np.full((120, 160, 3), 20 * i, np.uint8))
+
+    monkeypatch.setattr(game_main, "READY_HOLD_FRAMES", 2)
+    monkeypatch.setattr(game_main, "COUNTDOWN_SECS", 0)
+    monkeypatch.setattr(game_main, "GO_HOLD_SECS", 0)
+    # Kamera lebih lambat dari loop render → sebagian update live dari predict()
+    monkeypatch.setattr(game_main, "CAM_FPS", 10)
+
+    def quit_after_round(stats):
+        if stats["state"] == "GAME_OVER":
+            pygame.event.post(pygame.event.Event(pygame.QUIT))
+
+    session = str(tmp_path / "session")
+    live = game_main.main(
+        ["--source", str(frames / "*.png"), "--headless", "--record", session, "--seed", "7"],
+        tracker_builders={"face": lambda: FakeFaceTracker([1, 2]),
+                          "hand": lambda: SweepHandTracker([1, 2])},
+        on_stats=quit_after_round, stats_secs=0.05)
+    assert len(live) == 1
+
+    replay = game_main.main(["--replay", session, "--headless"])
+    assert [(r["scores"], r["ticks"]) for r in replay] == \
+           [(r["scores"], r["ticks"]) for r in live]
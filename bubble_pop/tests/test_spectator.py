@@ -0,0 +1,173 @@
+import asyncio
+import time
+
+import numpy as np
+import pygame
+import pytest
+
+import main as game_main
+from game import Game
+from hand_tracker import HandResult
+from spectator import (BUBBLE_DTYPE, CURSOR_DTYPE, HEADER, KIND_DELTA, KIND_KEY,
+                       PARTICLE_DTYPE, SCORE_DTYPE, Snapshot, SpectatorClient,
+                       SpectatorServer, decode_snapshot, encode_snapshot)
+
+
+def make_snapshot(tick, bubbles, state="PLAYING"):
+    """bubbles: [(id, x, y, radius, alpha)] urut id."""
+    scores = np.array([(1, 30), (2, 50)], SCORE_DTYPE)
+    cursors = np.zeros(1, CURSOR_DTYPE)
+    cursors["player"] = 1
+    cursors["tips"] = np.arange(10).reshape(5, 2) + tick
+    particles = np.array([(10 + tick, 20, 3, 200, 1), (-5, 700, 2, 10, 0)], PARTICLE_DTYPE)
+    return Snapshot(tick, state, 0b11, len(bubbles), scores,
+                    ((100, 200, 255), (255, 150, 100)), cursors, particles,
+                    np.array(bubbles, BUBBLE_DTYPE))
+
+
+def assert_same(a, b):
+    assert (a.tick, a.state, a.ready, a.remaining, a.palette) == \
+        (b.tick, b.state, b.ready, b.remaining, b.palette)
+    for name in ("scores", "cursors", "particles", "bubbles"):
+        assert getattr(a, name).tobytes() == getattr(b, name).tobytes(), name
+
+
+BASE = [(1, 100, 100, 40, 255), (2, 300, 50, 30, 255), (5, 640, 360, 50, 128),
+        (9, 900, 700, 20, 255)]
+CURRENT = [
+    (1, 100, 100, 40, 255),      # diam
+    (2, 310, 45, 30, 255),       # geser kecil -> move
+    (5, 640, 360, 50, 64),       # alpha berubah -> upsert
+    # id 9 hilang -> removed
+    (12, 50, 719, 35, 255),      # baru -> upsert
+    (13, 1200, 10, 25, 255),     # baru
+]
+
+
+def kind_of(data):
+    return HEADER.unpack_from(data)[2]
+
+
+def test_keyframe_round_trip():
+    snap = make_snapshot(7, BASE)
+    data = encode_snapshot(snap)
+    assert kind_of(data) == KIND_KEY
+    assert_same(decode_snapshot(data, {}), snap)
+
+
+def test_delta_round_trip():
+    base, cur = make_snapshot(7, BASE), make_snapshot(8, CURRENT)
+    data = encode_snapshot(cur, base)
+    assert kind_of(data) == KIND_DELTA
+    assert_same(decode_snapshot(data, {7: base}), cur)
+
+
+def test_delta_large_move_is_upserted():
+    base = make_snapshot(1, [(3, 0, 0, 30, 255), (4, 500, 500, 30, 255)])
+    cur = make_snapshot(2, [(3, 200, -150, 30, 255), (4, 373, 627, 30, 255)])
+    assert_same(decode_snapshot(encode_snapshot(cur, base), {1: base}), cur)
+
+
+def test_delta_against_empty_base_and_to_empty():
+    empty, full = make_snapshot(1, []), make_snapshot(2, BASE)
+    assert_same(decode_snapshot(encode_snapshot(full, empty), {1: empty}), full)
+    cleared = make_snapshot(3, [])
+    assert_same(decode_snapshot(encode_snapshot(cleared, full), {2: full}), cleared)
+
+
+def test_delta_smaller_than_keyframe_when_little_changes():
+    bubbles = [(i, 10 * i, 5 * i, 30, 255) for i in range(1, 61)]
+    moved = [(i, x + 1, y + 2, r, a) for i, x, y, r, a in bubbles]
+    base, cur = make_snapshot(1, bubbles), make_snapshot(2, moved)
+    assert len(encode_snapshot(cur, base)) < len(encode_snapshot(cur)) // 2
+
+
+def test_chained_deltas_track_state():
+    rng = np.random.default_rng(0)
+    snaps = [make_snapshot(1, BASE)]
+    next_id = 20
+    for tick in range(2, 40):
+        prev = snaps[-1].bubbles
+        keep = prev[rng.random(len(prev)) > 0.1]
+        rows = [(int(b["id"]), int(b["x"] + rng.integers(-3, 4)), int(b["y"] + rng.integers(-3, 4)),
+                 int(b["radius"]), int(b["alpha"])) for b in keep]
+        for _ in range(int(rng.integers(0, 3))):
+            rows.append((next_id, int(rng.integers(0, 1280)), int(rng.integers(0, 720)), 30, 255))
+            next_id += 1
+        snaps.append(make_snapshot(tick, rows))
+
+    bases = {1: decode_snapshot(encode_snapshot(snaps[0]), {})}
+    for prev, cur in zip(snaps, snaps[1:]):
+        decoded = decode_snapshot(encode_snapshot(cur, prev), bases)
+        assert_same(decoded, cur)
+        bases[cur.tick] = decoded
+
+
+def test_delta_without_base_needs_keyframe_to_resync():
+    base, cur, nxt = make_snapshot(7, BASE), make_snapshot(8, CURRENT), make_snapshot(9, CURRENT)
+    with pytest.raises(KeyError):
+        decode_snapshot(encode_snapshot(cur, base), {})
+    # Penonton tanpa base cuma bisa lanjut dari keyframe
+    bases = {8: decode_snapshot(encode_snapshot(cur), {})}
+    assert_same(decode_snapshot(encode_snapshot(nxt, cur), bases), nxt)
+
+
+def test_bad_magic_rejected():
+    data = bytearray(encode_snapshot(make_snapshot(1, BASE)))
+    data[0:2] = b"XX"
+    with pytest.raises(ValueError):
+        decode_snapshot(bytes(data), {})
+
+
+# ── Server + penonton lewat socket sungguhan ────────────────────────────────
+async def wait_for(cond, timeout=5.0):
+    t_end = time.perf_counter() + timeout
+    while not cond():
+        if time.perf_counter() > t_end:
+            raise TimeoutError
+        await asyncio.sleep(0.01)
+
+
+def test_client_joining_mid_stream_resyncs():
+    pygame.init()
+    game = Game(1280, 720, seed=0)
+    game.initial_spawn()
+    no_hands = HandResult.empty(1280, 720)
+
+    async def run():
+        server = SpectatorServer(host="127.0.0.1", port=0).start()
+        early = await SpectatorClient("127.0.0.1", server.port).connect()
+        tasks = [asyncio.ensure_future(early.run())]
+        await wait_for(lambda: server.clients == 1)
+
+        async def publish(n):
+            for _ in range(n):
+                game.step(no_hands)
+                server.publish(game, "PLAYING")
+                await asyncio.sleep(0.02)
+
+        await publish(10)
+        late = await SpectatorClient("127.0.0.1", server.port).connect()
+        tasks.append(asyncio.ensure_future(late.run()))
+        await wait_for(lambda: server.clients == 2)
+        await publish(10)
+        await wait_for(lambda: all(c.state and c.state.tick == server.tick for c in (early, late)))
+
+        history = dict(server._history)
+        for c in (early, late):
+            await c.close()
+        await asyncio.gather(*tasks)
+        server.close()
+        return early, late, history, server.tick
+
+    early, late, history, last_tick = asyncio.run(run())
+    for c in (early, late):
+        assert_same(c.state, history[last_tick])
+    # Penonton yang telat mulai dari keyframe lalu lanjut delta
+    assert late.keyframes >= 1 and late.deltas > 0
+    assert early.deltas > late.deltas
+
+
+def test_server_binds_localhost_by_default():
+    assert SpectatorServer().host == "127.0.0.1"
+    assert game_main.parse_args(["--spectate", "8765"]).spectate_host == "127.0.0.1"
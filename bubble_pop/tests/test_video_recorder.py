@@ -0,0 +1,41 @@
+import pygame
+
+import video_recorder
+from video_recorder import DROP_NEWEST, DROP_OLDEST, GameplayRecorder
+
+
+def _count_copies(monkeypatch):
+    calls = []
+    real = pygame.image.tobytes
+
+    def tobytes(surface, fmt):
+        calls.append(fmt)
+        return real(surface, fmt)
+
+    monkeypatch.setattr(video_recorder.pygame.image, "tobytes", tobytes)
+    return calls
+
+
+def test_drop_newest_skips_copy_when_queue_full(tmp_path, monkeypatch):
+    calls = _count_copies(monkeypatch)
+    # queue_size=0: antrean selalu dianggap penuh
+    rec = GameplayRecorder(str(tmp_path), queue_size=0, drop_policy=DROP_NEWEST)
+    rec.start_round("r")
+    surface = pygame.Surface((32, 24))
+    for _ in range(5):
+        rec.add_frame(surface)
+    rec.close()
+    assert calls == []
+    assert (rec.frames_in, rec.frames_dropped) == (5, 5)
+
+
+def test_drop_oldest_still_queues_latest_frame(tmp_path, monkeypatch):
+    calls = _count_copies(monkeypatch)
+    rec = GameplayRecorder(str(tmp_path), queue_size=0, drop_policy=DROP_OLDEST)
+    rec.start_round("r")
+    surface = pygame.Surface((32, 24))
+    for _ in range(3):
+        rec.add_frame(surface)
+    rec.close()
+    assert calls == ["BGRA"] * 3
+    assert rec.frames_dropped == 3
@@ -0,0 +1,35 @@
+import pygame
+
+from sprites import SpriteCache
+
+# Teks yang sama (skor, label, "READY!") tidak perlu di-render ulang tiap frame
+_text_cache = SpriteCache(maxsize=256)
+# Layer full-screen itu besar (W*H*4 byte), simpan sedikit saja
+_layer_cache = SpriteCache(maxsize=8)
+
+
+def render_text(font, text, color):
+    """font.render() yang di-memo per (font, text, color) dengan LRU."""
+    return _text_cache.get((font, text, color), lambda: font.render(text, True, color))
+
+
+def layer(key, size, draw):
+    """
+    Return a pre-composited full-screen SRCALPHA layer.
+
+    draw(surface) is called once per (key, size) to paint the static parts;
+    afterwards the cached surface is reused until evicted.
+    """
+    size = tuple(size)
+
+    def build():
+        surf = pygame.Surface(size, pygame.SRCALPHA)
+        draw(surf)
+        return surf
+
+    return _layer_cache.get((key, size), build)
+
+
+def clear():
+    _text_cache.clear()
+    _layer_cache.clear()
@@ -0,0 +1,189 @@
+import os
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+import pygame
+
+# Kebijakan saat antrean encode penuh
+DROP_NEWEST = "newest"   # frame yang baru masuk dibuang, isi video tetap berurutan
+DROP_OLDEST = "oldest"   # frame tertua di antrean dibuang, video ikut "lompat" ke sekarang
+
+
+class GameplayRecorder:
+    """
+    Record composited game frames to video files without stalling the loop.
+
+    add_frame(surface) only copies the display pixels (one tobytes() call)
+    into a bounded queue; a daemon thread converts, scales and feeds
+    cv2.VideoWriter. When the queue is full the drop_policy decides which
+    frame is lost, and every drop is counted. Frames carry their render time
+    and the encoder repeats or skips video frames to keep real-time pacing
+    at the file's fixed fps.
+
+    start_round(name) / end_round() open and close one file per round; they
+    go through the same queue but are never dropped.
+    """
+
+    def __init__(self, out_dir, fps=30, fourcc="mp4v", ext=".mp4", queue_size=32,
+                 drop_policy=DROP_NEWEST, scale=1.0):
+        if drop_policy not in (DROP_NEWEST, DROP_OLDEST):
+            raise ValueError(f"drop_policy tidak dikenal: {drop_policy}")
+        os.makedirs(out_dir, exist_ok=True)
+        self.out_dir = out_dir
+        self.fps = fps
+        self.fourcc = fourcc
+        self.ext = ext
+        self.queue_size = queue_size
+        self.drop_policy = drop_policy
+        self.scale = scale
+
+        self._queue = deque()
+        self._frames_queued = 0     # item frame di antrean (kontrol tidak dihitung)
+        self._cond = threading.Condition()
+        self._running = True
+        self.recording = False
+        self.path = None
+
+        self.frames_in = 0
+        self.frames_dropped = 0
+        self.frames_written = 0     # frame video di file, termasuk duplikat
+        self.frames_repeated = 0
+        self.frames_skipped = 0     # frame yang lebih cepat dari 1/fps, tidak ditulis
+        self.files = []
+        self._lag_ms = deque(maxlen=300)
+        self._encode_ms = deque(maxlen=300)
+
+        self._thread = threading.Thread(target=self._run, name="video-encoder", daemon=True)
+        self._thread.start()
+
+    # ── Game loop side ──────────────────────────────────────────────────────
+    def start_round(self, name):
+        path = os.path.join(self.out_dir, f"{name}{self.ext}")
+        self._put_control(("open", path))
+        self.recording = True
+        self.path = path
+        return path
+
+    def end_round(self):
+        if self.recording:
+            self._put_control(("close",))
+            self.recording = False
+
+    def add_frame(self, surface, t=None):
+        """t: waktu render frame (detik, default perf_counter), dasar pacing video."""
+        if not self.recording:
+            return
+        if t is None:
+            t = time.perf_counter()
+        # Cek kapasitas dulu: frame yang bakal dibuang tidak perlu dicopy
+        with self._cond:
+            self.frames_in += 1
+            if self._frames_queued >= self.queue_size:
+                self.frames_dropped += 1
+                if self.drop_policy == DROP_NEWEST:
+                    return
+                self._drop_oldest_frame()
+        # BGRA langsung cocok untuk OpenCV, konversinya di thread encoder.
+        # Copy di luar lock; cuma thread encoder yang mengurangi antrean,
+        # jadi slot yang dicek di atas tetap ada.
+        data = pygame.image.tobytes(surface, "BGRA")
+        item = ("frame", data, surface.get_size(), t, time.perf_counter())
+        with self._cond:
+            self._queue.append(item)
+            self._frames_queued += 1
+            self._cond.notify()
+
+    def _drop_oldest_frame(self):
+        for i, queued in enumerate(self._queue):
+            if queued[0] == "frame":
+                del self._queue[i]
+                self._frames_queued -= 1
+                return
+
+    def _put_control(self, item):
+        with self._cond:
+            self._queue.append(item)
+            self._cond.notify()
+
+    # ── Encoder thread ──────────────────────────────────────────────────────
+    def _run(self):
+        writer = None
+        t0 = None
+        while True:
+            with self._cond:
+                while not self._queue and self._running:
+                    self._cond.wait()
+                if not self._queue:
+                    break
+                item = self._queue.popleft()
+                if item[0] == "frame":
+                    self._frames_queued -= 1
+
+            kind = item[0]
+            if kind == "open":
+                if writer is not None:
+                    writer.release()
+                writer, t0 = None, None
+                path = item[1]
+            elif kind == "close":
+                if writer is not None:
+                    writer.release()
+                    self.files.append(path)
+                writer = None
+            else:
+                _, data, (w, h), t, queued_at = item
+                start = time.perf_counter()
+                img = cv2.cvtColor(np.frombuffer(data, np.uint8).reshape(h, w, 4), cv2.COLOR_BGRA2BGR)
+                if self.scale != 1.0:
+                    img = cv2.resize(img, (int(w * self.scale), int(h * self.scale)),
+                                     interpolation=cv2.INTER_AREA)
+                if writer is None:
+                    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*self.fourcc),
+                                             self.fps, (img.shape[1], img.shape[0]))
+                    t0, written = t, 0
+                # Berapa frame video seharusnya sudah ada sampai waktu render frame ini
+                due = int((t - t0) * self.fps) + 1
+                if due <= written:
+                    self.frames_skipped += 1
+                else:
+                    repeat = due - written
+                    for _ in range(repeat):
+                        writer.write(img)
+                    self.frames_repeated += repeat - 1
+                    self.frames_written += repeat
+                    written = due
+                end = time.perf_counter()
+                self._encode_ms.append((end - start) * 1000.0)
+                self._lag_ms.append((end - queued_at) * 1000.0)
+        if writer is not None:
+            writer.release()
+            self.files.append(path)
+
+    def stats(self):
+        lag = np.array(self._lag_ms) if self._lag_ms else None
+        enc = np.array(self._encode_ms) if self._encode_ms else None
+        return {
+            "recording": self.recording,
+            "drop_policy": self.drop_policy,
+            "frames_in": self.frames_in,
+            "frames_dropped": self.frames_dropped,
+            "frames_written": self.frames_written,
+            "frames_repeated": self.frames_repeated,
+            "frames_skipped": self.frames_skipped,
+            "queue_depth": self._frames_queued,
+            "lag_ms_p50": round(float(np.percentile(lag, 50)), 1) if lag is not None else None,
+            "lag_ms_max": round(float(lag.max()), 1) if lag is not None else None,
+            "encode_ms_p50": round(float(np.percentile(enc, 50)), 1) if enc is not None else None,
+            "files": len(self.files),
+        }
+
+    def close(self, timeout=10.0):
+        """Selesaikan antrean dan tutup file; frame yang belum sempat di-encode tetap ditulis."""
+        self.end_round()
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        self._thread.join(timeout)